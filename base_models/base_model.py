@@ -1,8 +1,24 @@
 from abc import ABC, abstractmethod
 from collections.abc import Mapping
-import importlib
-import inspect
-import re
+from operator import attrgetter
+import sys
+
+from base_models.model_manifest import resolve_model_class
+
+
+_UNSET = object()
+
+
+def _tracked_property(name):
+    """Return a property for `name` that flags the effective parameters as stale when its value changes."""
+    storage_name = f"_tracked_{name}"
+
+    def set_value(model, value):
+        if value != getattr(model, storage_name, _UNSET):
+            setattr(model, storage_name, value)
+            model._parameters_changed = True
+
+    return property(attrgetter(storage_name), set_value, doc=f"Tracked parameter `{name}`, see `BaseModel.tracked_parameters`.")
 
 
 class BaseModel(ABC):
@@ -16,6 +32,26 @@ class BaseModel(ABC):
 
     # define class-level properties that are common to all models
     model_type = "base"
+    dormant_when_inactive = False # subsystems setting this may drop their components from the engine step plan while inactive
+    step_phase = "controller" # phase in which the engine steps this model in phased step mode
+    phase_steps = None # optional ((phase, method name), ...) for models that take part in several phases
+    reference_attributes = () # attributes holding the names of other models this model writes to while stepping
+    shared_resources = () # non-model state written while stepping (e.g. module-level scratch variables)
+    tracked_parameters = () # inputs of the effective parameters; writing a new value sets `_parameters_changed`
+    is_compact = False # set on the generated __slots__ variants returned by compact()
+
+    def __init_subclass__(cls, **kwargs):
+        """Install change-tracking properties for the `tracked_parameters` a subclass declares.
+
+        Models derive effective parameters (e.g. an elastance from its base
+        value and factors) from their tracked parameters. Writing a different
+        value to one of them sets `_parameters_changed`, so the model only
+        recomputes the effective parameters in the steps after a change.
+        """
+        super().__init_subclass__(**kwargs)
+        for name in cls.__dict__.get("tracked_parameters", ()):
+            if not isinstance(getattr(cls, name, None), property):
+                setattr(cls, name, _tracked_property(name))
 
     def __init__(self, model_ref=None, name=None):
         """Initialize shared model state.
@@ -33,6 +69,8 @@ class BaseModel(ABC):
         self.description = "" # optional description of the component
         self.is_enabled = False # flag to indicate whether the component is active in the model, default is False. This can be used to enable or disable components without removing them from the model.
         self.components = {} # nested component definitions for this model
+        self.groups = [] # user-defined group tags, indexed by the engine (see ModelEngine.get_models_in_group)
+        self._parameters_changed = True # the effective parameters must be recomputed (see tracked_parameters)
 
         self._model_engine = model_ref if hasattr(model_ref, "models") else None
         if self._model_engine is not None:
@@ -44,6 +82,47 @@ class BaseModel(ABC):
             self._t = 0.0
         self._is_initialized = False
 
+    @classmethod
+    def compact(cls):
+        """Return a `__slots__` variant of this class for memory-lean instances.
+
+        The slots are generated from the attributes declared in `__init__`.
+        Attributes added later (e.g. through `init_model` or at runtime) still
+        work because the instances keep their `__dict__` as a fallback.
+
+        Returns:
+            type[BaseModel]: The cached compact subclass.
+        """
+        if cls.__dict__.get("is_compact", False):
+            return cls
+
+        compact_class = cls.__dict__.get("_compact_class")
+        if compact_class is not None:
+            return compact_class
+
+        # declared attributes shadowed by class attributes or descriptors stay in __dict__
+        prototype = cls(model_ref={}, name=None)
+        slot_names = tuple(
+            name for name in vars(prototype)
+            if not any(name in klass.__dict__ for klass in cls.__mro__)
+        )
+
+        compact_name = f"Compact{cls.__name__}"
+        compact_class = type(cls)(compact_name, (cls,), {
+            "__slots__": slot_names,
+            "__module__": cls.__module__,
+            "__doc__": cls.__doc__,
+            "is_compact": True,
+        })
+        cls._compact_class = compact_class
+
+        # publish the class next to its parent so instances can be pickled
+        module = sys.modules.get(cls.__module__)
+        if module is not None and not hasattr(module, compact_name):
+            setattr(module, compact_name, compact_class)
+
+        return compact_class
+
     def init_model(self, args=None):
         """Initialize model properties from configuration and nested components.
 
@@ -112,6 +191,7 @@ class BaseModel(ABC):
             component_class = self._resolve_model_class(model_type)
             if component_class is None:
                 raise ValueError(f"Unknown component model_type: {model_type}")
+            component_class = self._component_class(component_class)
 
             model_ref = self._model_engine if self._model_engine is not None else model_registry
             model_registry[component_name] = component_class(model_ref=model_ref, name=component_name)
@@ -132,44 +212,44 @@ class BaseModel(ABC):
 
         return None
 
+    def _component_class(self, model_class):
+        """Return the compact variant of `model_class` when the engine asks for it."""
+        if self._model_engine is not None and getattr(self._model_engine, "compact_models", False):
+            return model_class.compact()
+        return model_class
+
     def _resolve_model_class(self, model_type):
         """Resolve a component `model_type` to a concrete `BaseModel` subclass.
 
-        Supports legacy aliases and searches known model packages.
+        Supports legacy aliases; see `base_models.model_manifest`.
         """
-        model_type_str = str(model_type)
-        normalized_target = re.sub(r"_", "", model_type_str).lower()
-        legacy_aliases = {
-            "bloodpump": ("pump", "pump"),
-        }
-        if normalized_target in legacy_aliases:
-            normalized_target, snake_name = legacy_aliases[normalized_target]
-        else:
-            snake_name = re.sub(r"(?<!^)(?=[A-Z])", "_", model_type_str).lower()
-
-        candidate_modules = [
-            f"base_models.{snake_name}",
-            f"composite_models.{snake_name}",
-            f"derived_models.{snake_name}",
-            f"system_models.{snake_name}",
-            f"device_models.{snake_name}",
-        ]
-
-        for module_name in candidate_modules:
-            try:
-                module = importlib.import_module(module_name)
-            except ModuleNotFoundError:
-                continue
+        return resolve_model_class(model_type)
 
-            for _, candidate in inspect.getmembers(module, inspect.isclass):
-                if not issubclass(candidate, BaseModel):
-                    continue
-                normalized_name = re.sub(r"_", "", candidate.__name__).lower()
-                normalized_model_type = re.sub(r"_", "", str(getattr(candidate, "model_type", ""))).lower()
-                if normalized_name == normalized_target or normalized_model_type == normalized_target:
-                    return candidate
+    def rebind_references(self):
+        """Re-resolve cached references to other models after the registry changed.
 
-        return None
+        Called by `ModelEngine.apply_patch` after models were added, removed or
+        reconnected. Most models look other models up by name while stepping
+        and need nothing here; models that resolve references once in
+        `init_model` override this.
+        """
+        return
+
+    def get_subsystem_models(self):
+        """Return the names of the component models owned by this model."""
+        if not isinstance(self.components, Mapping):
+            return []
+        return list(self.components.keys())
+
+    def is_subsystem_active(self):
+        """Return whether the component models of this model need stepping."""
+        return bool(self.is_enabled)
+
+    def _notify_subsystem_state(self):
+        """Ask the engine to refresh its step plan after a subsystem switch."""
+        if self._model_engine is None or not hasattr(self._model_engine, "refresh_subsystem"):
+            return
+        self._model_engine.refresh_subsystem(self.name)
 
     def step_model(self):
         """Execute one model step if enabled and initialized."""
@@ -179,6 +259,35 @@ class BaseModel(ABC):
         
         self.calc_model()
 
+    @classmethod
+    def get_phase_steps(cls):
+        """Return the `(phase, method name)` pairs used by the phased step mode."""
+        if cls.phase_steps:
+            return tuple(cls.phase_steps)
+        return ((cls.step_phase, "step_model"),)
+
+    def get_phase_writes(self, phase):
+        """Return the names of the models written during a step phase, or `None` if unknown.
+
+        The default covers the model itself, the models named by its
+        `reference_attributes` and its `shared_resources`. Controllers reach
+        into arbitrary models, so their writes are unknown and the parallel
+        stepper runs them serially.
+        """
+        if phase == "controller":
+            return None
+
+        names = [self.name]
+        for attribute in self.reference_attributes:
+            value = getattr(self, attribute, None)
+            if isinstance(value, str):
+                if value:
+                    names.append(value)
+            elif isinstance(value, (list, tuple)):
+                names.extend(str(item) for item in value)
+        names.extend(self.shared_resources)
+        return tuple(names)
+
     @abstractmethod
     def calc_model(self):
         """Compute one simulation step for the concrete model implementation."""
@@ -5,6 +5,12 @@ class Capacitance(BaseModel):
     """Generic capacitance compartment with elastance-based pressure dynamics."""
 
     model_type = "capacitance"
+    step_phase = "pressure"
+    tracked_parameters = (
+        "u_vol", "el_base", "el_k",
+        "u_vol_factor", "el_base_factor", "el_k_factor",
+        "u_vol_factor_ps", "el_base_factor_ps", "el_k_factor_ps",
+    )
 
     def __init__(self, model_ref = {}, name=None):
         """Initialize a capacitance component and its tunable parameters."""
@@ -18,7 +24,7 @@ class Capacitance(BaseModel):
         self.pres_ext = 0.0  # non persistent external pressure p2(t) (mmHg)
         self.fixed_composition = False # whether the composition of the capacitance is fixed (True) or variable (False)
 
-        # non-persistent property factors. These factors reset to 1.0 after each model step
+        # non-persistent property factors. These factors apply to the next model step only and then reset to 1.0
         self.u_vol_factor = 1.0  # non-persistent unstressed volume factor step (unitless)
         self.el_base_factor = 1.0  # non-persistent elastance factor step (unitless)
         self.el_k_factor = 1.0  # non-persistent elastance factor step (unitless)
@@ -41,10 +47,12 @@ class Capacitance(BaseModel):
 
     def calc_model(self):
         """Run one capacitance update step (elastance, volume, pressure)."""
-        # calculate the current elastance and volumes
-        self.calc_elastance()
-        self.calc_volume()
-        
+        # recalculate the current elastance and volumes only after a base value or factor was written
+        if self._parameters_changed:
+            self._parameters_changed = False
+            self.calc_elastance()
+            self.calc_volume()
+
         # if the volume is zero or lower, handle it as a special case to avoid negative volumes
         if self.vol < 0.0:
             # raise a negative volume error
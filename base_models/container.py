@@ -5,6 +5,8 @@ class Container(BaseModel):
     """Container model that applies pressure coupling to enclosed components."""
 
     model_type = "container"
+    step_phase = "container"
+    reference_attributes = ("contained_components",)
 
     def __init__(self, model_ref = {}, name=None):
         """Initialize a container with elastance and enclosed component settings."""
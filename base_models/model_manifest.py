@@ -0,0 +1,122 @@
+import importlib
+
+
+# normalized model type (lowercase, no underscores) -> "module:Class"
+MODEL_MANIFEST = {
+    "capacitance": "base_models.capacitance:Capacitance",
+    "container": "base_models.container:Container",
+    "resistor": "base_models.resistor:Resistor",
+    "timevaryingelastance": "base_models.time_varying_elastance:TimeVaryingElastance",
+    "valve": "base_models.valve:Valve",
+    "bloodvessel": "composite_models.blood_vessel:BloodVessel",
+    "microvascularunit": "composite_models.micro_vascular_unit:MicroVascularUnit",
+    "bloodcapacitance": "derived_models.blood_capacitance:BloodCapacitance",
+    "blooddiffusor": "derived_models.blood_diffusor:BloodDiffusor",
+    "bloodtimevaryingelastance": "derived_models.blood_time_varying_elastance:BloodTimeVaryingElastance",
+    "gascapacitance": "derived_models.gas_capacitance:GasCapacitance",
+    "gasdiffusor": "derived_models.gas_diffusor:GasDiffusor",
+    "gasexchanger": "derived_models.gas_exchanger:GasExchanger",
+    "heartchamber": "derived_models.heart_chamber:HeartChamber",
+    "pump": "derived_models.pump:Pump",
+    "ans": "system_models.ans:Ans",
+    "ansafferent": "system_models.ans_afferent:AnsAfferent",
+    "ansefferent": "system_models.ans_efferent:AnsEfferent",
+    "blood": "system_models.blood:Blood",
+    "breathing": "system_models.breathing:Breathing",
+    "circulation": "system_models.circulation:Circulation",
+    "ductusarteriosus": "system_models.ductus_arteriosus:DuctusArteriosus",
+    "pda": "system_models.ductus_arteriosus:DuctusArteriosus",
+    "dustusarteriosus": "system_models.dustus_arteriosus:DustusArteriosus",
+    "fluids": "system_models.fluids:Fluids",
+    "gas": "system_models.gas:Gas",
+    "heart": "system_models.heart:Heart",
+    "metabolism": "system_models.metabolism:Metabolism",
+    "mob": "system_models.mob:Mob",
+    "placenta": "system_models.placenta:Placenta",
+    "respiration": "system_models.respiration:Respiration",
+    "shunts": "system_models.shunts:Shunts",
+    "ecls": "device_models.ecls:Ecls",
+    "mechanicalventilator": "device_models.mechanical_ventilator:MechanicalVentilator",
+    "ventilator": "device_models.mechanical_ventilator:Ventilator",
+    "monitor": "device_models.monitor:Monitor",
+    "resuscitation": "device_models.resuscitation:Resuscitation",
+}
+
+LEGACY_ALIASES = {
+    "bloodpump": ("pump", "pump"),
+}
+
+MODEL_PACKAGES = (
+    "base_models",
+    "composite_models",
+    "derived_models",
+    "system_models",
+    "device_models",
+)
+
+_resolved_classes = {}
+
+
+def resolve_model_class(model_type):
+    """Resolve a `model_type` string to a `BaseModel` subclass, or `None`.
+
+    Known types are looked up in `MODEL_MANIFEST`, so only the module of that
+    class is imported. Unknown types fall back to searching a module named
+    after the type in every model package, which keeps user-added model
+    classes working without a manifest entry.
+    """
+    model_type_str = str(model_type)
+    cached = _resolved_classes.get(model_type_str)
+    if cached is not None:
+        return cached
+
+    normalized_target = model_type_str.replace("_", "").lower()
+    if normalized_target in LEGACY_ALIASES:
+        normalized_target, snake_name = LEGACY_ALIASES[normalized_target]
+    else:
+        snake_name = _snake_case(model_type_str)
+
+    entry = MODEL_MANIFEST.get(normalized_target)
+    if entry is not None:
+        module_name, class_name = entry.split(":")
+        model_class = getattr(importlib.import_module(module_name), class_name)
+    else:
+        model_class = _search_model_packages(normalized_target, snake_name)
+
+    if model_class is not None:
+        _resolved_classes[model_type_str] = model_class
+    return model_class
+
+
+def _snake_case(model_type_str):
+    """Convert `BloodVessel` style names to `blood_vessel` (already snake names pass through)."""
+    characters = []
+    for index, character in enumerate(model_type_str):
+        if index > 0 and "A" <= character <= "Z":
+            characters.append("_")
+        characters.append(character)
+    return "".join(characters).lower()
+
+
+def _search_model_packages(normalized_target, snake_name):
+    """Find a model class by trial import of `<package>.<snake_name>`."""
+    from base_models.base_model import BaseModel
+
+    for package_name in MODEL_PACKAGES:
+        module_name = f"{package_name}.{snake_name}"
+        try:
+            module = importlib.import_module(module_name)
+        except ModuleNotFoundError:
+            continue
+
+        for candidate_name in sorted(vars(module)):
+            candidate = vars(module)[candidate_name]
+            if not isinstance(candidate, type) or not issubclass(candidate, BaseModel):
+                continue
+
+            normalized_name = candidate.__name__.replace("_", "").lower()
+            normalized_model_type = str(getattr(candidate, "model_type", "")).replace("_", "").lower()
+            if normalized_name == normalized_target or normalized_model_type == normalized_target:
+                return candidate
+
+    return None
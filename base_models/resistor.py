@@ -5,6 +5,10 @@ class Resistor(BaseModel):
     """Flow element that computes pressure-driven flow between two components."""
 
     model_type = "resistor"
+    step_phase = "flow"
+    phase_steps = (("flow", "step_flow"), ("transfer", "step_transfer"))
+    reference_attributes = ("comp_from", "comp_to")
+    tracked_parameters = ("r_for", "r_back", "r_k", "r_factor", "r_k_factor", "r_factor_ps", "r_k_factor_ps")
 
     def __init__(self, model_ref = {}, name=None):
         """Initialize resistor parameters, state, and connected endpoints."""
@@ -24,7 +28,7 @@ class Resistor(BaseModel):
         self.p2_ext = 0.0  # external pressure on the outlet (mmHg)
         self.fixed_composition = False
 
-        # non-persistent property factors. These factors reset to 1.0 after each model step
+        # non-persistent property factors. These factors apply to the next model step only and then reset to 1.0
         self.r_factor = 1.0  # non-persistent resistance factor
         self.r_k_factor = 1.0  # non-persistent non-linear coefficient factor
         self.l_factor = 1.0  # non-persistent inertance factor
@@ -43,6 +47,7 @@ class Resistor(BaseModel):
         self._r_for = 1000  # calculated forward resistance (mmHg/L*s)
         self._r_back = 1000  # calculated backward resistance (mmHg/L*s)
         self._r_k = 0  # calculated non-linear resistance factor (unitless)
+        self._flow_direction = 0  # direction of the pending volume transfer (1 forward, -1 backward, 0 none)
 
     def calc_model(self):
         """Run one resistor update step (resolve components, resistance, flow)."""
@@ -50,12 +55,39 @@ class Resistor(BaseModel):
         self._comp_from = self.model_ref[self.comp_from]
         self._comp_to = self.model_ref[self.comp_to]
 
-        # calculate the resistances
-        self.calc_resistance()
+        # recalculate the resistances only after a base value or factor was written
+        if self._parameters_changed:
+            self._parameters_changed = False
+            self.calc_resistance()
 
         # calculate the flow
         self.calc_flow()
 
+    def step_flow(self):
+        """Phased step: compute resistances and the flow without moving volume."""
+        if not self.is_enabled or not self._is_initialized:
+            return
+
+        self._comp_from = self.model_ref[self.comp_from]
+        self._comp_to = self.model_ref[self.comp_to]
+        if self._parameters_changed:
+            self._parameters_changed = False
+            self.calc_resistance()
+        self.calc_flow_rate()
+
+    def step_transfer(self):
+        """Phased step: move the volume of the flow computed in `step_flow`."""
+        if not self.is_enabled or not self._is_initialized:
+            return
+
+        self.transfer_volume()
+
+    def get_phase_writes(self, phase):
+        """Return the models written in a phase; computing the flow only writes this resistor."""
+        if phase == "flow":
+            return (self.name,)
+        return super().get_phase_writes(phase)
+
     def calc_resistance(self):
         """Update effective forward/backward resistance values from factors."""
         # incorporate all factors influencing this resistor
@@ -69,6 +101,11 @@ class Resistor(BaseModel):
 
     def calc_flow(self):
         """Compute directional flow and transfer volume between connected models."""
+        self.calc_flow_rate()
+        self.transfer_volume()
+
+    def calc_flow_rate(self):
+        """Compute the directional flow from the pressures of the connected components."""
         # get the pressure of the volume containing compartments and incorporate the external pressures
         _p1_t = self._comp_from.pres + self.p1_ext
         _p2_t = self._comp_to.pres + self.p2_ext
@@ -77,8 +114,9 @@ class Resistor(BaseModel):
         self.p1_ext = 0.0
         self.p2_ext = 0.0
 
-        # reset the current flow
+        # reset the current flow and the direction of the pending volume transfer
         self.flow = 0.0
+        self._flow_direction = 0
 
         # return if no flow is allowed across this resistor
         if self.no_flow:
@@ -90,10 +128,7 @@ class Resistor(BaseModel):
         if _p1_t >= _p2_t:
             # calculate the forward flow
             self.flow = (_p1_t - _p2_t - self._r_k * self.flow ** 2) / self._r_for
-
-            # update the volumes of the connected components but do not remove the volume which could not be removed from the upstream component (to prevent volume loss)
-            self._comp_from.volume_out(self.flow * self._t)
-            self._comp_to.volume_in(self.flow * self._t, self._comp_from)
+            self._flow_direction = 1
 
             # return from this function
             return
@@ -102,10 +137,20 @@ class Resistor(BaseModel):
         if _p1_t < _p2_t and not self.no_back_flow:
             # calculate the backward flow
             self.flow = (_p1_t - _p2_t + self._r_k * self.flow ** 2) / self._r_back
+            self._flow_direction = -1
+
+            # return from this function
+            return
 
-            # update the volumes of the connected components but do not remove the volume which could not be removed from the upstream component (to prevent volume loss)
+    def transfer_volume(self):
+        """Move the volume of the current flow between the connected components."""
+        # update the volumes of the connected components but do not remove the volume which could not be removed from the upstream component (to prevent volume loss)
+        if self._flow_direction > 0:
+            self._comp_from.volume_out(self.flow * self._t)
+            self._comp_to.volume_in(self.flow * self._t, self._comp_from)
+        elif self._flow_direction < 0:
             self._comp_to.volume_out(-self.flow * self._t)
             self._comp_from.volume_in(-self.flow * self._t, self._comp_to)
 
-            # return from this function
-            return
+        # the pending transfer has been applied
+        self._flow_direction = 0
@@ -5,6 +5,12 @@ class TimeVaryingElastance(BaseModel):
     """Capacitance-like chamber with activation-dependent elastance."""
 
     model_type = "time_varying_elastance"
+    step_phase = "pressure"
+    tracked_parameters = (
+        "u_vol", "el_min", "el_max", "el_k",
+        "u_vol_factor", "el_min_factor", "el_max_factor", "el_k_factor",
+        "u_vol_factor_ps", "el_min_factor_ps", "el_max_factor_ps", "el_k_factor_ps",
+    )
 
     def __init__(self, model_ref = {}, name=None):
         """Initialize chamber parameters and time-varying elastance state."""
@@ -20,7 +26,7 @@ class TimeVaryingElastance(BaseModel):
         self.act_factor = 0.0  # activation factor from the heart model (unitless)
         self.fixed_composition = False  # whether volume composition is fixed
 
-        # non-persistent property factors. These factors reset to 1.0 after each model step
+        # non-persistent property factors. These factors apply to the next model step only and then reset to 1.0
         self.u_vol_factor = 1.0  # non-persistent unstressed volume factor step (unitless)
         self.el_min_factor = 1.0  # non-persistent minimal elastance factor step (unitless)
         self.el_max_factor = 1.0  # non-persistent maximal elastance factor step (unitless)
@@ -46,10 +52,12 @@ class TimeVaryingElastance(BaseModel):
 
     def calc_model(self):
         """Run one chamber update step (elastance, volume, pressure)."""
-        # calculate the current elastance and volumes
-        self.calc_elastance()
-        self.calc_volume()
-        
+        # recalculate the current elastance and volumes only after a base value or factor was written
+        if self._parameters_changed:
+            self._parameters_changed = False
+            self.calc_elastance()
+            self.calc_volume()
+
         # if the volume is zero or lower, handle it as a special case to avoid negative volumes
         if self.vol < 0.0:
             # raise a negative volume error
@@ -6,6 +6,10 @@ class BloodVessel(BloodCapacitance):
     """Composite blood vessel model with embedded input resistors."""
 
     model_type = "blood_vessel"
+    tracked_parameters = BloodCapacitance.tracked_parameters + (
+        "r_for", "r_back", "r_k", "l", "alpha", "ans_sens", "ans_activity",
+        "r_factor", "r_k_factor", "l_factor", "r_factor_ps", "r_k_factor_ps", "l_factor_ps",
+    )
 
     def __init__(self, model_ref={}, name=None):
         """Initialize vessel state, resistance parameters, and connector config."""
@@ -50,72 +54,124 @@ class BloodVessel(BloodCapacitance):
         """Initialize vessel and create input connector resistors from `inputs`."""
         super().init_model(args)
 
+        model_registry, model_ref_for_resistor = self._resistor_registry()
+        for input_name in self.inputs:
+            self._add_input_resistor(model_registry, model_ref_for_resistor, input_name)
+
+    def rebind_references(self):
+        """Create the resistors of new `inputs` and drop those of inputs no longer connected.
+
+        Inputs whose model or connector resistor was removed from the registry
+        are disconnected.
+        """
+        model_registry, model_ref_for_resistor = self._resistor_registry()
+        removed = {name for name, resistor in self._resistors.items() if model_registry.get(name) is not resistor}
+        self.inputs = [
+            input_name for input_name in self.inputs
+            if input_name in model_registry and f"{input_name}_{self.name}" not in removed
+        ]
+
+        connected = {f"{input_name}_{self.name}" for input_name in self.inputs}
+        for resistor_name, resistor in list(self._resistors.items()):
+            if resistor_name in connected and resistor_name not in removed:
+                continue
+            del self._resistors[resistor_name]
+            if model_registry.get(resistor_name) is resistor:
+                del model_registry[resistor_name]
+
+        for input_name in self.inputs:
+            if f"{input_name}_{self.name}" not in self._resistors:
+                self._add_input_resistor(model_registry, model_ref_for_resistor, input_name)
+
+    def get_subsystem_models(self):
+        """Return the component models, including the embedded input resistors."""
+        names = super().get_subsystem_models()
+        names.extend(name for name in self._resistors if name not in names)
+        return names
+
+    def _resistor_registry(self):
+        """Return the registry the input resistors live in and the `model_ref` to create them with."""
         model_registry = self.model_ref if isinstance(self.model_ref, dict) else {}
         if not model_registry and getattr(self, "_model_engine", None) is not None:
             model_registry = getattr(self._model_engine, "models", {})
 
         model_ref_for_resistor = self._model_engine if getattr(self, "_model_engine", None) is not None else model_registry
+        return model_registry, model_ref_for_resistor
+
+    def _add_input_resistor(self, model_registry, model_ref_for_resistor, input_name):
+        """Create (or adopt an existing) connector resistor from `input_name` to this vessel."""
+        resistor_name = f"{input_name}_{self.name}"
+
+        if resistor_name in model_registry:
+            self._resistors[resistor_name] = model_registry[resistor_name]
+            self._parameters_changed = True
+            return
+
+        resistor = self._component_class(Resistor)(model_ref=model_ref_for_resistor, name=resistor_name)
+        resistor.init_model(
+            {
+                "name": resistor_name,
+                "description": f"input connector for {self.name}",
+                "is_enabled": self.is_enabled,
+                "r_for": self.r_for,
+                "r_back": self.r_back,
+                "r_k": self.r_k,
+                "no_flow": self.no_flow,
+                "no_back_flow": self.no_back_flow,
+                "comp_from": input_name,
+                "comp_to": self.name,
+            }
+        )
 
-        for input_name in self.inputs:
-            resistor_name = f"{input_name}_{self.name}"
-
-            if resistor_name in model_registry:
-                self._resistors[resistor_name] = model_registry[resistor_name]
-                continue
-
-            resistor = Resistor(model_ref=model_ref_for_resistor, name=resistor_name)
-            resistor.init_model(
-                {
-                    "name": resistor_name,
-                    "description": f"input connector for {self.name}",
-                    "is_enabled": self.is_enabled,
-                    "r_for": self.r_for,
-                    "r_back": self.r_back,
-                    "r_k": self.r_k,
-                    "no_flow": self.no_flow,
-                    "no_back_flow": self.no_back_flow,
-                    "comp_from": input_name,
-                    "comp_to": self.name,
-                }
-            )
-
-            model_registry[resistor_name] = resistor
-            self._resistors[resistor_name] = resistor
+        model_registry[resistor_name] = resistor
+        self._resistors[resistor_name] = resistor
+        # pass the effective parameters to the new resistor on the next step
+        self._parameters_changed = True
 
     def calc_model(self):
         """Run one vessel step and propagate parameters to connector resistors."""
-        self.calc_resistances()
-        self.calc_elastances()
-        self.calc_inertances()
-
-        self.r_current = self._r_for
-        self.el_current = self._el
+        # recalculate and propagate the effective parameters only after a base value or factor was written
+        if self._parameters_changed:
+            self._parameters_changed = False
+            self.calc_resistances()
+            self.calc_elastances()
+            self.calc_inertances()
+            self.calc_volume()
+
+            self.r_current = self._r_for
+            self.el_current = self._el
+
+            for resistor in self._resistors.values():
+                resistor.r_for = self._r_for
+                resistor.r_back = self._r_back
+                resistor.r_k = self._r_k
+
+                resistor.l = self._l
+                resistor.r_factor = self.r_factor
+                resistor.r_factor_ps = self.r_factor_ps
+                resistor.r_k_factor = self.r_k_factor
+                resistor.l_factor = self.l_factor
+                resistor.l_factor_ps = self.l_factor_ps
 
         for resistor in self._resistors.values():
-            resistor.r_for = self._r_for
-            resistor.r_back = self._r_back
-            resistor.r_k = self._r_k
-
             resistor.no_flow = self.no_flow
             resistor.no_back_flow = self.no_back_flow
             resistor.p1_ext = self.p1_ext
             resistor.p2_ext = self.p2_ext
 
-            resistor.l = self._l
-            resistor.r_factor = self.r_factor
-            resistor.r_factor_ps = self.r_factor_ps
-            resistor.r_k_factor = self.r_k_factor
-            resistor.l_factor = self.l_factor
-            resistor.l_factor_ps = self.l_factor_ps
-
-        self.calc_volume()
-
         if self.vol < 0.0:
             raise ValueError(f"Volume cannot be negative. Current volume: {self.vol} L in {self.name}")
 
         self.calc_pressure()
         self.get_flows()
 
+    def get_phase_writes(self, phase):
+        """Return the models written in a phase, including the embedded input resistors."""
+        writes = super().get_phase_writes(phase)
+        if writes is None:
+            return None
+        return writes + tuple(self._resistors)
+
     def get_flows(self):
         """Aggregate net, forward, and backward flow from all input resistors."""
         self.flow = 0.0
@@ -180,6 +180,20 @@ class MicroVascularUnit(BaseModel):
             }
         )
 
+    def rebind_references(self):
+        """Pass changed `inputs` on to the arteriole segment and adopt the inputs it kept."""
+        if self._art is None:
+            return
+        self._art.inputs = list(self.inputs)
+        self._art.rebind_references()
+        self.inputs = list(self._art.inputs)
+
+    def get_subsystem_models(self):
+        """Return the component models, including the ART, CAP and VEN segments."""
+        names = super().get_subsystem_models()
+        names.extend(vessel.name for vessel in (self._art, self._cap, self._ven) if vessel is not None and vessel.name not in names)
+        return names
+
     def _get_or_create_vessel(self, model_registry, model_ref_for_vessel, vessel_name):
         """Return an existing `BloodVessel` by name or create and register one."""
         if vessel_name in model_registry:
@@ -187,7 +201,7 @@ class MicroVascularUnit(BaseModel):
             if isinstance(vessel, BloodVessel):
                 return vessel
 
-        vessel = BloodVessel(model_ref=model_ref_for_vessel, name=vessel_name)
+        vessel = self._component_class(BloodVessel)(model_ref=model_ref_for_vessel, name=vessel_name)
         model_registry[vessel_name] = vessel
         return vessel
 
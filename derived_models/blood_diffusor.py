@@ -6,6 +6,9 @@ class BloodDiffusor(BaseModel):
     """Diffusive exchange model between two blood-containing compartments."""
 
     model_type = "blood_diffusor"
+    step_phase = "exchange"
+    reference_attributes = ("comp_blood1", "comp_blood2")
+    shared_resources = ("functions.blood_composition",)  # calc_blood_composition keeps its state in module globals
 
     def __init__(self, model_ref={}, name=None):
         """Initialize blood diffusion settings and component references."""
@@ -48,8 +48,10 @@ class GasCapacitance(Capacitance):
         self.add_heat()
         self.add_watervapour()
 
-        self.calc_elastance()
-        self.calc_volume()
+        if self._parameters_changed:
+            self._parameters_changed = False
+            self.calc_elastance()
+            self.calc_volume()
 
         if self.vol < 0.0:
             raise ValueError(f"Volume cannot be negative. Current volume: {self.vol} L in {self.name}")
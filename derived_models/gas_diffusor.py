@@ -5,6 +5,8 @@ class GasDiffusor(BaseModel):
     """Diffusive exchange model between two gas-containing compartments."""
 
     model_type = "gas_diffusor"
+    step_phase = "exchange"
+    reference_attributes = ("comp_gas1", "comp_gas2")
 
     def __init__(self, model_ref = {}, name=None):
         """Initialize gas diffusion settings and component references."""
@@ -5,6 +5,9 @@ class GasExchanger(BaseModel):
     """Bidirectional gas exchange model between blood and gas compartments."""
 
     model_type = "gas_exchanger"
+    step_phase = "exchange"
+    reference_attributes = ("comp_blood", "comp_gas")
+    shared_resources = ("functions.blood_composition",)  # calc_blood_composition keeps its state in module globals
 
     def __init__(self, model_ref = {}, name=None):
         """Initialize exchanger connectivity, diffusion constants, and flux state."""
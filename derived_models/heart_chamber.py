@@ -5,6 +5,7 @@ class HeartChamber(TimeVaryingElastance):
     """Heart chamber model with ANS-modulated elastance and blood mixing."""
 
     model_type = "heart_chamber"
+    tracked_parameters = TimeVaryingElastance.tracked_parameters + ("ans_activity", "ans_sens")
 
     def __init__(self, model_ref={}, name=None):
         """Initialize chamber mechanics and blood-related state."""
@@ -57,12 +58,16 @@ class HeartChamber(TimeVaryingElastance):
         if self._el_max < self._el_min:
             self._el_max = self._el_min
 
-        self.el = self._el_min + (self._el_max - self._el_min) * self.act_factor
-
         self.el_min_factor = 1.0
         self.el_max_factor = 1.0
         self.el_k_factor = 1.0
 
+    def calc_pressure(self):
+        """Compute the current chamber elastance from the activation factor and the pressures."""
+        self.el = self._el_min + (self._el_max - self._el_min) * self.act_factor
+
+        super().calc_pressure()
+
     def volume_in(self, dvol, comp_from=None):
         """Add incoming volume and mix chemistry from source compartment."""
         super().volume_in(dvol)
@@ -5,6 +5,7 @@ class Pump(BloodCapacitance):
     """Active blood pump model that applies pressure to inlet or outlet side."""
 
     model_type = "pump"
+    reference_attributes = ("inlet", "outlet")
 
     def __init__(self, model_ref={}, name=None):
         """Initialize pump connectivity, operating mode, and pressure state."""
@@ -9,6 +9,26 @@ class Ecls(BaseModel):
 	"""Extracorporeal life support (ECLS/ECMO) circuit controller."""
 
 	model_type = "ecls"
+	dormant_when_inactive = True
+	circuit_models = (
+		"ECLS_DRAINAGE",
+		"ECLS_TUBIN",
+		"ECLS_TUBIN_PUMP",
+		"ECLS_TUBIN_OXY",
+		"ECLS_PUMP",
+		"ECLS_PUMP_OXY",
+		"ECLS_PUMP_TUBOUT",
+		"ECLS_OXY",
+		"ECLS_OXY_TUBOUT",
+		"ECLS_TUBOUT",
+		"ECLS_RETURN",
+		"ECLS_GASIN",
+		"ECLS_GASIN_OXY",
+		"ECLS_GASOXY",
+		"ECLS_OXY_GASOUT",
+		"ECLS_GASOUT",
+		"ECLS_GASEX",
+	)
 
 	def __init__(self, model_ref={}, name=None):
 		"""Initialize ECLS configuration, runtime metrics, and component references."""
@@ -119,23 +139,7 @@ class Ecls(BaseModel):
 		"""Resolve circuit components and apply initial ECLS configuration."""
 		super().init_model(args)
 
-		self._drainage = self._resolve_model("ECLS_DRAINAGE")
-		self._tubin = self._resolve_model("ECLS_TUBIN")
-		self._tubin_pump = self._resolve_model("ECLS_TUBIN_PUMP")
-		self._tubin_oxy = self._resolve_model("ECLS_TUBIN_OXY")
-		self._pump = self._resolve_model("ECLS_PUMP")
-		self._pump_oxy = self._resolve_model("ECLS_PUMP_OXY")
-		self._pump_tubout = self._resolve_model("ECLS_PUMP_TUBOUT")
-		self._oxy = self._resolve_model("ECLS_OXY")
-		self._oxy_tubout = self._resolve_model("ECLS_OXY_TUBOUT")
-		self._tubout = self._resolve_model("ECLS_TUBOUT")
-		self._return = self._resolve_model("ECLS_RETURN")
-		self._gasin = self._resolve_model("ECLS_GASIN")
-		self._gasin_oxy = self._resolve_model("ECLS_GASIN_OXY")
-		self._gasoxy = self._resolve_model("ECLS_GASOXY")
-		self._gasoxy_gasout = self._resolve_model("ECLS_OXY_GASOUT")
-		self._gasout = self._resolve_model("ECLS_GASOUT")
-		self._gasex = self._resolve_model("ECLS_GASEX")
+		self.rebind_references()
 
 		model_time_total = float(getattr(self._model_engine, "model_time_total", 0.0) or 0.0)
 		if model_time_total == 0.0:
@@ -161,6 +165,26 @@ class Ecls(BaseModel):
 			self.switch_blood_components(self.ecls_running)
 			self.switch_gas_components(self.ecls_running)
 
+	def rebind_references(self):
+		"""Resolve the blood and gas circuit components."""
+		self._drainage = self._resolve_model("ECLS_DRAINAGE")
+		self._tubin = self._resolve_model("ECLS_TUBIN")
+		self._tubin_pump = self._resolve_model("ECLS_TUBIN_PUMP")
+		self._tubin_oxy = self._resolve_model("ECLS_TUBIN_OXY")
+		self._pump = self._resolve_model("ECLS_PUMP")
+		self._pump_oxy = self._resolve_model("ECLS_PUMP_OXY")
+		self._pump_tubout = self._resolve_model("ECLS_PUMP_TUBOUT")
+		self._oxy = self._resolve_model("ECLS_OXY")
+		self._oxy_tubout = self._resolve_model("ECLS_OXY_TUBOUT")
+		self._tubout = self._resolve_model("ECLS_TUBOUT")
+		self._return = self._resolve_model("ECLS_RETURN")
+		self._gasin = self._resolve_model("ECLS_GASIN")
+		self._gasin_oxy = self._resolve_model("ECLS_GASIN_OXY")
+		self._gasoxy = self._resolve_model("ECLS_GASOXY")
+		self._gasoxy_gasout = self._resolve_model("ECLS_OXY_GASOUT")
+		self._gasout = self._resolve_model("ECLS_GASOUT")
+		self._gasex = self._resolve_model("ECLS_GASEX")
+
 	def calc_model(self):
 		"""Run one ECLS control/update step for flow, pressures, and gas settings."""
 		if self.ecls_running and self._return is not None:
@@ -225,11 +249,22 @@ class Ecls(BaseModel):
 		if self._return is not None:
 			self._return.no_flow = self.tubing_clamped
 
+	def get_subsystem_models(self):
+		"""Return the ECLS circuit models, including the declared components."""
+		names = list(self.circuit_models)
+		names.extend(name for name in super().get_subsystem_models() if name not in names)
+		return names
+
+	def is_subsystem_active(self):
+		"""The ECLS circuit only needs stepping while ECLS is running."""
+		return bool(self.ecls_running)
+
 	def switch_ecls(self, state):
 		"""Enable or disable ECLS blood and gas sub-circuits."""
 		self.ecls_running = bool(state)
 		self.switch_blood_components(self.ecls_running)
 		self.switch_gas_components(self.ecls_running)
+		self._notify_subsystem_state()
 
 	def set_ecls_mode(self, new_mode):
 		"""Set ECLS operating mode and update circuit topology switches."""
@@ -8,6 +8,7 @@ class MechanicalVentilator(BaseModel):
 	"""Mechanical ventilator controller supporting PC, PRVC, and PS modes."""
 
 	model_type = "mechanical_ventilator"
+	dormant_when_inactive = True
 
 	def __init__(self, model_ref={}, name=None):
 		"""Initialize ventilator settings, measured outputs, and runtime state."""
@@ -103,6 +104,20 @@ class MechanicalVentilator(BaseModel):
 		else:
 			super().init_model(args)
 
+		self.rebind_references()
+
+		if self._vent_gasin is not None:
+			calc_gas_composition(self._vent_gasin, self.fio2, self.temp, self.humidity)
+		if self._vent_gascircuit is not None:
+			calc_gas_composition(self._vent_gascircuit, self.fio2, self.temp, self.humidity)
+		if self._vent_gasout is not None:
+			calc_gas_composition(self._vent_gasout, 0.205, 20.0, 0.5)
+
+		self.set_ettube_diameter(self.ettube_diameter)
+		self._et_tube_resistance = self.calc_ettube_resistance(self.flow)
+
+	def rebind_references(self):
+		"""Resolve the breathing model and the ventilator circuit components."""
 		self._breathing_model = self._resolve_model("Breathing")
 		self._vent_gasin = self._resolve_model("VENT_GASIN")
 		self._vent_gascircuit = self._resolve_model("VENT_GASCIRCUIT")
@@ -120,16 +135,6 @@ class MechanicalVentilator(BaseModel):
 			self._vent_exp_valve,
 		]
 
-		if self._vent_gasin is not None:
-			calc_gas_composition(self._vent_gasin, self.fio2, self.temp, self.humidity)
-		if self._vent_gascircuit is not None:
-			calc_gas_composition(self._vent_gascircuit, self.fio2, self.temp, self.humidity)
-		if self._vent_gasout is not None:
-			calc_gas_composition(self._vent_gasout, 0.205, 20.0, 0.5)
-
-		self.set_ettube_diameter(self.ettube_diameter)
-		self._et_tube_resistance = self.calc_ettube_resistance(self.flow)
-
 	def calc_model(self):
 		"""Run one ventilator control/update step for current operating mode."""
 		if not self.is_enabled:
@@ -358,6 +363,14 @@ class MechanicalVentilator(BaseModel):
 		if mouth_ds is not None and hasattr(mouth_ds, "no_flow"):
 			mouth_ds.no_flow = state
 
+		self._notify_subsystem_state()
+
+	def get_subsystem_models(self):
+		"""Return the ventilator circuit models, including the declared components."""
+		names = [vp.name for vp in self._ventilator_parts if vp is not None]
+		names.extend(name for name in super().get_subsystem_models() if name not in names)
+		return names
+
 	def calc_ettube_resistance(self, flow):
 		"""Compute and apply ET tube resistance from calibrated flow relation."""
 		flow = float(flow)
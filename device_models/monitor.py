@@ -1,18 +1,89 @@
 from collections.abc import Mapping
 
 from base_models.base_model import BaseModel
+from helpers.rolling_statistics import RollingWindow
+from helpers.signal_acquisition import SignalAcquisition
+
+
+class _DeferredMetric:
+	"""Data descriptor for a derived metric that lazy mode may not have computed yet.
+
+	The value stays in the instance dict; reading it first publishes the
+	pending beat and flow metrics, so a stale value is never returned.
+	"""
+
+	__slots__ = ("name",)
+
+	def __init__(self, name):
+		self.name = name
+
+	def __get__(self, instance, owner=None):
+		if instance is None:
+			return self
+		state = instance.__dict__
+		if state.get("_pending_beat") is not None or state.get("_pending_flows") is not None:
+			instance.publish_pending_metrics()
+		try:
+			return state[self.name]
+		except KeyError:
+			raise AttributeError(f"'{type(instance).__name__}' object has no attribute '{self.name}'") from None
+
+	def __set__(self, instance, value):
+		instance.__dict__[self.name] = value
 
 
 class Monitor(BaseModel):
 	"""Patient monitor aggregator computing bedside-style vital signals."""
 
 	model_type = "monitor"
+	step_phase = "monitor"
+	beat_metrics = (
+		"abp_pre_syst",
+		"abp_pre_diast",
+		"abp_pre_mean",
+		"abp_syst",
+		"abp_diast",
+		"abp_mean",
+		"cvp",
+		"pap_syst",
+		"pap_diast",
+		"pap_mean",
+		"edv_lv",
+		"edv_rv",
+		"esv_lv",
+		"esv_rv",
+		"lv_sv",
+		"rv_sv",
+		"edp_lv",
+		"esp_lv",
+		"edp_rv",
+		"esp_rv",
+	)
+	flow_metrics = (
+		"lvo",
+		"rvo",
+		"ivc_flow",
+		"svc_flow",
+		"cor_flow",
+		"brain_flow",
+		"kid_flow",
+		"da_flow",
+		"fo_flow",
+		"vsd_flow",
+		"ips_flow",
+		"ua_flow",
+		"uv_flow",
+		"do2_br",
+		"do2_lb",
+	)
+	vital_signs = ("heart_rate", "resp_rate", "spo2", "spo2_pre", "spo2_ven", "etco2", "temp")
 
 	def __init__(self, model_ref={}, name=None):
 		"""Initialize monitor channel mappings, outputs, and rolling state."""
 		super().__init__(model_ref=model_ref, name=name)
 
 		self.hr_avg_beats = 5.0
+		self.lazy_metrics = False
 		self.rr_avg_time = 20.0
 		self.sat_avg_time = 5.0
 		self.sat_sampling_interval = 1.0
@@ -134,46 +205,23 @@ class Monitor(BaseModel):
 		self._vsd = None
 		self._ips = None
 
-		self._temp_aa_pres_max = -1000.0
-		self._temp_aa_pres_min = 1000.0
-		self._temp_ad_pres_max = -1000.0
-		self._temp_ad_pres_min = 1000.0
-		self._temp_ra_pres_max = -1000.0
-		self._temp_ra_pres_min = 1000.0
-		self._temp_pa_pres_max = -1000.0
-		self._temp_pa_pres_min = 1000.0
-		self._temp_lv_pres_max = -1000.0
-		self._temp_lv_pres_min = 1000.0
-		self._temp_rv_pres_max = -1000.0
-		self._temp_rv_pres_min = 1000.0
-		self._temp_lv_vol_max = -1000.0
-		self._temp_lv_vol_min = 1000.0
-		self._temp_rv_vol_max = -1000.0
-		self._temp_rv_vol_min = 1000.0
-		self._lvo_counter = 0.0
-		self._rvo_counter = 0.0
-		self._cor_flow_counter = 0.0
-		self._ivc_flow_counter = 0.0
-		self._svc_flow_counter = 0.0
-		self._brain_flow_counter = 0.0
-		self._kid_flow_counter = 0.0
-		self._da_flow_counter = 0.0
-		self._fo_flow_counter = 0.0
-		self._vsd_flow_counter = 0.0
-		self._ips_flow_counter = 0.0
-		self._ua_flow_counter = 0.0
-		self._uv_flow_counter = 0.0
-		self._hr_list = []
-		self._edv_lv_list = []
-		self._edv_rv_list = []
-		self._esv_lv_list = []
-		self._esv_rv_list = []
-		self._edp_lv_list = []
-		self._edp_rv_list = []
-		self._rr_list = []
-		self._spo2_list = []
-		self._spo2_pre_list = []
-		self._spo2_ven_list = []
+		self._acquisition = SignalAcquisition()
+		self._envelope_channels = {}
+		self._flow_channels = {}
+		self._pending_beat = None
+		self._pending_flows = None
+		self._vitals_snapshot = None
+		self._hr_window = RollingWindow()
+		self._edv_lv_window = RollingWindow()
+		self._edv_rv_window = RollingWindow()
+		self._esv_lv_window = RollingWindow()
+		self._esv_rv_window = RollingWindow()
+		self._edp_lv_window = RollingWindow()
+		self._edp_rv_window = RollingWindow()
+		self._rr_window = RollingWindow()
+		self._spo2_window = RollingWindow()
+		self._spo2_pre_window = RollingWindow()
+		self._spo2_ven_window = RollingWindow()
 		self._rr_avg_counter = 0.0
 		self._sat_avg_counter = 0.0
 		self._sat_sampling_counter = 0.0
@@ -220,6 +268,11 @@ class Monitor(BaseModel):
 		else:
 			super().init_model(args)
 
+		self._rr_update_counter = 0.0
+		self.rebind_references()
+
+	def rebind_references(self):
+		"""Resolve the monitored components and rebuild the signal acquisition."""
 		self._heart = self._resolve_model(self.heart)
 		self._lv = self._resolve_model(self.lv)
 		self._rv = self._resolve_model(self.rv)
@@ -244,27 +297,64 @@ class Monitor(BaseModel):
 		self._ips = self._resolve_model(self.ips)
 		self._ad_umb_art = self._resolve_model(self.ua)
 		self._umb_ven_ivci = self._resolve_model(self.uv)
-		self._rr_update_counter = 0.0
+
+		self._build_acquisition()
+
+	def _build_acquisition(self):
+		"""Register the envelope and flow channels read once per step."""
+		self._acquisition = SignalAcquisition()
+
+		envelope_sources = {
+			"aa_pres": (self._aa, "pres_in"),
+			"lv_pres": (self._lv, "pres_in"),
+			"rv_pres": (self._rv, "pres_in"),
+			"lv_vol": (self._lv, "vol"),
+			"rv_vol": (self._rv, "vol"),
+			"ad_pres": (self._ad, "pres_in"),
+			"ra_pres": (self._ra, "pres_in"),
+			"pa_pres": (self._pa, "pres_in"),
+		}
+		self._envelope_channels = {
+			channel_name: self._acquisition.add_envelope(model, prop)
+			for channel_name, (model, prop) in envelope_sources.items()
+		}
+
+		# output attribute -> flow channel, only for connectors that exist
+		flow_sources = {
+			"lvo": self._lv_aa,
+			"rvo": self._rv_pa,
+			"ivc_flow": self._ivc_ra,
+			"svc_flow": self._svc_ra,
+			"cor_flow": self._cor_ra,
+			"brain_flow": self._aa_br,
+			"kid_flow": self._ad_kid,
+			"da_flow": self._da,
+			"fo_flow": self._fo,
+			"vsd_flow": self._vsd,
+			"ips_flow": self._ips,
+			"ua_flow": self._ad_umb_art,
+			"uv_flow": self._umb_ven_ivci,
+		}
+		self._flow_channels = {}
+		for output_name, model in flow_sources.items():
+			if model is not None:
+				self._flow_channels[output_name] = self._acquisition.add_integral(model, "flow")
 
 	def calc_avg_heartrate(self, hr):
 		"""Update rolling average heart rate using adaptive beat window."""
-		self._hr_list.append(float(hr))
+		self._hr_window.append(hr)
 
 		if hr < 80.0:
 			self.hr_avg_beats = 4.0
 		else:
 			self.hr_avg_beats = 12.0
 
-		if self._hr_list:
-			self.heart_rate = sum(self._hr_list) / len(self._hr_list)
-
-		while len(self._hr_list) > int(self.hr_avg_beats):
-			self._hr_list.pop(0)
+		self.heart_rate = self._hr_window.mean
+		self._hr_window.trim(self.hr_avg_beats)
 
 	def calc_model(self):
 		"""Collect pressures/flows/signals and update derived monitor channels."""
-		self.collect_pressures()
-		self.collect_blood_flows()
+		self._acquisition.acquire(self._t)
 		self.collect_signals()
 
 		self.temp = self._safe_float(self._aa, "temp", self.temp)
@@ -291,109 +381,10 @@ class Monitor(BaseModel):
 
 		if ncc_ventricular == 1.0:
 			self._beats_counter += 1
-
-			if self._aa is not None:
-				self.abp_pre_syst = self._temp_aa_pres_max
-				self.abp_pre_diast = self._temp_aa_pres_min
-				self.abp_pre_mean = (2.0 * self._temp_aa_pres_min + self._temp_aa_pres_max) / 3.0
-				self._temp_aa_pres_max = -1000.0
-				self._temp_aa_pres_min = 1000.0
-			if self._ad is not None:
-				self.abp_syst = self._temp_ad_pres_max
-				self.abp_diast = self._temp_ad_pres_min
-				self.abp_mean = (2.0 * self._temp_ad_pres_min + self._temp_ad_pres_max) / 3.0
-				self._temp_ad_pres_max = -1000.0
-				self._temp_ad_pres_min = 1000.0
-			if self._ra is not None:
-				self.cvp = (2.0 * self._temp_ra_pres_min + self._temp_ra_pres_max) / 3.0
-				self._temp_ra_pres_max = -1000.0
-				self._temp_ra_pres_min = 1000.0
-			if self._pa is not None:
-				self.pap_syst = self._temp_pa_pres_max
-				self.pap_diast = self._temp_pa_pres_min
-				self.pap_mean = (2.0 * self._temp_pa_pres_min + self._temp_pa_pres_max) / 3.0
-				self._temp_pa_pres_max = -1000.0
-				self._temp_pa_pres_min = 1000.0
-			if self._lv is not None:
-				self._edv_lv_list.append(self._temp_lv_vol_max * 1000.0)
-				self._edv_rv_list.append(self._temp_rv_vol_max * 1000.0)
-				self._esv_lv_list.append(self._temp_lv_vol_min * 1000.0)
-				self._esv_rv_list.append(self._temp_rv_vol_min * 1000.0)
-
-				if self._edv_lv_list:
-					self.edv_lv = sum(self._edv_lv_list) / len(self._edv_lv_list)
-				if self._edv_rv_list:
-					self.edv_rv = sum(self._edv_rv_list) / len(self._edv_rv_list)
-				if self._esv_lv_list:
-					self.esv_lv = sum(self._esv_lv_list) / len(self._esv_lv_list)
-				if self._esv_rv_list:
-					self.esv_rv = sum(self._esv_rv_list) / len(self._esv_rv_list)
-
-				self.lv_sv = self.edv_lv - self.esv_lv
-				self.rv_sv = self.edv_rv - self.esv_rv
-
-				while len(self._edv_lv_list) > int(self.hr_avg_beats):
-					self._edv_lv_list.pop(0)
-					self._edv_rv_list.pop(0)
-					self._esv_lv_list.pop(0)
-					self._esv_rv_list.pop(0)
-
-				self.edp_lv = self._temp_lv_pres_min
-				self.esp_lv = self._temp_lv_pres_max
-				self.edp_rv = self._temp_rv_pres_min
-				self.esp_rv = self._temp_rv_pres_max
-
-				self._temp_lv_pres_max = -1000.0
-				self._temp_lv_pres_min = 1000.0
-				self._temp_rv_pres_max = -1000.0
-				self._temp_rv_pres_min = 1000.0
-				self._temp_lv_vol_max = -1000.0
-				self._temp_lv_vol_min = 1000.0
-				self._temp_rv_vol_max = -1000.0
-				self._temp_rv_vol_min = 1000.0
+			self.flush_beat_envelopes()
 
 		if self._beats_counter > self.hr_avg_beats and self._beats_time > 0.0:
-			if self._lv_aa is not None:
-				self.lvo = (self._lvo_counter / self._beats_time) * 60.0
-				self._lvo_counter = 0.0
-			if self._rv_pa is not None:
-				self.rvo = (self._rvo_counter / self._beats_time) * 60.0
-				self._rvo_counter = 0.0
-			if self._ivc_ra is not None:
-				self.ivc_flow = (self._ivc_flow_counter / self._beats_time) * 60.0
-				self._ivc_flow_counter = 0.0
-			if self._svc_ra is not None:
-				self.svc_flow = (self._svc_flow_counter / self._beats_time) * 60.0
-				self._svc_flow_counter = 0.0
-			if self._cor_ra is not None:
-				self.cor_flow = (self._cor_flow_counter / self._beats_time) * 60.0
-				self._cor_flow_counter = 0.0
-			if self._aa_br is not None:
-				self.brain_flow = (self._brain_flow_counter / self._beats_time) * 60.0
-				self._brain_flow_counter = 0.0
-				self.do2_br = self.brain_flow * self._safe_float(self._aa, "to2", 0.0) * 22.4
-			if self._ad_kid is not None:
-				self.kid_flow = (self._kid_flow_counter / self._beats_time) * 60.0
-				self._kid_flow_counter = 0.0
-				self.do2_lb = self.kid_flow * 4.0 * self._safe_float(self._ad, "to2", 0.0) * 22.4
-			if self._da is not None:
-				self.da_flow = (self._da_flow_counter / self._beats_time) * 60.0
-				self._da_flow_counter = 0.0
-			if self._fo is not None:
-				self.fo_flow = (self._fo_flow_counter / self._beats_time) * 60.0
-				self._fo_flow_counter = 0.0
-			if self._vsd is not None:
-				self.vsd_flow = (self._vsd_flow_counter / self._beats_time) * 60.0
-				self._vsd_flow_counter = 0.0
-			if self._ips is not None:
-				self.ips_flow = (self._ips_flow_counter / self._beats_time) * 60.0
-				self._ips_flow_counter = 0.0
-			if self._ad_umb_art is not None:
-				self.ua_flow = (self._ua_flow_counter / self._beats_time) * 60.0
-				self._ua_flow_counter = 0.0
-			if self._umb_ven_ivci is not None:
-				self.uv_flow = (self._uv_flow_counter / self._beats_time) * 60.0
-				self._uv_flow_counter = 0.0
+			self.flush_blood_flows()
 
 			self._beats_counter = 0
 			self._beats_time = 0.0
@@ -416,37 +407,133 @@ class Monitor(BaseModel):
 		self.cvp_signal = self._safe_float(self._ra, "pres_in", 0.0)
 		self.co2_signal = self._safe_float(self._ventilator, "co2", 0.0)
 
-	def collect_pressures(self):
-		"""Track running min/max pressure and volume envelopes for cycle metrics."""
-		self._temp_aa_pres_max = max(self._temp_aa_pres_max, self._safe_float(self._aa, "pres_in", -1000.0)) if self._aa else -1000.0
-		self._temp_aa_pres_min = min(self._temp_aa_pres_min, self._safe_float(self._aa, "pres_in", 1000.0)) if self._aa else 1000.0
-		self._temp_lv_pres_max = max(self._temp_lv_pres_max, self._safe_float(self._lv, "pres_in", -1000.0)) if self._lv else -1000.0
-		self._temp_lv_pres_min = min(self._temp_lv_pres_min, self._safe_float(self._lv, "pres_in", 1000.0)) if self._lv else 1000.0
-		self._temp_rv_pres_max = max(self._temp_rv_pres_max, self._safe_float(self._rv, "pres_in", -1000.0)) if self._rv else -1000.0
-		self._temp_rv_pres_min = min(self._temp_rv_pres_min, self._safe_float(self._rv, "pres_in", 1000.0)) if self._rv else 1000.0
-		self._temp_lv_vol_max = max(self._temp_lv_vol_max, self._safe_float(self._lv, "vol", -1000.0)) if self._lv else -1000.0
-		self._temp_lv_vol_min = min(self._temp_lv_vol_min, self._safe_float(self._lv, "vol", 1000.0)) if self._lv else 1000.0
-		self._temp_rv_vol_max = max(self._temp_rv_vol_max, self._safe_float(self._rv, "vol", -1000.0)) if self._rv else -1000.0
-		self._temp_rv_vol_min = min(self._temp_rv_vol_min, self._safe_float(self._rv, "vol", 1000.0)) if self._rv else 1000.0
-		self._temp_ad_pres_max = max(self._temp_ad_pres_max, self._safe_float(self._ad, "pres_in", -1000.0)) if self._ad else -1000.0
-		self._temp_ad_pres_min = min(self._temp_ad_pres_min, self._safe_float(self._ad, "pres_in", 1000.0)) if self._ad else 1000.0
-		self._temp_ra_pres_max = max(self._temp_ra_pres_max, self._safe_float(self._ra, "pres_in", -1000.0)) if self._ra else -1000.0
-		self._temp_ra_pres_min = min(self._temp_ra_pres_min, self._safe_float(self._ra, "pres_in", 1000.0)) if self._ra else 1000.0
-		self._temp_pa_pres_max = max(self._temp_pa_pres_max, self._safe_float(self._pa, "pres_in", -1000.0)) if self._pa else -1000.0
-		self._temp_pa_pres_min = min(self._temp_pa_pres_min, self._safe_float(self._pa, "pres_in", 1000.0)) if self._pa else 1000.0
-
-	def collect_blood_flows(self):
-		"""Accumulate per-step flow integrals for derived flow/cardiac output metrics."""
-		self._lvo_counter += self._safe_float(self._lv_aa, "flow", 0.0) * self._t
-		self._rvo_counter += self._safe_float(self._rv_pa, "flow", 0.0) * self._t
-		self._cor_flow_counter += self._safe_float(self._cor_ra, "flow", 0.0) * self._t
-		self._ivc_flow_counter += self._safe_float(self._ivc_ra, "flow", 0.0) * self._t
-		self._svc_flow_counter += self._safe_float(self._svc_ra, "flow", 0.0) * self._t
-		self._brain_flow_counter += self._safe_float(self._aa_br, "flow", 0.0) * self._t
-		self._kid_flow_counter += self._safe_float(self._ad_kid, "flow", 0.0) * self._t
-		self._da_flow_counter += self._safe_float(self._da, "flow", 0.0) * self._t
-		self._fo_flow_counter += self._safe_float(self._fo, "flow", 0.0) * self._t
-		self._vsd_flow_counter += self._safe_float(self._vsd, "flow", 0.0) * self._t
-		self._ips_flow_counter += self._safe_float(self._ips, "flow", 0.0) * self._t
-		self._ua_flow_counter += self._safe_float(self._ad_umb_art, "flow", 0.0) * self._t
-		self._uv_flow_counter += self._safe_float(self._umb_ven_ivci, "flow", 0.0) * self._t
+	def flush_beat_envelopes(self):
+		"""Take the pressure/volume envelopes of the finished beat and publish or defer them."""
+		beat = self._take_beat_envelopes()
+		self._vitals_snapshot = None
+
+		if self.lazy_metrics:
+			self._pending_beat = beat
+		else:
+			self._pending_beat = None
+			self._publish_beat_metrics(beat)
+
+	def flush_blood_flows(self):
+		"""Take the accumulated flow integrals and publish or defer the per-minute flows."""
+		flows = {
+			output_name: self._acquisition.take_integral(channel)
+			for output_name, channel in self._flow_channels.items()
+		}
+		pending = {
+			"flows": flows,
+			"beats_time": self._beats_time,
+			"aa_to2": self._safe_float(self._aa, "to2", 0.0),
+			"ad_to2": self._safe_float(self._ad, "to2", 0.0),
+		}
+		self._vitals_snapshot = None
+
+		if self.lazy_metrics:
+			self._pending_flows = pending
+		else:
+			self._pending_flows = None
+			self._publish_flow_metrics(pending)
+
+	def publish_pending_metrics(self):
+		"""Compute the derived metrics deferred by lazy mode, if any."""
+		if self._pending_beat is not None:
+			beat = self._pending_beat
+			self._pending_beat = None
+			self._publish_beat_metrics(beat)
+		if self._pending_flows is not None:
+			pending = self._pending_flows
+			self._pending_flows = None
+			self._publish_flow_metrics(pending)
+
+	def snapshot_vitals(self):
+		"""Return the current vital signs and derived metrics, cached until the next beat."""
+		if self._vitals_snapshot is None:
+			self.publish_pending_metrics()
+			names = self.vital_signs + self.beat_metrics + self.flow_metrics
+			self._vitals_snapshot = {name: getattr(self, name) for name in names}
+		return dict(self._vitals_snapshot)
+
+	def _take_beat_envelopes(self):
+		"""Reset the beat envelopes and return their raw values and the volume averages."""
+		channels = self._envelope_channels
+		acquisition = self._acquisition
+		beat = {}
+
+		if self._aa is not None:
+			beat["aa_pres"] = acquisition.take_envelope(channels.get("aa_pres"))
+		if self._ad is not None:
+			beat["ad_pres"] = acquisition.take_envelope(channels.get("ad_pres"))
+		if self._ra is not None:
+			beat["ra_pres"] = acquisition.take_envelope(channels.get("ra_pres"))
+		if self._pa is not None:
+			beat["pa_pres"] = acquisition.take_envelope(channels.get("pa_pres"))
+		if self._lv is not None:
+			lv_vol_min, lv_vol_max = acquisition.take_envelope(channels.get("lv_vol"))
+			rv_vol_min, rv_vol_max = acquisition.take_envelope(channels.get("rv_vol"))
+			beat["lv_pres"] = acquisition.take_envelope(channels.get("lv_pres"))
+			beat["rv_pres"] = acquisition.take_envelope(channels.get("rv_pres"))
+
+			# the volume windows carry history, so they advance every beat
+			beat["edv_lv"] = self._edv_lv_window.append(lv_vol_max * 1000.0)
+			beat["edv_rv"] = self._edv_rv_window.append(rv_vol_max * 1000.0)
+			beat["esv_lv"] = self._esv_lv_window.append(lv_vol_min * 1000.0)
+			beat["esv_rv"] = self._esv_rv_window.append(rv_vol_min * 1000.0)
+
+			self._edv_lv_window.trim(self.hr_avg_beats)
+			self._edv_rv_window.trim(self.hr_avg_beats)
+			self._esv_lv_window.trim(self.hr_avg_beats)
+			self._esv_rv_window.trim(self.hr_avg_beats)
+
+		return beat
+
+	def _publish_beat_metrics(self, beat):
+		"""Derive the beat metrics from raw envelopes and write the public fields."""
+		if "aa_pres" in beat:
+			aa_pres_min, aa_pres_max = beat["aa_pres"]
+			self.abp_pre_syst = aa_pres_max
+			self.abp_pre_diast = aa_pres_min
+			self.abp_pre_mean = (2.0 * aa_pres_min + aa_pres_max) / 3.0
+		if "ad_pres" in beat:
+			ad_pres_min, ad_pres_max = beat["ad_pres"]
+			self.abp_syst = ad_pres_max
+			self.abp_diast = ad_pres_min
+			self.abp_mean = (2.0 * ad_pres_min + ad_pres_max) / 3.0
+		if "ra_pres" in beat:
+			ra_pres_min, ra_pres_max = beat["ra_pres"]
+			self.cvp = (2.0 * ra_pres_min + ra_pres_max) / 3.0
+		if "pa_pres" in beat:
+			pa_pres_min, pa_pres_max = beat["pa_pres"]
+			self.pap_syst = pa_pres_max
+			self.pap_diast = pa_pres_min
+			self.pap_mean = (2.0 * pa_pres_min + pa_pres_max) / 3.0
+		if "lv_pres" in beat:
+			self.edv_lv = beat["edv_lv"]
+			self.edv_rv = beat["edv_rv"]
+			self.esv_lv = beat["esv_lv"]
+			self.esv_rv = beat["esv_rv"]
+
+			self.lv_sv = self.edv_lv - self.esv_lv
+			self.rv_sv = self.edv_rv - self.esv_rv
+
+			self.edp_lv, self.esp_lv = beat["lv_pres"]
+			self.edp_rv, self.esp_rv = beat["rv_pres"]
+
+	def _publish_flow_metrics(self, pending):
+		"""Derive per-minute flows and oxygen deliveries from raw flow integrals."""
+		beats_time = pending["beats_time"]
+		for output_name, integral in pending["flows"].items():
+			setattr(self, output_name, (integral / beats_time) * 60.0)
+
+		if self._aa_br is not None:
+			self.do2_br = self.brain_flow * pending["aa_to2"] * 22.4
+		if self._ad_kid is not None:
+			self.do2_lb = self.kid_flow * 4.0 * pending["ad_to2"] * 22.4
+
+
+for _name in Monitor.beat_metrics + Monitor.flow_metrics:
+	setattr(Monitor, _name, _DeferredMetric(_name))
+del _name
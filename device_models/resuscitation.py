@@ -57,12 +57,16 @@ class Resuscitation(BaseModel):
 		"""Initialize linked ventilator/breathing references and FiO2 setting."""
 		super().init_model(args)
 
-		self._ventilator = self._resolve_model("Ventilator", "VENT", "MechanicalVentilator")
-		self._breathing = self._resolve_model("Breathing")
+		self.rebind_references()
 
 		if self._ventilator is not None:
 			self.set_fio2(self.vent_fio2)
 
+	def rebind_references(self):
+		"""Resolve the ventilator and breathing models."""
+		self._ventilator = self._resolve_model("Ventilator", "VENT", "MechanicalVentilator")
+		self._breathing = self._resolve_model("Breathing")
+
 	def calc_model(self):
 		"""Run one CPR/ventilation sequencing step and apply chest compression forces."""
 		if not self.cpr_enabled:
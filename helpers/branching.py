@@ -0,0 +1,195 @@
+import os
+import pickle
+import traceback
+
+from helpers.data_collector import DataCollector
+from helpers.model_template import ModelTemplate
+from helpers.task_scheduler import TaskScheduler
+
+
+class Branch:
+	"""Handle of one what-if branch running from a forked engine state."""
+
+	def __init__(self, name, pid=None, read_fd=None, result=None, error=None):
+		"""Initialize a branch handle.
+
+		Args:
+			name: Branch label.
+			pid: Child process id, or `None` for an in-process branch.
+			read_fd: Read end of the result pipe of a forked branch.
+			result: Result of an in-process branch.
+			error: Formatted traceback of an in-process branch that failed.
+		"""
+		self.name = name
+		self.pid = pid
+		self._read_fd = read_fd
+		self._result = result
+		self._error = error
+		self._done = pid is None
+
+	@property
+	def done(self):
+		"""Whether the branch result has been received."""
+		return self._done
+
+	def join(self):
+		"""Wait for the branch and return its result dictionary.
+
+		Returns:
+			dict: Branch result (see `EngineBrancher.fork`).
+
+		Raises:
+			RuntimeError: If the branch raised an exception or exited without
+				sending a result.
+		"""
+		if not self._done:
+			self._receive()
+
+		if self._error is not None:
+			raise RuntimeError(f"Branch '{self.name}' failed:\n{self._error}")
+		return self._result
+
+	def _receive(self):
+		"""Read the pickled result from the pipe and reap the child process."""
+		chunks = []
+		with os.fdopen(self._read_fd, "rb") as reader:
+			while True:
+				chunk = reader.read(1 << 16)
+				if not chunk:
+					break
+				chunks.append(chunk)
+		os.waitpid(self.pid, 0)
+		self._done = True
+
+		if not chunks:
+			self._error = "branch process exited without a result"
+			return
+
+		status, payload = pickle.loads(b"".join(chunks))
+		if status == "ok":
+			self._result = payload
+		else:
+			self._error = payload
+
+
+class EngineBrancher:
+	"""Fork what-if branches from the current state of a warmed-up engine.
+
+	Every branch runs in a child process created with `os.fork`, so it starts
+	from the parent's memory copy-on-write without serializing the engine.
+	The branch schedules its interventions on a `TaskScheduler`, steps the
+	engine for the requested duration, samples a `DataCollector` watchlist and
+	sends the result back over a pipe. On platforms without `os.fork` the
+	branch runs in-process on a `ModelTemplate` copy of the engine instead.
+	"""
+
+	def __init__(self, engine, watch_list=None, sample_interval=0.005, watch_list_slow=None, sample_interval_slow=1.0):
+		"""Initialize a brancher for an engine.
+
+		Args:
+			engine: Initialized `ModelEngine` to branch from.
+			watch_list: Property paths (`"MODEL.prop"`) sampled every
+				`sample_interval` seconds in each branch.
+			sample_interval: Fast sampling interval in seconds.
+			watch_list_slow: Property paths sampled every `sample_interval_slow`.
+			sample_interval_slow: Slow sampling interval in seconds.
+		"""
+		self.engine = engine
+		self.watch_list = list(watch_list or [])
+		self.sample_interval = float(sample_interval)
+		self.watch_list_slow = list(watch_list_slow or [])
+		self.sample_interval_slow = float(sample_interval_slow)
+		self.use_fork = hasattr(os, "fork")
+
+	def fork(self, name, interventions=(), duration=1.0, collect=None):
+		"""Start one branch and return its handle.
+
+		Args:
+			name: Branch label.
+			interventions: TaskScheduler task dictionaries. Entries with a
+				`func` key (`"MODEL.method"`) are scheduled as function calls,
+				all others as property tasks (`model`, `prop1`, `t`, `it`, `at`).
+			duration: Simulated time in seconds.
+			collect: Optional callable receiving the branch engine after the
+				run; its (picklable) return value is stored under `collected`.
+
+		Returns:
+			Branch: Handle whose `join()` returns the result dictionary with
+			`name`, `start_time`, `duration`, `steps`, `data`, `data_slow` and
+			`collected`.
+		"""
+		if not self.use_fork:
+			engine = ModelTemplate(self.engine).instantiate()
+			try:
+				return Branch(name, result=self._run_branch(engine, name, interventions, duration, collect))
+			except Exception:
+				return Branch(name, error=traceback.format_exc())
+
+		read_fd, write_fd = os.pipe()
+		pid = os.fork()
+		if pid == 0:
+			os.close(read_fd)
+			exit_code = 0
+			try:
+				try:
+					message = ("ok", self._run_branch(self.engine, name, interventions, duration, collect))
+				except BaseException:
+					message = ("error", traceback.format_exc())
+					exit_code = 1
+				with os.fdopen(write_fd, "wb") as writer:
+					writer.write(pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL))
+			finally:
+				os._exit(exit_code)
+
+		os.close(write_fd)
+		return Branch(name, pid=pid, read_fd=read_fd)
+
+	def run(self, branches, duration=1.0, collect=None):
+		"""Fork several branches, wait for all of them and return their results.
+
+		Args:
+			branches: Mapping of branch name to its interventions list.
+			duration: Simulated time in seconds for every branch.
+			collect: Optional callable applied to each branch engine (see `fork`).
+
+		Returns:
+			dict: Branch name -> result dictionary.
+		"""
+		handles = [self.fork(name, interventions, duration, collect) for name, interventions in branches.items()]
+		return {handle.name: handle.join() for handle in handles}
+
+	def _run_branch(self, engine, name, interventions, duration, collect):
+		"""Apply interventions, step the engine and assemble the branch result."""
+		scheduler = TaskScheduler(engine)
+		for intervention in interventions:
+			if "func" in intervention:
+				scheduler.add_function_call(intervention)
+			else:
+				scheduler.add_task(intervention)
+
+		collector = None
+		if self.watch_list or self.watch_list_slow:
+			collector = DataCollector(engine)
+			collector.set_sample_interval(self.sample_interval)
+			collector.set_sample_interval_slow(self.sample_interval_slow)
+			collector.add_to_watchlist(self.watch_list)
+			collector.add_to_watchlist_slow(self.watch_list_slow)
+
+		stepsize = float(engine.modeling_stepsize)
+		steps = int(round(float(duration) / stepsize))
+		start_time = float(getattr(engine, "model_time_total", 0.0) or 0.0)
+		for step in range(1, steps + 1):
+			scheduler.run_tasks()
+			engine.step_model()
+			if collector is not None:
+				collector.collect_data(start_time + step * stepsize)
+
+		return {
+			"name": name,
+			"start_time": start_time,
+			"duration": steps * stepsize,
+			"steps": steps,
+			"data": collector.get_model_data() if collector is not None else [],
+			"data_slow": collector.get_model_data_slow() if collector is not None else [],
+			"collected": collect(engine) if collect is not None else None,
+		}
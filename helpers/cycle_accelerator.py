@@ -0,0 +1,286 @@
+import copy
+import marshal
+import math
+
+from helpers.cycle_collector import find_ventilator, resolve_cycle_marker
+from helpers.model_template import _ATOMIC_TYPES, _is_plain_data, _slot_names
+
+
+DEFAULT_SLOW_ATTRIBUTES = ("to2", "tco2", "firing_rate", "effector")
+
+
+class StateSnapshot:
+	"""In-place snapshot of the state of all models.
+
+	Unlike a `ModelTemplate`, which creates new engines, a snapshot restores
+	the state into the existing model objects, so references held by callers
+	stay valid. Numbers, strings and JSON-like containers are restored by
+	value, references to models, the registry and the engine are restored as
+	references, and any other object (rolling windows, signal acquisitions,
+	...) is deep-copied with those references mapped to themselves.
+	Attributes added after the capture are removed on restore.
+	"""
+
+	def __init__(self, engine):
+		"""Capture the state of every model of `engine`."""
+		self._shared = {id(engine): engine, id(engine.models): engine.models}
+		for model in engine.models.values():
+			self._shared[id(model)] = model
+
+		self._atomic = []
+		self._plain = []
+		self._objects = []
+		self._names = []
+		plain_values = []
+		memo = dict(self._shared)
+		for model in engine.models.values():
+			items = list(getattr(model, "__dict__", {}).items())
+			items.extend((name, getattr(model, name)) for name in _slot_names(type(model)) if hasattr(model, name))
+			for name, value in items:
+				if type(value) in _ATOMIC_TYPES or id(value) in self._shared:
+					self._atomic.append((model, name, value))
+				elif _is_plain_data(value):
+					self._plain.append((model, name, len(plain_values)))
+					plain_values.append(value)
+				else:
+					self._objects.append((model, name, copy.deepcopy(value, memo)))
+			self._names.append((model, frozenset(name for name, _ in items)))
+		self._plain_blob = marshal.dumps(plain_values)
+
+	def restore(self):
+		"""Write the captured state back into the models."""
+		for model, names in self._names:
+			state = getattr(model, "__dict__", {})
+			for name in [name for name in state if name not in names]:
+				del state[name]
+			for name in _slot_names(type(model)):
+				if name not in names and hasattr(model, name):
+					delattr(model, name)
+		for model, name, value in self._atomic:
+			setattr(model, name, value)
+		plain_values = marshal.loads(self._plain_blob)
+		for model, name, index in self._plain:
+			setattr(model, name, plain_values[index])
+		# copy again, so the snapshot can be restored more than once
+		memo = dict(self._shared)
+		for model, name, value in self._objects:
+			setattr(model, name, copy.deepcopy(value, memo))
+
+
+class CycleAccelerator:
+	"""Reach the periodic steady state of slow variables in fewer cycles.
+
+	Slow variables (by default the oxygen and carbon dioxide content of every
+	blood compartment and the ANS firing rates and effectors) are averaged
+	over windows of `window` whole cycles of the marker, so the periodic
+	oscillation within a cycle drops out. The marker defaults to the
+	ventilator or the spontaneous breathing, whichever drives ventilation,
+	since the respiratory modulation of the blood gases is larger than the
+	cardiac one, and to the heartbeat otherwise. From three consecutive window means the per-window drift
+	ratio of the slowest mode is estimated by least squares over all
+	variables (vector Aitken extrapolation of a geometrically converging
+	sequence) and all variables are moved to the extrapolated limit, at most
+	`max_jump` windows of drift ahead.
+
+	Every jump is validated by simulating the next window: when the drift
+	after the jump is larger than before it, reverses its direction (the jump
+	overshot the limit) or the state is no longer finite,
+	the model is restored to its state before the jump and the next jumps
+	are damped.
+	"""
+
+	def __init__(self, engine, variables=None, window=8, max_jump=5.0, marker=None):
+		"""Initialize an accelerator on an initialized engine.
+
+		Args:
+			engine: `ModelEngine` to advance.
+			variables: Property paths (`Model.prop`) to extrapolate. Defaults to
+				the `DEFAULT_SLOW_ATTRIBUTES` of all enabled models.
+			window: Number of marker cycles averaged per drift estimate.
+			max_jump: Maximum extrapolation in windows of drift.
+			marker: Cycle marker (see `CycleCollector`), chosen from the
+				ventilator, breathing and heart when `None`.
+
+		Raises:
+			ValueError: If the marker or a variable does not exist.
+		"""
+		self.engine = engine
+		self.window = max(int(window), 1)
+		self.max_jump = float(max_jump)
+		self.modeling_stepsize = float(engine.modeling_stepsize)
+
+		if marker is None:
+			marker = self._default_marker(engine)
+		self.marker = marker
+		marker_path = resolve_cycle_marker(engine, marker)
+		tokens = str(marker_path).split(".")
+		marker_model = engine.models.get(tokens[0]) if len(tokens) == 2 else None
+		if marker_model is None or not hasattr(marker_model, tokens[1]):
+			raise ValueError(f"Cycle marker '{marker_path}' does not exist")
+		self._marker = (marker_model, tokens[1])
+
+		self.variables = []
+		if variables is None:
+			for name, model in engine.models.items():
+				if not getattr(model, "is_enabled", False):
+					continue
+				for attribute in DEFAULT_SLOW_ATTRIBUTES:
+					value = getattr(model, attribute, None)
+					if isinstance(value, float):
+						self.variables.append((f"{name}.{attribute}", model, attribute))
+		else:
+			for path in variables:
+				tokens = str(path).split(".")
+				model = engine.models.get(tokens[0]) if len(tokens) == 2 else None
+				if model is None or not hasattr(model, tokens[1]):
+					raise ValueError(f"Variable '{path}' does not exist")
+				self.variables.append((str(path), model, tokens[1]))
+
+		self.steps = 0
+		self.jumps = 0
+		self.rejected = 0
+		self.damping = 1.0
+		self._step_budget = 0
+		self._previous_marker = None
+
+	def run(self, max_time=300.0, tolerance=1e-4):
+		"""Advance the model, extrapolating slow variables, until their drift has settled.
+
+		Args:
+			max_time: Maximum model time to simulate in seconds.
+			tolerance: Relative drift per window (root mean square over the
+				variables) below which the slow variables count as converged.
+
+		Returns:
+			dict: `converged`, `time` (model seconds simulated), `steps`,
+			`jumps` (accepted extrapolations), `rejected` and `drift` (relative
+			drift per window at the end, root mean square over the variables).
+		"""
+		self._step_budget = self.steps + int(round(float(max_time) / self.modeling_stepsize))
+		self._previous_marker = None
+		converged = False
+		drift = math.inf
+
+		# align the windows with the cycle starts
+		self._run_window(1)
+		first = self._run_window()
+		second = self._run_window()
+		while first is not None and second is not None:
+			third = self._run_window()
+			if third is None:
+				break
+
+			previous_change = [b - a for a, b in zip(first, second)]
+			change = [b - a for a, b in zip(second, third)]
+			drift = self._relative_norm(change, third)
+			if drift <= tolerance:
+				converged = True
+				break
+
+			jump = self._extrapolate(previous_change, change, third)
+			if jump is None:
+				first, second = second, third
+				continue
+
+			snapshot = StateSnapshot(self.engine)
+			for (_, model, attribute), delta in zip(self.variables, jump):
+				setattr(model, attribute, getattr(model, attribute) + delta)
+
+			after = self._run_window()
+			if after is None:
+				break
+			expected = [value + delta for value, delta in zip(third, jump)]
+			change_after = [b - a for a, b in zip(expected, after)]
+			drift_after = self._relative_norm(change_after, after)
+			# after a good jump the drift is smaller and, unless converged, still points the same way
+			overshoot = drift_after > tolerance and self._relative_dot(change_after, change, after) < 0.0
+			if math.isfinite(drift_after) and drift_after <= drift and not overshoot:
+				self.jumps += 1
+				self.damping = min(self.damping * 2.0, 1.0)
+				first, second = expected, after
+				drift = drift_after
+			else:
+				snapshot.restore()
+				self.rejected += 1
+				self.damping *= 0.5
+				first, second = second, third
+
+		return {
+			"converged": converged,
+			"time": self.steps * self.modeling_stepsize,
+			"steps": self.steps,
+			"jumps": self.jumps,
+			"rejected": self.rejected,
+			"drift": drift,
+		}
+
+	def _run_window(self, cycles=None):
+		"""Step until `cycles` (default `window`) marker cycles have completed and return the time-averaged variables.
+
+		Returns `None` when the step budget runs out first.
+		"""
+		engine = self.engine
+		marker_model, marker_attribute = self._marker
+		variables = self.variables
+		cycles = self.window if cycles is None else cycles
+		sums = [0.0] * len(variables)
+		steps = 0
+		completed = 0
+		while completed < cycles:
+			if self.steps >= self._step_budget:
+				return None
+			engine.step_model()
+			self.steps += 1
+			steps += 1
+			for index, (_, model, attribute) in enumerate(variables):
+				sums[index] += getattr(model, attribute)
+
+			marker_value = getattr(marker_model, marker_attribute)
+			previous_marker = self._previous_marker
+			self._previous_marker = marker_value
+			if previous_marker is not None and marker_value < previous_marker:
+				completed += 1
+		return [total / steps for total in sums]
+
+	@staticmethod
+	def _default_marker(engine):
+		"""Return the cycle marker of the process that drives ventilation, or the heartbeat."""
+		ventilator = find_ventilator(engine)
+		if ventilator is not None and getattr(ventilator, "is_enabled", False):
+			return "ventilator"
+		breathing = engine.models.get("Breathing")
+		if breathing is not None and getattr(breathing, "is_enabled", False) and getattr(breathing, "breathing_enabled", False):
+			return "breathing"
+		return "heart"
+
+	def _extrapolate(self, previous_change, change, values):
+		"""Return the Aitken jump per variable, or `None` when the drift does not decay geometrically."""
+		# least-squares ratio change ~ ratio * previous_change on relative changes
+		numerator = 0.0
+		denominator = 0.0
+		for previous_delta, delta, value in zip(previous_change, change, values):
+			scale = max(abs(value), 1e-9) ** 2
+			numerator += delta * previous_delta / scale
+			denominator += previous_delta * previous_delta / scale
+		if denominator == 0.0:
+			return None
+		ratio = numerator / denominator
+		if not 0.0 < ratio < 1.0:
+			return None
+		factor = min(ratio / (1.0 - ratio), self.max_jump * self.damping)
+		return [delta * factor for delta in change]
+
+	@staticmethod
+	def _relative_dot(change, other_change, values):
+		"""Return the dot product of two changes relative to the magnitude of their variables."""
+		return sum(a * b / max(abs(value), 1e-9) ** 2 for a, b, value in zip(change, other_change, values))
+
+	@staticmethod
+	def _relative_norm(change, values):
+		"""Return the root mean square of the changes relative to the magnitude of their variables."""
+		total = 0.0
+		for delta, value in zip(change, values):
+			if not (math.isfinite(delta) and math.isfinite(value)):
+				return math.inf
+			total += (delta / max(abs(value), 1e-9)) ** 2
+		return math.sqrt(total / len(change)) if change else 0.0
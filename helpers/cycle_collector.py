@@ -0,0 +1,264 @@
+CYCLE_MARKERS = {
+	"heart": "Heart.ncc_ventricular",
+	"breathing": "Breathing.ncc_insp",
+	"ventilator": "Ventilator.ncc_insp",
+}
+
+VENTILATOR_TYPES = ("MechanicalVentilator", "Ventilator")
+
+CYCLE_AGGREGATES = ("min", "max", "mean", "range", "first", "last", "integral")
+
+DEFAULT_AGGREGATES = ("min", "max", "mean")
+
+
+def find_ventilator(engine):
+	"""Return the first mechanical ventilator of the engine, whatever its instance name, or `None`."""
+	ventilators = engine.get_models_by_type(*VENTILATOR_TYPES)
+	return ventilators[0] if ventilators else None
+
+
+def resolve_cycle_marker(engine, marker):
+	"""Return the `Model.prop` path of a named cycle marker, or `marker` itself.
+
+	The ventilator marker follows the ventilator instance, which definitions
+	name `Ventilator`, `VENT` or `MechanicalVentilator`.
+	"""
+	if marker == "ventilator":
+		ventilator = find_ventilator(engine)
+		if ventilator is not None:
+			return f"{ventilator.name}.ncc_insp"
+	return CYCLE_MARKERS.get(marker, marker)
+
+
+class CycleCollector:
+	"""Collect one summary row per heartbeat or breath.
+
+	A cycle starts on the step where the cycle counter of the marker model
+	drops below its previous value (`Heart.ncc_ventricular` and the
+	`ncc_insp` counters restart at zero on a new beat or breath). Between two
+	cycle starts every watched property is aggregated per step; when the next
+	cycle starts a row is emitted with the keys `cycle`, `time` (cycle start),
+	`duration` and `"<property>.<aggregate>"`. Aggregates:
+
+	- `min`, `max`, `range`: extremes of the cycle (e.g. systolic/diastolic
+	  pressure, stroke volume as `LV.vol.range`);
+	- `mean`: mean over the cycle (e.g. mean arterial pressure);
+	- `first`, `last`: value at the cycle start and at its last step;
+	- `integral`: time integral over the cycle (e.g. flow to volume).
+
+	Samples before the first cycle start are ignored, so every row covers a
+	complete cycle.
+	"""
+
+	def __init__(self, engine, marker="heart", properties=None, max_rows=None):
+		"""Initialize a collector on an initialized engine.
+
+		Args:
+			engine: `ModelEngine` providing the models and the step size.
+			marker: `heart`, `breathing`, `ventilator` or the path of a cycle
+				counter property.
+			properties: Property paths (`Model.prop` or `Model.prop.key`) with
+				the default aggregates, or a dict of path -> aggregates.
+			max_rows: Maximum number of buffered rows, oldest dropped first.
+
+		Raises:
+			ValueError: If the marker or a property cannot be resolved or an
+				aggregate is unknown.
+		"""
+		self.engine = engine
+		self.modeling_stepsize = float(engine.modeling_stepsize)
+		self.max_rows = max_rows
+
+		marker_path = resolve_cycle_marker(engine, marker)
+		self.marker = self._resolve(marker_path)
+		if self.marker is None:
+			raise ValueError(f"Cycle marker '{marker_path}' does not exist")
+
+		self.properties = []
+		self.collected_rows = []
+		self.cycles = 0
+		self._model_time = 0.0
+		self._previous_marker = None
+		self._cycle_start = None
+		self._reset_cycle()
+
+		if properties:
+			self.add_properties(properties)
+
+	def add_properties(self, properties, aggregates=DEFAULT_AGGREGATES):
+		"""Watch one or more properties; the running cycle is discarded.
+
+		Args:
+			properties: Property path, list of paths or dict of path -> aggregates.
+			aggregates: Aggregates of the paths given without their own.
+
+		Raises:
+			ValueError: If a property cannot be resolved or an aggregate is unknown.
+		"""
+		if isinstance(properties, str):
+			properties = [properties]
+		if not isinstance(properties, dict):
+			properties = {path: aggregates for path in properties}
+
+		for path, path_aggregates in properties.items():
+			if isinstance(path_aggregates, str):
+				path_aggregates = (path_aggregates,)
+			unknown = [aggregate for aggregate in path_aggregates if aggregate not in CYCLE_AGGREGATES]
+			if unknown:
+				raise ValueError(f"Unknown cycle aggregate(s) {', '.join(unknown)} for '{path}'")
+
+			prop = self._resolve(path)
+			if prop is None:
+				raise ValueError(f"Property '{path}' does not exist")
+			prop["aggregates"] = tuple(path_aggregates)
+			self.properties = [item for item in self.properties if item["label"] != path]
+			self.properties.append(prop)
+
+		# a partially aggregated cycle would lack the new properties
+		self._cycle_start = None
+		self._reset_cycle()
+
+	def remove_property(self, path):
+		"""Stop watching a property."""
+		self.properties = [item for item in self.properties if item["label"] != path]
+
+	def attach(self, engine=None):
+		"""Sample after every step of the engine (see `ModelEngine.add_step_listener`)."""
+		engine = self.engine if engine is None else engine
+		engine.add_step_listener(self.collect_data)
+
+	def detach(self, engine=None):
+		"""Stop sampling the engine after `attach`."""
+		engine = self.engine if engine is None else engine
+		engine.remove_step_listener(self.collect_data)
+
+	def get_rows(self):
+		"""Return and clear the buffered cycle rows."""
+		rows = self.collected_rows
+		self.collected_rows = []
+		return rows
+
+	def clear(self):
+		"""Drop the buffered rows and the running cycle."""
+		self.collected_rows = []
+		self._previous_marker = None
+		self._cycle_start = None
+		self._reset_cycle()
+
+	def collect_data(self, model_clock=None):
+		"""Aggregate the current step and emit a row when a new cycle starts.
+
+		Args:
+			model_clock: Model time of the step. When `None` (e.g. as a step
+				listener) an internal clock advanced by the step size is used.
+		"""
+		if model_clock is None:
+			self._model_time += self.modeling_stepsize
+			model_clock = self._model_time
+		else:
+			self._model_time = float(model_clock)
+
+		marker_value = self._read(self.marker)
+		previous_marker = self._previous_marker
+		self._previous_marker = marker_value
+		if previous_marker is not None and marker_value < previous_marker:
+			if self._cycle_start is not None:
+				self._emit_row(model_clock)
+			self._cycle_start = model_clock
+			self._reset_cycle()
+
+		if self._cycle_start is None:
+			return
+
+		self._steps += 1
+		minimum = self._minimum
+		maximum = self._maximum
+		total = self._sum
+		for item in self.properties:
+			value = self._read(item)
+			label = item["label"]
+			if label in total:
+				total[label] += value
+				if value < minimum[label]:
+					minimum[label] = value
+				if value > maximum[label]:
+					maximum[label] = value
+			else:
+				self._first[label] = value
+				total[label] = value
+				minimum[label] = value
+				maximum[label] = value
+			self._last[label] = value
+
+	def _emit_row(self, model_clock):
+		"""Buffer the summary row of the cycle that ends before `model_clock`."""
+		if not self._steps:
+			return
+		self.cycles += 1
+		row = {
+			"cycle": self.cycles,
+			"time": round(self._cycle_start, 4),
+			"duration": round(model_clock - self._cycle_start, 6),
+		}
+		for item in self.properties:
+			label = item["label"]
+			if label not in self._sum:
+				continue
+			for aggregate in item["aggregates"]:
+				if aggregate == "min":
+					value = self._minimum[label]
+				elif aggregate == "max":
+					value = self._maximum[label]
+				elif aggregate == "range":
+					value = self._maximum[label] - self._minimum[label]
+				elif aggregate == "mean":
+					value = self._sum[label] / self._steps
+				elif aggregate == "first":
+					value = self._first[label]
+				elif aggregate == "last":
+					value = self._last[label]
+				else:
+					value = self._sum[label] * self.modeling_stepsize
+				row[f"{label}.{aggregate}"] = value
+
+		self.collected_rows.append(row)
+		if self.max_rows is not None and len(self.collected_rows) > self.max_rows:
+			del self.collected_rows[: len(self.collected_rows) - self.max_rows]
+
+	def _reset_cycle(self):
+		"""Start aggregating a new cycle."""
+		self._steps = 0
+		self._minimum = {}
+		self._maximum = {}
+		self._sum = {}
+		self._first = {}
+		self._last = {}
+
+	def _resolve(self, path):
+		"""Resolve `Model.prop` or `Model.prop.key` into a property descriptor."""
+		tokens = str(path).split(".")
+		if len(tokens) not in (2, 3):
+			return None
+		model = self.engine.models.get(tokens[0])
+		if model is None or not hasattr(model, tokens[1]):
+			return None
+		return {
+			"label": str(path),
+			"model": model,
+			"prop1": tokens[1],
+			"prop2": tokens[2] if len(tokens) == 3 else None,
+		}
+
+	@staticmethod
+	def _read(item):
+		"""Return the current numeric value of a property descriptor."""
+		value = getattr(item["model"], item["prop1"], 0.0)
+		if item["prop2"] is not None:
+			if isinstance(value, dict):
+				value = value.get(item["prop2"], 0.0)
+			else:
+				value = getattr(value, item["prop2"], 0.0)
+		try:
+			return float(value)
+		except (TypeError, ValueError):
+			return 0.0
@@ -1,3 +1,23 @@
+import json
+import operator
+import re
+
+from helpers.decimation import Decimator
+from helpers.trigger_capture import TriggerCapture
+
+
+TRIGGER_OPERATORS = {
+	">": operator.gt,
+	">=": operator.ge,
+	"<": operator.lt,
+	"<=": operator.le,
+	"==": operator.eq,
+	"!=": operator.ne,
+}
+
+_CONDITION_PATTERN = re.compile(r"^\s*([\w.]+)\s*(?:(>=|<=|==|!=|>|<)\s*(.+?))?\s*$")
+
+
 class DataCollector:
 	"""Collects time-series snapshots from selected model properties."""
 
@@ -36,9 +56,198 @@ class DataCollector:
 		self.collected_data = []
 		self.collected_data_slow = []
 
+		self.buffer_samples = True  # keep fast samples for get_model_data; off when only listeners consume them
+		self._listeners = []
+		self._decimator = None
+		self._capture = None
+		self._interval_counter_capture = 0.0
+		self._method_triggers = {}
+
+	def add_listener(self, listener):
+		"""Call `listener(data_object)` with every fast sample, e.g. to publish it elsewhere."""
+		if listener not in self._listeners:
+			self._listeners.append(listener)
+
+	def remove_listener(self, listener):
+		"""Remove a listener added with `add_listener`."""
+		if listener in self._listeners:
+			self._listeners.remove(listener)
+
+	def set_decimation(self, mode=None, points_per_second=50.0, lttb_channel=None):
+		"""Buffer decimated rows instead of every fast sample.
+
+		Args:
+			mode: Decimation mode (`minmax`, `min`, `max`, `last`, `mean`,
+				`lttb`, see `helpers.decimation.Decimator`), or `None` to buffer
+				every sample again.
+			points_per_second: Rows per second of model time.
+			lttb_channel: Property label that selects the samples in `lttb` mode,
+				defaults to the first watched property after the cycle counters.
+		"""
+		if mode is None:
+			self._decimator = None
+			return
+		cycle_counters = (self.ncc_atrial["label"], self.ncc_ventricular["label"])
+		self._decimator = Decimator(mode, 1.0 / float(points_per_second), lttb_channel, cycle_counters)
+
+	def flush_decimation(self):
+		"""Move the rows of the pending (incomplete) decimation bucket into the buffer."""
+		if self._decimator is not None:
+			self.collected_data.extend(self._decimator.flush())
+
+	def enable_capture(
+		self,
+		pre_trigger=2.0,
+		post_trigger=10.0,
+		sample_interval=None,
+		max_captures=10,
+		directory=None,
+		max_files=100,
+	):
+		"""Keep full-rate windows of the fast watch list around trigger events.
+
+		While no trigger fires, only a `pre_trigger` ring buffer is filled, so
+		the normal buffered data can stay at a low rate. See
+		`helpers.trigger_capture.TriggerCapture`.
+
+		Args:
+			pre_trigger: Seconds kept before a trigger.
+			post_trigger: Seconds captured after a trigger.
+			sample_interval: Capture interval in seconds, defaults to every model step.
+			max_captures: Finished windows kept in memory.
+			directory: Directory the finished windows are written to as JSON.
+			max_files: Capture files kept in `directory`.
+
+		Returns:
+			TriggerCapture: The capture buffer.
+		"""
+		if sample_interval is None:
+			sample_interval = self.modeling_stepsize
+		conditions = self._capture.get_conditions() if self._capture is not None else {}
+		self._capture = TriggerCapture(sample_interval, pre_trigger, post_trigger, max_captures, directory, max_files)
+		for name, condition in conditions.items():
+			self._capture.add_condition(name, condition)
+		self._interval_counter_capture = 0.0
+		return self._capture
+
+	def disable_capture(self):
+		"""Finish an open capture window and stop capturing; method triggers are removed."""
+		if self._capture is None:
+			return
+		self._capture.close()
+		for name in list(self._method_triggers):
+			self.remove_trigger(name)
+		self._capture = None
+
+	def add_trigger(self, condition, name=None):
+		"""Start a capture window when a condition becomes true.
+
+		Args:
+			condition: Callable returning a bool, or a string
+				`"Model.prop <op> value"` with `op` one of `>`, `>=`, `<`,
+				`<=`, `==`, `!=` (e.g. `"AA.pres < 30"`), or `"Model.prop"` to
+				trigger on every change of the property.
+			name: Trigger name recorded in the capture, defaults to the condition.
+
+		Returns:
+			bool: Whether the trigger was added.
+		"""
+		if self._capture is None:
+			return False
+		if callable(condition):
+			self._capture.add_condition(name or getattr(condition, "__name__", "condition"), condition)
+			return True
+
+		match = _CONDITION_PATTERN.match(str(condition))
+		prop = self._find_model_prop(match.group(1)) if match else None
+		if prop is None:
+			return False
+
+		if match.group(2) is None:
+			last_value = [self._read_value(prop)]
+
+			def predicate():
+				value = self._read_value(prop)
+				changed = value != last_value[0]
+				last_value[0] = value
+				return changed
+		else:
+			compare = TRIGGER_OPERATORS[match.group(2)]
+			try:
+				threshold = json.loads(match.group(3))
+			except ValueError:
+				threshold = match.group(3).strip("'\"")
+
+			def predicate():
+				try:
+					return bool(compare(self._read_value(prop), threshold))
+				except TypeError:
+					return False
+
+		self._capture.add_condition(name or str(condition).strip(), predicate)
+		return True
+
+	def add_method_trigger(self, method_path, name=None):
+		"""Start a capture window whenever a model method is called, e.g. `Ecls.switch_ecls`.
+
+		The bound method of the model instance is wrapped; `remove_trigger`
+		restores it.
+
+		Returns:
+			bool: Whether the trigger was added.
+		"""
+		if self._capture is None:
+			return False
+		tokens = str(method_path).split(".")
+		models = getattr(self.model, "models", {})
+		if len(tokens) != 2 or tokens[0] not in models:
+			return False
+		model = models[tokens[0]]
+		method = getattr(model, tokens[1], None)
+		if not callable(method):
+			return False
+
+		name = name or str(method_path)
+		self.remove_trigger(name)
+
+		def wrapper(*args, **kwargs):
+			result = method(*args, **kwargs)
+			if self._capture is not None:
+				self._capture.trigger(name)
+			return result
+
+		setattr(model, tokens[1], wrapper)
+		self._method_triggers[name] = (model, tokens[1], wrapper)
+		return True
+
+	def remove_trigger(self, name):
+		"""Remove a condition or method trigger."""
+		if self._capture is not None:
+			self._capture.remove_condition(name)
+		method_trigger = self._method_triggers.pop(name, None)
+		if method_trigger is not None:
+			model, method_name, wrapper = method_trigger
+			if model.__dict__.get(method_name) is wrapper:
+				delattr(model, method_name)
+
+	def trigger(self, name="manual"):
+		"""Start a capture window at the next capture sample."""
+		if self._capture is not None:
+			self._capture.trigger(name)
+
+	def get_captures(self):
+		"""Return and clear the finished capture windows kept in memory."""
+		if self._capture is None:
+			return []
+		captures = list(self._capture.captures)
+		self._capture.captures.clear()
+		return captures
+
 	def clear_data(self):
 		"""Clear fast-sampled buffered data."""
 		self.collected_data = []
+		if self._decimator is not None:
+			self._decimator.reset()
 
 	def clear_data_slow(self):
 		"""Clear slow-sampled buffered data."""
@@ -142,18 +351,15 @@ class DataCollector:
 				model = parameter.get("model")
 				if model is None or not bool(getattr(model, "is_enabled", False)):
 					continue
+				data_object[parameter.get("label")] = self._read_value(parameter)
 
-				value = getattr(model, parameter.get("prop1"), 0)
-				prop2 = parameter.get("prop2")
-				if prop2 is not None:
-					if isinstance(value, dict):
-						value = value.get(prop2, 0)
-					else:
-						value = getattr(value, prop2, 0)
-
-				data_object[parameter.get("label")] = value
-
-			self.collected_data.append(data_object)
+			if self._decimator is not None:
+				if self.buffer_samples:
+					self.collected_data.extend(self._decimator.add(data_object))
+			elif self.buffer_samples:
+				self.collected_data.append(data_object)
+			for listener in self._listeners:
+				listener(data_object)
 
 		if self._interval_counter_slow >= self.sample_interval_slow:
 			self._interval_counter_slow = 0.0
@@ -163,21 +369,35 @@ class DataCollector:
 				model = parameter.get("model")
 				if model is None:
 					continue
-
-				value = getattr(model, parameter.get("prop1"), 0)
-				prop2 = parameter.get("prop2")
-				if prop2 is not None:
-					if isinstance(value, dict):
-						value = value.get(prop2, 0)
-					else:
-						value = getattr(value, prop2, 0)
-
-				data_object_slow[parameter.get("label")] = value
+				data_object_slow[parameter.get("label")] = self._read_value(parameter)
 
 			self.collected_data_slow.append(data_object_slow)
 
+		if self._capture is not None and self._interval_counter_capture >= self._capture.sample_interval - 1e-12:
+			self._interval_counter_capture = 0.0
+			data_object_capture = {"time": round(float(model_clock), 4)}
+			for parameter in self.watch_list:
+				model = parameter.get("model")
+				if model is None or not bool(getattr(model, "is_enabled", False)):
+					continue
+				data_object_capture[parameter.get("label")] = self._read_value(parameter)
+			self._capture.add(data_object_capture)
+
 		self._interval_counter += self.modeling_stepsize
 		self._interval_counter_slow += self.modeling_stepsize
+		self._interval_counter_capture += self.modeling_stepsize
+
+	@staticmethod
+	def _read_value(parameter):
+		"""Return the current value of a watchlist descriptor."""
+		value = getattr(parameter.get("model"), parameter.get("prop1"), 0)
+		prop2 = parameter.get("prop2")
+		if prop2 is not None:
+			if isinstance(value, dict):
+				value = value.get(prop2, 0)
+			else:
+				value = getattr(value, prop2, 0)
+		return value
 
 	def _find_model_prop(self, prop):
 		"""Resolve a dotted property path into a watchlist descriptor."""
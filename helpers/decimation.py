@@ -0,0 +1,208 @@
+import math
+
+
+DECIMATION_MODES = ("minmax", "min", "max", "last", "mean", "lttb")
+
+
+def _is_number(value):
+	"""Return whether a sampled value can be aggregated numerically."""
+	return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class Decimator:
+	"""Reduce a stream of `DataCollector` samples to one row per time bucket.
+
+	Samples are aggregated as they arrive; a row is returned as soon as a
+	sample of a later bucket shows that the current bucket is complete. Modes:
+
+	- `minmax`: `[min, max]` per property, so peaks survive decimation;
+	- `min`, `max`, `mean`: the aggregate per property;
+	- `last`: the last sample of the bucket;
+	- `lttb`: largest-triangle-three-buckets, which keeps the sample of each
+	  bucket that spans the largest triangle with the previously kept sample
+	  and the average of the next bucket. The sample is chosen on
+	  `lttb_channel` (default: the first numeric property not in
+	  `lttb_exclude`) and reported for all properties, so rows stay
+	  aligned. Rows trail by one bucket.
+
+	Rows of the aggregating modes are stamped with the bucket start time.
+	Numeric properties are aggregated over the samples in which they are
+	numeric, so a property that is missing or `None` in some samples (e.g.
+	of a model disabled mid-bucket) is averaged over its own samples.
+	Non-numeric properties report their last value in every mode.
+	"""
+
+	def __init__(self, mode="minmax", bucket_duration=0.02, lttb_channel=None, lttb_exclude=()):
+		"""Initialize a decimator.
+
+		Args:
+			mode: One of `DECIMATION_MODES`.
+			bucket_duration: Bucket length in seconds (`1 / points_per_second`).
+			lttb_channel: Property label that selects the LTTB sample.
+			lttb_exclude: Labels never chosen as the default `lttb_channel`.
+
+		Raises:
+			ValueError: If the mode is unknown or the bucket is not positive.
+		"""
+		if mode not in DECIMATION_MODES:
+			raise ValueError(f"Unknown decimation mode '{mode}' (expected one of {', '.join(DECIMATION_MODES)})")
+		if not bucket_duration > 0.0:
+			raise ValueError("bucket_duration must be positive")
+
+		self.mode = mode
+		self.bucket_duration = float(bucket_duration)
+		self.lttb_channel = lttb_channel
+		self.lttb_exclude = frozenset(lttb_exclude)
+		self.reset()
+
+	def reset(self):
+		"""Drop all pending samples."""
+		self._bucket_index = None
+		self._last = {}
+		self._minimum = {}
+		self._maximum = {}
+		self._sum = {}
+		self._counts = {}
+
+		self._bucket_samples = []
+		self._previous_samples = []
+		self._anchor = None
+
+	def add(self, data_object):
+		"""Add one sample and return the rows of the buckets it completed."""
+		bucket_index = math.floor(float(data_object["time"]) / self.bucket_duration + 1e-9)
+		rows = []
+		if self._bucket_index is not None and bucket_index != self._bucket_index:
+			rows = self._close_bucket()
+		self._bucket_index = bucket_index
+
+		if self.mode == "lttb":
+			self._bucket_samples.append(data_object)
+			return rows
+
+		self._last = data_object
+		minimum = self._minimum
+		maximum = self._maximum
+		total = self._sum
+		counts = self._counts
+		for label, value in data_object.items():
+			if label == "time" or not _is_number(value):
+				continue
+			if label in total:
+				total[label] += value
+				counts[label] += 1
+				if value < minimum[label]:
+					minimum[label] = value
+				if value > maximum[label]:
+					maximum[label] = value
+			else:
+				total[label] = value
+				counts[label] = 1
+				minimum[label] = value
+				maximum[label] = value
+		return rows
+
+	def flush(self):
+		"""Return the rows of all pending samples, including an incomplete bucket."""
+		rows = []
+		if self._bucket_index is not None:
+			rows = self._close_bucket()
+		if self.mode == "lttb" and self._previous_samples:
+			# the last bucket has no successor: keep its final sample, like the last point of LTTB
+			rows.append(self._previous_samples[-1])
+			self._previous_samples = []
+		self._bucket_index = None
+		return rows
+
+	def _close_bucket(self):
+		"""Aggregate the current bucket and start a new one."""
+		if self.mode == "lttb":
+			return self._close_lttb_bucket()
+
+		bucket_time = round(self._bucket_index * self.bucket_duration, 6)
+		if self.mode == "last":
+			row = dict(self._last)
+		else:
+			row = {"time": bucket_time}
+			for label, value in self._last.items():
+				if label != "time":
+					row[label] = self._aggregate(label) if label in self._sum else value
+			# labels with numeric samples in the bucket but missing from its last sample
+			for label in self._sum:
+				if label not in row:
+					row[label] = self._aggregate(label)
+
+		self._minimum = {}
+		self._maximum = {}
+		self._sum = {}
+		self._counts = {}
+		return [row]
+
+	def _aggregate(self, label):
+		"""Return the aggregate of one numeric label over its samples in the current bucket."""
+		if self.mode == "minmax":
+			return [self._minimum[label], self._maximum[label]]
+		if self.mode == "min":
+			return self._minimum[label]
+		if self.mode == "max":
+			return self._maximum[label]
+		return self._sum[label] / self._counts[label]
+
+	def _close_lttb_bucket(self):
+		"""Select the LTTB sample of the previous bucket now that the next is complete."""
+		samples = self._bucket_samples
+		self._bucket_samples = []
+		rows = []
+		if not samples:
+			return rows
+
+		channel = self._lttb_channel(samples[0])
+		if self._anchor is None:
+			# LTTB always keeps the first sample
+			self._anchor = samples[0]
+			rows.append(samples[0])
+			samples = samples[1:]
+			if not samples:
+				return rows
+
+		if self._previous_samples:
+			average_time = sum(float(sample["time"]) for sample in samples) / len(samples)
+			average_value = sum(self._value(sample, channel) for sample in samples) / len(samples)
+			selected = self._select(self._previous_samples, channel, average_time, average_value)
+			rows.append(selected)
+			self._anchor = selected
+
+		self._previous_samples = samples
+		return rows
+
+	def _select(self, samples, channel, next_time, next_value):
+		"""Return the sample spanning the largest triangle with the anchor and the next average."""
+		anchor_time = float(self._anchor["time"])
+		anchor_value = self._value(self._anchor, channel)
+		best = samples[0]
+		best_area = -1.0
+		for sample in samples:
+			time = float(sample["time"])
+			area = abs(
+				(anchor_time - next_time) * (self._value(sample, channel) - anchor_value)
+				- (anchor_time - time) * (next_value - anchor_value)
+			)
+			if area > best_area:
+				best_area = area
+				best = sample
+		return best
+
+	def _lttb_channel(self, sample):
+		"""Return the label selecting LTTB samples (the first numeric one by default)."""
+		if self.lttb_channel is None:
+			for label, value in sample.items():
+				if label != "time" and label not in self.lttb_exclude and _is_number(value):
+					self.lttb_channel = label
+					break
+		return self.lttb_channel
+
+	@staticmethod
+	def _value(sample, channel):
+		"""Return the numeric value of `channel` in a sample, 0.0 when missing."""
+		value = sample.get(channel, 0.0)
+		return float(value) if _is_number(value) else 0.0
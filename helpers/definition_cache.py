@@ -0,0 +1,170 @@
+import marshal
+import os
+import sys
+from collections import OrderedDict
+
+
+CACHE_FORMAT = 1
+
+
+class DefinitionCache:
+	"""Cache of parsed and normalized JSON model definitions.
+
+	Entries hold the parsed definition together with the normalized model
+	configs as a `marshal` blob, so every load returns fresh objects without
+	parsing JSON again. Two levels are used:
+
+	- an in-process LRU keyed by path, size and modification time;
+	- a disk cache next to the JSON file (`__pycache__/<name>.<tag>.defcache`
+	  by default), validated by size and modification time and, when those
+	  changed, by the SHA-256 of the file content.
+
+	Unreadable or unwritable cache files are ignored and the JSON is parsed.
+	"""
+
+	def __init__(self, max_entries=16, cache_dir=None, use_disk=True):
+		"""Initialize an empty cache.
+
+		Args:
+			max_entries: Size of the in-process LRU.
+			cache_dir: Directory for disk cache files. Defaults to a
+				`__pycache__` directory next to each definition file.
+			use_disk: Read and write the disk cache.
+		"""
+		self.max_entries = max(int(max_entries), 1)
+		self.cache_dir = None if cache_dir is None else os.fspath(cache_dir)
+		self.use_disk = bool(use_disk)
+
+		self.hits = 0
+		self.disk_hits = 0
+		self.misses = 0
+
+		self._entries = OrderedDict()
+
+	def load(self, file_path, normalize):
+		"""Return `(definition, model_configs)` for a JSON definition file.
+
+		Args:
+			file_path: Path to a JSON definition file.
+			normalize: Callable mapping the parsed definition to its normalized
+				model configs (e.g. `ModelEngine._extract_model_configs`).
+
+		Returns:
+			tuple[dict, dict]: Fresh copies of the parsed definition and configs.
+
+		Raises:
+			FileNotFoundError: If the file does not exist.
+			json.JSONDecodeError: If the file is not valid JSON.
+		"""
+		path = os.path.realpath(os.fspath(file_path))
+		stat = os.stat(path)
+		memory_key = (path, stat.st_size, stat.st_mtime_ns)
+
+		blob = self._entries.get(memory_key)
+		if blob is not None:
+			self._entries.move_to_end(memory_key)
+			self.hits += 1
+			return marshal.loads(blob)
+
+		content = None
+		blob = None
+		if self.use_disk:
+			blob, content = self._read_disk_entry(path, stat)
+			if blob is not None:
+				self.disk_hits += 1
+
+		if blob is None:
+			import json
+
+			self.misses += 1
+			if content is None:
+				content = _read_bytes(path)
+			definition = json.loads(content)
+			blob = marshal.dumps((definition, normalize(definition)))
+			if self.use_disk:
+				self._write_disk_entry(path, stat, _sha256(content), blob)
+
+		self._entries[memory_key] = blob
+		while len(self._entries) > self.max_entries:
+			self._entries.popitem(last=False)
+		return marshal.loads(blob)
+
+	def clear(self, disk=False):
+		"""Drop the in-process entries and optionally the disk files they came from."""
+		if disk:
+			for path, _, _ in self._entries:
+				try:
+					os.remove(self._cache_path(path))
+				except OSError:
+					pass
+		self._entries.clear()
+
+	def _cache_path(self, path):
+		"""Return the disk cache file of a definition path."""
+		directory, file_name = os.path.split(path)
+		stem = os.path.splitext(file_name)[0]
+		tag = sys.implementation.cache_tag or "python"
+		if self.cache_dir is not None:
+			# one shared directory: keep files of equally named definitions apart
+			path_hash = _sha256(path.encode("utf-8"))[:12]
+			return os.path.join(self.cache_dir, f"{stem}.{path_hash}.{tag}.defcache")
+		return os.path.join(directory, "__pycache__", f"{stem}.{tag}.defcache")
+
+	def _read_disk_entry(self, path, stat):
+		"""Return `(blob, content)` from the disk cache, `blob` is `None` when stale."""
+		try:
+			header, blob = marshal.loads(_read_bytes(self._cache_path(path)))
+		except (OSError, EOFError, ValueError, TypeError):
+			return None, None
+
+		if header.get("format") != CACHE_FORMAT or header.get("path") != path:
+			return None, None
+		if header.get("size") == stat.st_size and header.get("mtime_ns") == stat.st_mtime_ns:
+			return blob, None
+
+		# touched but possibly unchanged: fall back to the content hash
+		content = _read_bytes(path)
+		digest = _sha256(content)
+		if header.get("sha256") != digest:
+			return None, content
+
+		self._write_disk_entry(path, stat, digest, blob)
+		return blob, content
+
+	def _write_disk_entry(self, path, stat, digest, blob):
+		"""Write a cache file atomically; failures leave the cache unused."""
+		header = {
+			"format": CACHE_FORMAT,
+			"path": path,
+			"size": stat.st_size,
+			"mtime_ns": stat.st_mtime_ns,
+			"sha256": digest,
+		}
+		cache_path = self._cache_path(path)
+		temp_path = f"{cache_path}.{os.getpid()}.tmp"
+		try:
+			os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+			with open(temp_path, "wb") as file_handle:
+				file_handle.write(marshal.dumps((header, blob)))
+			os.replace(temp_path, cache_path)
+		except OSError:
+			try:
+				os.remove(temp_path)
+			except OSError:
+				pass
+
+
+def _read_bytes(path):
+	"""Return the content of a file."""
+	with open(path, "rb") as file_handle:
+		return file_handle.read()
+
+
+def _sha256(content):
+	"""Return the SHA-256 hex digest of bytes (hashlib is imported on first use)."""
+	import hashlib
+
+	return hashlib.sha256(content).hexdigest()
+
+
+default_definition_cache = DefinitionCache()
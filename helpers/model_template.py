@@ -0,0 +1,227 @@
+import copy
+import marshal
+
+
+_ATOMIC_TYPES = frozenset({int, float, complex, bool, str, bytes, type(None), type, range})
+_MARSHAL_LEAF_TYPES = frozenset({int, float, complex, bool, str, bytes, type(None)})
+_CONTAINER_TYPES = frozenset({list, dict, tuple, set, frozenset})
+
+
+def _is_atomic(value):
+	"""Return whether a value can be shared between clones without copying."""
+	value_type = type(value)
+	if value_type in _ATOMIC_TYPES:
+		return True
+	if value_type is tuple or value_type is frozenset:
+		return all(_is_atomic(item) for item in value)
+	return False
+
+
+def _is_plain_data(value):
+	"""Return whether a value is a tree of builtin containers and scalars (JSON-like)."""
+	value_type = type(value)
+	if value_type in _MARSHAL_LEAF_TYPES:
+		return True
+	if value_type is dict:
+		return all(_is_plain_data(key) and _is_plain_data(item) for key, item in value.items())
+	if value_type in _CONTAINER_TYPES:
+		return all(_is_plain_data(item) for item in value)
+	return False
+
+
+def _clone_value(value, memo):
+	"""Copy a mutable value, mapping already-cloned objects through `memo`.
+
+	Plain lists, dicts and tuples are copied directly; any other object goes
+	through `copy.deepcopy` with the same memo, so references to models, the
+	registry or the engine are rewired to their clones.
+	"""
+	value_type = type(value)
+	if value_type in _ATOMIC_TYPES:
+		return value
+
+	existing = memo.get(id(value))
+	if existing is not None:
+		return existing
+
+	if value_type is list:
+		result = []
+		memo[id(value)] = result
+		result.extend(_clone_value(item, memo) for item in value)
+		return result
+
+	if value_type is dict:
+		result = {}
+		memo[id(value)] = result
+		for key, item in value.items():
+			result[key] = _clone_value(item, memo)
+		return result
+
+	if value_type is tuple:
+		items = tuple(_clone_value(item, memo) for item in value)
+		if all(new is old for new, old in zip(items, value)):
+			return value
+		return items
+
+	return copy.deepcopy(value, memo)
+
+
+class _ObjectPlan:
+	"""Copy plan of one model or engine: shared atomic state plus mutable slots.
+
+	Mutable values are stored as `(name, value, plain_index)`. Plain data
+	(JSON-like trees) is collected into one list that the template serializes
+	with `marshal` as a single blob, so it is restored at C speed with its
+	internal aliasing intact; `plain_index` points into that list. Everything
+	else is cloned through the shared memo.
+	"""
+
+	__slots__ = ("source", "object_class", "atomic_state", "mutable_state", "atomic_slots", "mutable_slots")
+
+	def __init__(self, source, plain_values, skip=()):
+		self.source = source
+		self.object_class = type(source)
+		self.atomic_state = {}
+		self.mutable_state = []
+		self.atomic_slots = []
+		self.mutable_slots = []
+
+		for key, value in getattr(source, "__dict__", {}).items():
+			if key in skip:
+				continue
+			if _is_atomic(value):
+				self.atomic_state[key] = value
+			else:
+				self.mutable_state.append(_plan_value(key, value, plain_values))
+
+		for slot_name in _slot_names(self.object_class):
+			if slot_name in skip or not hasattr(source, slot_name):
+				continue
+			value = getattr(source, slot_name)
+			if _is_atomic(value):
+				self.atomic_slots.append((slot_name, value))
+			else:
+				self.mutable_slots.append(_plan_value(slot_name, value, plain_values))
+
+	def new_instance(self):
+		"""Allocate an uninitialized instance of the planned class."""
+		return self.object_class.__new__(self.object_class)
+
+	def fill(self, instance, memo, plain):
+		"""Copy the planned state onto `instance`."""
+		state = self.atomic_state.copy()
+		for key, value, plain_index in self.mutable_state:
+			state[key] = _clone_value(value, memo) if plain_index is None else plain[plain_index]
+		if hasattr(instance, "__dict__"):
+			instance.__dict__.update(state)
+
+		for slot_name, value in self.atomic_slots:
+			object.__setattr__(instance, slot_name, value)
+		for slot_name, value, plain_index in self.mutable_slots:
+			slot_value = _clone_value(value, memo) if plain_index is None else plain[plain_index]
+			object.__setattr__(instance, slot_name, slot_value)
+
+
+def _plan_value(name, value, plain_values):
+	"""Return the `(name, value, plain_index)` copy entry of a mutable value."""
+	if _is_plain_data(value):
+		plain_values.append(value)
+		return name, value, len(plain_values) - 1
+	return name, value, None
+
+
+def _slot_names(object_class):
+	"""Return the `__slots__` names declared along the MRO of a class."""
+	names = []
+	for klass in object_class.__mro__:
+		slots = klass.__dict__.get("__slots__", ())
+		if isinstance(slots, str):
+			slots = (slots,)
+		for slot_name in slots:
+			if slot_name not in ("__dict__", "__weakref__") and slot_name not in names:
+				names.append(slot_name)
+	return names
+
+
+class ModelTemplate:
+	"""Frozen snapshot of a built engine that can be instantiated many times.
+
+	Creating a template copies the engine once and classifies every attribute
+	of every model as either shareable (numbers, strings, tuples of those) or
+	mutable. `instantiate()` then allocates fresh model objects, copies the
+	shareable state in bulk and clones only the mutable containers, rewiring
+	`model_ref`, `_model_engine` and cached model references to the new
+	engine. The definition mapping is shared read-only between clones.
+	"""
+
+	def __init__(self, engine):
+		"""Snapshot a built engine.
+
+		Args:
+			engine: Initialized `ModelEngine`. Later changes to it do not affect
+				the template.
+		"""
+		if not getattr(engine, "is_initialized", False):
+			raise ValueError("Cannot create a template from an engine that is not initialized")
+
+		self.model_definition = engine.model_definition
+		self.model_count = len(engine.models)
+		self.instantiations = 0
+
+		# plan from the source, take a private copy and plan again from that copy
+		self._plan(engine)
+		private_engine = self.instantiate()
+		self.instantiations = 0
+		self._plan(private_engine)
+
+	def instantiate(self):
+		"""Return a new, independent engine in the template state."""
+		memo = {}
+		engine = self._engine_plan.new_instance()
+		memo[id(self._engine_plan.source)] = engine
+
+		registry_class = type(self._registry)
+		registry = registry_class.__new__(registry_class)
+		memo[id(self._registry)] = registry
+
+		instances = []
+		for plan in self._model_plans:
+			instance = plan.new_instance()
+			memo[id(plan.source)] = instance
+			instances.append(instance)
+
+		dict.update(registry, zip(self._model_names, instances))
+		registry.__dict__.update(self._registry_state)
+
+		plain = marshal.loads(self._plain_blob)
+		for plan, instance in zip(self._model_plans, instances):
+			plan.fill(instance, memo, plain)
+
+		self._engine_plan.fill(engine, memo, plain)
+		engine.models = registry
+		engine.model_definition = self.model_definition
+		engine._step_plan = ()
+		engine._phase_plan = ()
+		engine._parallel_stepper = None
+		engine._dormancy_states = ()
+		engine._step_listeners = []
+		engine._step_plan_version = -1
+		engine._index_cache = {}
+		engine._index_version = -1
+
+		self.instantiations += 1
+		return engine
+
+	def _plan(self, engine):
+		"""Build the copy plans for an engine and its models."""
+		plain_values = []
+		self._registry = engine.models
+		self._registry_state = dict(getattr(engine.models, "__dict__", {}))
+		self._model_names = list(engine.models.keys())
+		self._model_plans = [_ObjectPlan(model, plain_values) for model in engine.models.values()]
+		self._engine_plan = _ObjectPlan(
+			engine,
+			plain_values,
+			skip=("models", "model_definition", "_step_plan", "_phase_plan", "_parallel_stepper", "_dormancy_states", "_step_listeners", "_index_cache"),
+		)
+		self._plain_blob = marshal.dumps(plain_values)
@@ -0,0 +1,247 @@
+import os
+import sys
+import threading
+import weakref
+
+
+def is_free_threaded():
+	"""Return whether the interpreter runs without the global interpreter lock."""
+	is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+	return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def partition_batches(phase, batches):
+	"""Split the batches of one phase into partitions that write disjoint state.
+
+	Models whose write sets (see `BaseModel.get_phase_writes`) overlap are
+	joined with a union-find, so everything touching the same compartment ends
+	up in one partition. Within a partition the batches keep the order of the
+	phase plan, which makes the result identical to the phased step mode.
+
+	Args:
+		phase: Name of the step phase.
+		batches: Sequence of `(step function, models)` batches of that phase.
+
+	Returns:
+		list[tuple] | None: Partitions as tuples of `(step function, models)`
+		batches, or `None` when a model of the phase has unknown writes and the
+		phase must run serially.
+	"""
+	parents = {}
+
+	def find(key):
+		root = key
+		while parents[root] != root:
+			root = parents[root]
+		while parents[key] != root:
+			parents[key], key = root, parents[key]
+		return root
+
+	for _, models in batches:
+		for model in models:
+			writes = model.get_phase_writes(phase)
+			if writes is None:
+				return None
+
+			model_key = ("model", id(model))
+			parents.setdefault(model_key, model_key)
+			for name in writes:
+				write_key = ("write", name)
+				parents.setdefault(write_key, write_key)
+				parents[find(write_key)] = find(model_key)
+
+	partitions = {}
+	for step_function, models in batches:
+		for model in models:
+			partition = partitions.setdefault(find(("model", id(model))), [])
+			if partition and partition[-1][0] is step_function:
+				partition[-1][1].append(model)
+			else:
+				partition.append((step_function, [model]))
+
+	return [
+		tuple((step_function, tuple(models)) for step_function, models in partition)
+		for partition in partitions.values()
+	]
+
+
+def _run_batches(batches):
+	"""Run `(step function, models)` batches in order."""
+	for step_function, models in batches:
+		for model in models:
+			step_function(model)
+
+
+class _WorkerPool:
+	"""Persistent worker threads that run one share of a phase between two barriers."""
+
+	def __init__(self, workers):
+		self.workers = workers
+		self.barrier = threading.Barrier(workers)
+		self.shares = ()
+		self.errors = []
+		self.stopping = False
+		self.pid = os.getpid()
+		self.threads = [
+			threading.Thread(target=self._work, args=(index,), name=f"explain-step-{index}", daemon=True)
+			for index in range(1, workers)
+		]
+		for thread in self.threads:
+			thread.start()
+
+	def run_phase(self, shares):
+		"""Run `shares[0]` on the calling thread and the other shares on the workers."""
+		self.shares = shares
+		self.barrier.wait()
+		try:
+			_run_batches(shares[0])
+		finally:
+			self.barrier.wait()
+			# drop the references to the models, so an unused engine can be collected
+			self.shares = ()
+
+		if self.errors:
+			error = self.errors[0]
+			self.errors = []
+			raise error
+
+	def shutdown(self):
+		"""Stop the worker threads (no-op in a forked child, where they do not exist)."""
+		if self.stopping or self.pid != os.getpid():
+			return
+		self.stopping = True
+		try:
+			self.barrier.wait(timeout=1.0)
+		except threading.BrokenBarrierError:
+			pass
+		for thread in self.threads:
+			thread.join(timeout=1.0)
+
+	def _work(self, index):
+		"""Worker loop: wait for a phase, run the own share, wait for the others."""
+		while True:
+			self.barrier.wait()
+			if self.stopping:
+				return
+			try:
+				_run_batches(self.shares[index])
+			except BaseException as error:
+				self.errors.append(error)
+			self.barrier.wait()
+
+
+class ParallelStepper:
+	"""Step the phase plan of an engine with independent partitions on threads.
+
+	Every phase is split into partitions that write disjoint models (see
+	`partition_batches`). Partitions are distributed over a fixed set of worker
+	threads, and all workers meet at a barrier before the next phase starts.
+	Phases with a single partition, or with models of unknown writes such as
+	the controllers, run on the calling thread.
+
+	Threads only pay off without the global interpreter lock, so by default
+	they are started on free-threaded builds only. Otherwise the same schedule
+	runs serially, with results identical to the phased step mode.
+	"""
+
+	def __init__(self, phase_batches, workers=None, use_threads=None):
+		"""Build the schedule of a phase plan.
+
+		Args:
+			phase_batches: Sequence of `(phase, step function, models)` batches
+				in step order (see `ModelEngine._build_phase_batches`).
+			workers: Number of threads per phase including the calling thread.
+				Defaults to the CPU count, limited to the largest partition count.
+			use_threads: Start worker threads. Defaults to `is_free_threaded()`.
+		"""
+		self.phase_batches = tuple(phase_batches)
+		self.use_threads = is_free_threaded() if use_threads is None else bool(use_threads)
+		self.partitions = {}
+
+		grouped = []
+		for phase, step_function, models in self.phase_batches:
+			if not grouped or grouped[-1][0] != phase:
+				grouped.append((phase, []))
+			grouped[-1][1].append((step_function, models))
+
+		max_partitions = 1
+		for phase, batches in grouped:
+			partitions = partition_batches(phase, batches)
+			self.partitions[phase] = partitions
+			if partitions is not None:
+				max_partitions = max(max_partitions, len(partitions))
+
+		if workers is None:
+			workers = os.cpu_count() or 1
+		self.workers = max(1, min(int(workers), max_partitions))
+
+		schedule = []
+		for phase, batches in grouped:
+			partitions = self.partitions[phase]
+			if partitions is None or len(partitions) < 2 or self.workers < 2:
+				schedule.append((None, tuple(batches)))
+			else:
+				schedule.append((self._distribute(partitions), None))
+		self.schedule = tuple(schedule)
+
+		self._pool = None
+		self._finalizer = None
+
+	def __reduce__(self):
+		"""Pickle the plan only; worker threads are started again when stepping."""
+		return (type(self), (self.phase_batches, self.workers, self.use_threads))
+
+	def step(self):
+		"""Run all phases of one model step."""
+		pool = self._pool
+		if self.use_threads and self.workers > 1 and (pool is None or pool.pid != os.getpid()):
+			pool = self._start_pool()
+
+		for shares, batches in self.schedule:
+			if shares is None or pool is None:
+				_run_batches(batches if shares is None else (batch for share in shares for batch in share))
+			else:
+				pool.run_phase(shares)
+
+	def describe(self):
+		"""Return the partitions per phase as lists of model names (`None` for serial phases)."""
+		description = {}
+		for phase, partitions in self.partitions.items():
+			if partitions is None:
+				description[phase] = None
+				continue
+			description[phase] = [
+				[str(model.name) for _, models in partition for model in models]
+				for partition in partitions
+			]
+		return description
+
+	def close(self):
+		"""Stop the worker threads; the stepper keeps working serially afterwards."""
+		if self._finalizer is not None:
+			self._finalizer()
+		self._pool = None
+		self._finalizer = None
+		self.use_threads = False
+
+	def _distribute(self, partitions):
+		"""Assign partitions to workers, largest first, balancing the model count."""
+		shares = [[] for _ in range(self.workers)]
+		loads = [0] * self.workers
+		ordered = sorted(
+			range(len(partitions)),
+			key=lambda index: -sum(len(models) for _, models in partitions[index]),
+		)
+		for index in ordered:
+			worker = loads.index(min(loads))
+			shares[worker].extend(partitions[index])
+			loads[worker] += sum(len(models) for _, models in partitions[index])
+		return tuple(tuple(share) for share in shares)
+
+	def _start_pool(self):
+		"""Start the worker threads (again after a fork, where they do not survive)."""
+		pool = _WorkerPool(self.workers)
+		self._pool = pool
+		# the threads only reference the pool, so the stepper can be collected and stops them
+		self._finalizer = weakref.finalize(self, pool.shutdown)
+		return pool
@@ -1,24 +1,28 @@
+from helpers.rolling_statistics import RollingWindow
+
+
 class RealTimeMovingAverage:
 	"""Fixed-window real-time moving average accumulator."""
 
 	def __init__(self, window_size):
 		"""Initialize moving-average buffer with a minimum window of 1."""
 		self.window_size = max(int(window_size), 1)
-		self.values = []
-		self.sum = 0.0
 		self.current_average = 0.0
+		self._window = RollingWindow(self.window_size, track_extremes=False)
 
-	def add_value(self, new_value):
-		"""Add a sample and return the updated moving average."""
-		value = float(new_value)
-		self.values.append(value)
-		self.sum += value
+	@property
+	def values(self):
+		"""Buffered samples, oldest first."""
+		return self._window.values
 
-		if len(self.values) > self.window_size:
-			oldest_value = self.values.pop(0)
-			self.sum -= oldest_value
+	@property
+	def sum(self):
+		"""Sum of the buffered samples."""
+		return self._window.sum
 
-		self.current_average = self.sum / len(self.values)
+	def add_value(self, new_value):
+		"""Add a sample and return the updated moving average."""
+		self.current_average = self._window.append(new_value)
 		return self.current_average
 
 	def get_current_average(self):
@@ -27,8 +31,7 @@ class RealTimeMovingAverage:
 
 	def reset(self):
 		"""Clear buffered values and reset accumulator state."""
-		self.values = []
-		self.sum = 0.0
+		self._window.reset()
 		self.current_average = 0.0
 
 	# JS-style compatibility aliases
@@ -0,0 +1,284 @@
+import asyncio
+import inspect
+import time
+
+
+class RealtimeRunner:
+	"""Run an engine locked to wall-clock time on an asyncio event loop.
+
+	The engine is advanced in frames of `frame_period` seconds (e.g. 15 ms =
+	30 steps at 0.5 ms). After each frame the runner sleeps until the frame
+	deadline, which yields to the event loop so control commands and data
+	pushes run between frames. Deadlines are absolute, so a late frame is
+	caught up by starting the next one immediately.
+
+	When frames keep overrunning, the runner degrades step by step: first it
+	reduces the sampling rate of the attached `DataCollector`, then it stops
+	stepping the optional `slow_models`. When it falls more than
+	`max_catch_up_frames` behind it gives up on the backlog and resynchronizes
+	to the wall clock. Degradations are undone after `recover_after` frames
+	that finish in time.
+	"""
+
+	def __init__(
+		self,
+		engine,
+		frame_period=0.015,
+		scheduler=None,
+		collector=None,
+		slow_models=(),
+		max_catch_up_frames=4,
+		degrade_after=3,
+		recover_after=100,
+		sampling_factor=4.0,
+		clock=time.perf_counter,
+	):
+		"""Initialize a runner for an initialized engine.
+
+		Args:
+			engine: `ModelEngine` to advance.
+			frame_period: Wall-clock duration of one frame in seconds. Rounded
+				to a whole number of model steps.
+			scheduler: Optional `TaskScheduler` run before every model step.
+			collector: Optional `DataCollector` sampled after every model step.
+			slow_models: Names of models that may be skipped while degraded
+				(e.g. `Monitor`).
+			max_catch_up_frames: Backlog in frames after which the runner
+				resynchronizes instead of catching up.
+			degrade_after: Consecutive overrunning frames before degrading one level.
+			recover_after: Consecutive frames in time before recovering one level.
+			sampling_factor: Factor applied to the collector sample intervals
+				while degraded.
+			clock: Monotonic clock returning seconds.
+		"""
+		self.engine = engine
+		self.scheduler = scheduler
+		self.collector = collector
+		self.slow_models = list(slow_models)
+		self.max_catch_up_frames = max(int(max_catch_up_frames), 1)
+		self.degrade_after = max(int(degrade_after), 1)
+		self.recover_after = max(int(recover_after), 1)
+		self.sampling_factor = float(sampling_factor)
+		self.clock = clock
+
+		self.modeling_stepsize = float(engine.modeling_stepsize)
+		self.steps_per_frame = max(int(round(float(frame_period) / self.modeling_stepsize)), 1)
+		self.frame_period = self.steps_per_frame * self.modeling_stepsize
+		self.model_time = float(getattr(engine, "model_time_total", 0.0) or 0.0)
+		self.degradation_level = 0
+		self.is_running = False
+
+		self._frame_callbacks = []
+		self._samplers = []
+		self._stop_requested = False
+		self._late_frames = 0
+		self._timely_frames = 0
+		self._sample_intervals = None
+		self._disabled_models = []
+		self.reset_statistics()
+
+	def add_frame_callback(self, callback):
+		"""Call `callback(runner)` after every frame; coroutine functions are awaited."""
+		self._frame_callbacks.append(callback)
+
+	def remove_frame_callback(self, callback):
+		"""Remove a frame callback added with `add_frame_callback`."""
+		if callback in self._frame_callbacks:
+			self._frame_callbacks.remove(callback)
+
+	def add_sampler(self, sampler):
+		"""Call `sampler.collect_data(model_time)` after every model step, like the collector."""
+		self._samplers.append(sampler)
+
+	def remove_sampler(self, sampler):
+		"""Remove a sampler added with `add_sampler`."""
+		if sampler in self._samplers:
+			self._samplers.remove(sampler)
+
+	def stop(self):
+		"""Ask a running `run()` to return after the current frame."""
+		self._stop_requested = True
+
+	def reset_statistics(self):
+		"""Reset the timing statistics reported by `get_statistics`."""
+		self.frames = 0
+		self.steps = 0
+		self.overruns = 0
+		self.resyncs = 0
+		self.dropped_time = 0.0
+		self.max_overrun = 0.0
+		self.drift = 0.0
+		self.max_drift = 0.0
+		self.compute_time = 0.0
+		self.max_frame_compute = 0.0
+		self.wall_time = 0.0
+		self.simulated_time = 0.0
+
+	def get_statistics(self):
+		"""Return the timing statistics of the runs since the last reset.
+
+		Returns:
+			dict: `frames`, `steps`, `simulated_time`, `wall_time`,
+			`real_time_factor` (simulated / wall time), `load` (compute / wall
+			time), `overruns`, `overrun_ratio`, `max_overrun`, `drift` and
+			`max_drift` (seconds the model lags the wall clock), `resyncs`,
+			`dropped_time`, `mean_frame_compute`, `max_frame_compute` and
+			`degradation_level`.
+		"""
+		return {
+			"frames": self.frames,
+			"steps": self.steps,
+			"simulated_time": self.simulated_time,
+			"wall_time": self.wall_time,
+			"real_time_factor": self.simulated_time / self.wall_time if self.wall_time > 0.0 else 0.0,
+			"load": self.compute_time / self.wall_time if self.wall_time > 0.0 else 0.0,
+			"overruns": self.overruns,
+			"overrun_ratio": self.overruns / self.frames if self.frames else 0.0,
+			"max_overrun": self.max_overrun,
+			"drift": self.drift,
+			"max_drift": self.max_drift,
+			"resyncs": self.resyncs,
+			"dropped_time": self.dropped_time,
+			"mean_frame_compute": self.compute_time / self.frames if self.frames else 0.0,
+			"max_frame_compute": self.max_frame_compute,
+			"degradation_level": self.degradation_level,
+		}
+
+	async def run(self, duration=None, frames=None):
+		"""Advance the engine in real time until stopped or a limit is reached.
+
+		Args:
+			duration: Simulated time in seconds to run, or `None` for no limit.
+			frames: Number of frames to run, or `None` for no limit.
+
+		Returns:
+			dict: Statistics as returned by `get_statistics`.
+
+		Raises:
+			RuntimeError: If the runner is already running.
+		"""
+		if self.is_running:
+			raise RuntimeError("RealtimeRunner is already running")
+
+		frame_limit = None
+		if duration is not None:
+			frame_limit = int(round(float(duration) / self.frame_period))
+		if frames is not None:
+			frame_limit = int(frames) if frame_limit is None else min(frame_limit, int(frames))
+
+		self.is_running = True
+		self._stop_requested = False
+		run_frames = 0
+		start = self.clock()
+		deadline = start
+		try:
+			while not self._stop_requested and (frame_limit is None or run_frames < frame_limit):
+				frame_start = self.clock()
+				self._run_frame()
+				now = self.clock()
+				run_frames += 1
+
+				frame_compute = now - frame_start
+				self.compute_time += frame_compute
+				self.max_frame_compute = max(self.max_frame_compute, frame_compute)
+				deadline += self.frame_period
+
+				lateness = now - deadline
+				self.drift = max(lateness, 0.0)
+				self.max_drift = max(self.max_drift, self.drift)
+				if lateness > 0.0:
+					self._on_late_frame(lateness)
+					if lateness > self.max_catch_up_frames * self.frame_period:
+						# give up on the backlog, the model clock falls behind the wall clock
+						self.resyncs += 1
+						self.dropped_time += lateness
+						deadline = now
+				else:
+					self._on_timely_frame()
+
+				for callback in list(self._frame_callbacks):
+					result = callback(self)
+					if inspect.isawaitable(result):
+						await result
+
+				# yield to the event loop, also when behind
+				await asyncio.sleep(max(deadline - self.clock(), 0.0))
+		finally:
+			self.wall_time += self.clock() - start
+			self.is_running = False
+			self._set_degradation_level(0)
+
+		return self.get_statistics()
+
+	def _run_frame(self):
+		"""Advance the engine by one frame of model steps."""
+		engine = self.engine
+		scheduler = self.scheduler
+		collector = self.collector
+		samplers = tuple(self._samplers)
+		stepsize = self.modeling_stepsize
+
+		for _ in range(self.steps_per_frame):
+			if scheduler is not None:
+				scheduler.run_tasks()
+			engine.step_model()
+			self.model_time += stepsize
+			if collector is not None:
+				collector.collect_data(self.model_time)
+			for sampler in samplers:
+				sampler.collect_data(self.model_time)
+
+		self.frames += 1
+		self.steps += self.steps_per_frame
+		self.simulated_time += self.frame_period
+		if self._disabled_models:
+			self._release_enabled_models()
+
+	def _release_enabled_models(self):
+		"""Forget the slow models that were switched on again while the runner held them disabled."""
+		self._disabled_models = [model for model in self._disabled_models if not model.is_enabled]
+
+	def _on_late_frame(self, lateness):
+		"""Count an overrun and degrade after `degrade_after` late frames in a row."""
+		self.overruns += 1
+		self.max_overrun = max(self.max_overrun, lateness)
+		self._timely_frames = 0
+		self._late_frames += 1
+		if self._late_frames >= self.degrade_after:
+			self._late_frames = 0
+			self._set_degradation_level(self.degradation_level + 1)
+
+	def _on_timely_frame(self):
+		"""Recover one degradation level after `recover_after` frames in time."""
+		self._late_frames = 0
+		if self.degradation_level == 0:
+			return
+		self._timely_frames += 1
+		if self._timely_frames >= self.recover_after:
+			self._timely_frames = 0
+			self._set_degradation_level(self.degradation_level - 1)
+
+	def _set_degradation_level(self, level):
+		"""Apply degradation level 0 (full), 1 (reduced sampling) or 2 (slow models skipped)."""
+		level = min(max(int(level), 0), 2)
+
+		if level >= 1 and self._sample_intervals is None and self.collector is not None:
+			self._sample_intervals = (self.collector.sample_interval, self.collector.sample_interval_slow)
+			self.collector.sample_interval *= self.sampling_factor
+			self.collector.sample_interval_slow *= self.sampling_factor
+		elif level < 1 and self._sample_intervals is not None:
+			self.collector.sample_interval, self.collector.sample_interval_slow = self._sample_intervals
+			self._sample_intervals = None
+
+		if level >= 2 and self.degradation_level < 2:
+			for model_name in self.slow_models:
+				model = self.engine.models.get(model_name)
+				if model is not None and model.is_enabled:
+					model.is_enabled = False
+					self._disabled_models.append(model)
+		elif level < 2 and self._disabled_models:
+			for model in self._disabled_models:
+				model.is_enabled = True
+			self._disabled_models = []
+
+		self.degradation_level = level
@@ -0,0 +1,155 @@
+from collections import deque
+
+
+class RollingWindow:
+	"""Ring buffer of recent samples with O(1) running mean, variance, min and max.
+
+	The mean and variance are updated incrementally (Welford) when samples enter
+	or leave the window, and the extremes are tracked with monotonic deques. The
+	running sums are re-synchronised from the buffered samples once per window
+	turnover to keep rounding drift bounded over long runs.
+	"""
+
+	def __init__(self, capacity=None, track_extremes=True):
+		"""Initialize an empty window.
+
+		Args:
+			capacity: Maximum number of retained samples. When `None`, samples are
+				only dropped through `trim`.
+			track_extremes: Maintain the min/max deques. Disable for pure
+				averaging windows to save the per-sample bookkeeping.
+		"""
+		self.capacity = None if capacity is None else max(int(capacity), 1)
+		self.track_extremes = bool(track_extremes)
+		self.values = deque()
+		self.mean = 0.0
+
+		self._m2 = 0.0
+		self._min_queue = deque()
+		self._max_queue = deque()
+		self._next_index = 0
+		self._first_index = 0
+		self._evictions = 0
+
+	def __len__(self):
+		"""Return the number of buffered samples."""
+		return len(self.values)
+
+	@property
+	def variance(self):
+		"""Population variance of the buffered samples."""
+		count = len(self.values)
+		if count == 0:
+			return 0.0
+		return max(self._m2, 0.0) / count
+
+	@property
+	def std(self):
+		"""Population standard deviation of the buffered samples."""
+		return self.variance ** 0.5
+
+	@property
+	def min(self):
+		"""Smallest buffered sample, or `None` when empty or not tracked."""
+		return self._min_queue[0][1] if self._min_queue else None
+
+	@property
+	def max(self):
+		"""Largest buffered sample, or `None` when empty or not tracked."""
+		return self._max_queue[0][1] if self._max_queue else None
+
+	@property
+	def sum(self):
+		"""Sum of the buffered samples."""
+		return self.mean * len(self.values)
+
+	def append(self, value):
+		"""Add a sample, evict the oldest one beyond capacity and return the mean."""
+		value = float(value)
+		values = self.values
+		values.append(value)
+
+		if self.capacity is not None and len(values) > self.capacity:
+			# sliding update: the new sample replaces the oldest in one step
+			oldest = values.popleft()
+			self._first_index += 1
+			mean = self.mean
+			new_mean = mean + (value - oldest) / len(values)
+			self._m2 += (value - oldest) * (value - new_mean + oldest - mean)
+			self.mean = new_mean
+
+			self._evictions += 1
+			if self._evictions >= len(values):
+				self._resync()
+		else:
+			delta = value - self.mean
+			self.mean += delta / len(values)
+			self._m2 += delta * (value - self.mean)
+
+		if self.track_extremes:
+			index = self._next_index
+			min_queue = self._min_queue
+			while min_queue and min_queue[-1][1] >= value:
+				min_queue.pop()
+			min_queue.append((index, value))
+			if min_queue[0][0] < self._first_index:
+				min_queue.popleft()
+
+			max_queue = self._max_queue
+			while max_queue and max_queue[-1][1] <= value:
+				max_queue.pop()
+			max_queue.append((index, value))
+			if max_queue[0][0] < self._first_index:
+				max_queue.popleft()
+
+		self._next_index += 1
+		return self.mean
+
+	def trim(self, max_size):
+		"""Drop the oldest samples until at most `max_size` remain."""
+		max_size = max(int(max_size), 0)
+		while len(self.values) > max_size:
+			self._evict_oldest()
+
+	def reset(self):
+		"""Clear buffered samples and statistics."""
+		self.values.clear()
+		self._min_queue.clear()
+		self._max_queue.clear()
+		self.mean = 0.0
+		self._m2 = 0.0
+		self._first_index = self._next_index
+		self._evictions = 0
+
+	def _evict_oldest(self):
+		"""Remove the oldest sample and update the running statistics."""
+		value = self.values.popleft()
+		self._first_index += 1
+
+		if self._min_queue and self._min_queue[0][0] < self._first_index:
+			self._min_queue.popleft()
+		if self._max_queue and self._max_queue[0][0] < self._first_index:
+			self._max_queue.popleft()
+
+		count = len(self.values)
+		if count == 0:
+			self.mean = 0.0
+			self._m2 = 0.0
+			self._evictions = 0
+			return
+
+		delta = value - self.mean
+		self.mean -= delta / count
+		self._m2 -= delta * (value - self.mean)
+
+		self._evictions += 1
+		if self._evictions >= count:
+			self._resync()
+
+	def _resync(self):
+		"""Recompute mean and variance exactly from the buffered samples."""
+		count = len(self.values)
+		mean = sum(self.values) / count
+		self.mean = mean
+		self._m2 = sum((value - mean) * (value - mean) for value in self.values)
+		self._evictions = 0
@@ -0,0 +1,428 @@
+import math
+import multiprocessing
+import os
+import random
+import traceback
+
+from helpers.model_template import ModelTemplate
+
+
+DEFAULT_SENSITIVITY_OUTPUTS = ("Monitor.abp_mean", "Monitor.spo2", "Monitor.lvo")
+
+
+class _EvaluationContext:
+	"""Everything a worker needs to evaluate parameter points from the warm checkpoint."""
+
+	def __init__(self, template, outputs, duration, average_time, sample_interval):
+		self.template = template
+		self.outputs = outputs
+		self.duration = duration
+		self.average_time = average_time
+		self.sample_interval = sample_interval
+
+
+_worker_context = None  # set in every pool worker by _init_worker
+
+
+def _init_worker(context):
+	"""Keep the evaluation context (and with it the warm checkpoint) in the worker."""
+	global _worker_context
+	_worker_context = context
+
+
+def _evaluate_task(task):
+	"""Evaluate one `(index, point)` task in a pool worker."""
+	index, point = task
+	try:
+		return index, "ok", _evaluate(_worker_context, point)
+	except Exception:
+		return index, "error", traceback.format_exc()
+
+
+def _evaluate(context, point):
+	"""Run one parameter point from the checkpoint and return the averaged outputs."""
+	engine = context.template.instantiate()
+	for path, value in point.items():
+		model_name, prop = path.split(".", 1)
+		setattr(engine.models[model_name], prop, value)
+
+	outputs = []
+	for path in context.outputs:
+		model_name, prop = path.split(".", 1)
+		outputs.append((engine.models[model_name], prop))
+
+	stepsize = float(engine.modeling_stepsize)
+	steps = int(round(context.duration / stepsize))
+	average_from = steps - int(round(context.average_time / stepsize))
+	sample_every = max(int(round(context.sample_interval / stepsize)), 1)
+	sums = [0.0] * len(outputs)
+	samples = 0
+	for step in range(1, steps + 1):
+		engine.step_model()
+		if step > average_from and step % sample_every == 0:
+			samples += 1
+			for index, (model, prop) in enumerate(outputs):
+				sums[index] += float(getattr(model, prop))
+
+	if samples == 0:
+		return [float(getattr(model, prop)) for model, prop in outputs]
+	return [total / samples for total in sums]
+
+
+def _percentile(values, fraction):
+	"""Return the linearly interpolated percentile of a list of numbers."""
+	ordered = sorted(values)
+	if not ordered:
+		return math.nan
+	position = fraction * (len(ordered) - 1)
+	lower = int(math.floor(position))
+	upper = min(lower + 1, len(ordered) - 1)
+	return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _mean(values):
+	"""Return the mean of a list of numbers (NaN when empty)."""
+	return sum(values) / len(values) if values else math.nan
+
+
+def _variance(values):
+	"""Return the population variance of a list of numbers."""
+	if not values:
+		return math.nan
+	average = _mean(values)
+	return sum((value - average) ** 2 for value in values) / len(values)
+
+
+class SensitivityAnalysis:
+	"""Run parameter sensitivity designs from a warm checkpoint on a process pool.
+
+	The engine state at construction (e.g. after `run_until_steady`) is kept
+	as a `ModelTemplate`. Every design point starts from an instantiated copy
+	of that checkpoint, sets its parameter values, runs `duration` seconds and
+	reports each output averaged over the last `average_time` seconds.
+
+	Points are evaluated on a pool of `workers` processes started with
+	`fork`, so every worker inherits the checkpoint without serializing it
+	and instantiates it per point. Where `fork` is not available (Windows),
+	points are evaluated one after another in-process.
+
+	Designs return tidy tables (lists of row dicts, one row per parameter and
+	output):
+
+	- `one_at_a_time`: each parameter moved to its low and high bound;
+	- `morris`: elementary effects along random trajectories (`mu`,
+	  `mu_star`, `sigma`) with bootstrap confidence intervals of `mu_star`;
+	- `sobol`: first-order and total Sobol indices from a Saltelli design
+	  with bootstrap confidence intervals.
+
+	A point whose run fails (e.g. an unstable parameter corner that drives a
+	volume negative) reports NaN for every output and is listed in
+	`failures`; the estimators skip the effects and samples it affects.
+	"""
+
+	def __init__(
+		self,
+		engine,
+		parameters,
+		outputs=DEFAULT_SENSITIVITY_OUTPUTS,
+		duration=30.0,
+		average_time=10.0,
+		sample_interval=0.01,
+		workers=None,
+		seed=None,
+	):
+		"""Initialize an analysis on a (warmed-up) engine.
+
+		Args:
+			engine: Initialized `ModelEngine` whose current state is the checkpoint.
+			parameters: Dict of property path (`Model.prop`) -> `(low, high)`
+				bounds, e.g. `{"Circulation.svr_factor": (0.5, 2.0)}`.
+			outputs: Property paths reported per point.
+			duration: Simulated time per point in seconds.
+			average_time: Final part of the run averaged per output, in seconds.
+			sample_interval: Output sampling interval while averaging.
+			workers: Number of processes, defaults to `os.cpu_count()`.
+			seed: Seed of the random designs and bootstraps.
+
+		Raises:
+			ValueError: If a parameter or output does not exist or a bound is invalid.
+		"""
+		self.parameters = {}
+		self.baseline = {}
+		for path, bounds in parameters.items():
+			model, prop = self._resolve(engine, path)
+			low, high = (float(bound) for bound in bounds)
+			if not high > low:
+				raise ValueError(f"Parameter '{path}' needs low < high")
+			self.parameters[path] = (low, high)
+			self.baseline[path] = float(getattr(model, prop))
+		for path in outputs:
+			self._resolve(engine, path)
+
+		self.outputs = list(outputs)
+		self.workers = max(int(workers or os.cpu_count() or 1), 1)
+		self.use_fork = "fork" in multiprocessing.get_all_start_methods()
+		self.random = random.Random(seed)
+		self.evaluations = 0
+		self.failures = []
+		self._context = _EvaluationContext(
+			ModelTemplate(engine),
+			self.outputs,
+			float(duration),
+			min(float(average_time), float(duration)),
+			float(sample_interval),
+		)
+
+	def run_points(self, points):
+		"""Evaluate parameter points and return their outputs in order.
+
+		Args:
+			points: List of dicts of property path -> value. Parameters missing
+				from a point keep their checkpoint value.
+
+		Failed points report NaN for every output. They are listed in
+		`failures` as dicts with `index`, `point` and `error` (the worker
+		traceback), replacing the failures of the previous call.
+
+		Returns:
+			list: One dict of output path -> averaged value per point.
+
+		Raises:
+			RuntimeError: If every point failed, with the first traceback.
+		"""
+		points = list(points)
+		results = [None] * len(points)
+		tasks = list(enumerate(points))
+		if self.use_fork and self.workers > 1 and len(points) > 1:
+			chunksize = max(len(tasks) // (self.workers * 4), 1)
+			context = multiprocessing.get_context("fork")
+			with context.Pool(min(self.workers, len(points)), _init_worker, (self._context,)) as pool:
+				outcomes = list(pool.imap_unordered(_evaluate_task, tasks, chunksize))
+		else:
+			_init_worker(self._context)
+			outcomes = [_evaluate_task(task) for task in tasks]
+
+		failures = []
+		for index, status, payload in outcomes:
+			if status == "ok":
+				results[index] = dict(zip(self.outputs, payload))
+			else:
+				failures.append({"index": index, "point": points[index], "error": payload})
+				results[index] = dict.fromkeys(self.outputs, math.nan)
+		failures.sort(key=lambda failure: failure["index"])
+		self.failures = failures
+		self.evaluations += len(points)
+
+		if points and len(failures) == len(points):
+			first = failures[0]
+			raise RuntimeError(f"All {len(points)} sensitivity points failed; point {first['index']} ({first['point']}):\n{first['error']}")
+		return results
+
+	def one_at_a_time(self):
+		"""Move each parameter to its low and high bound with the others at baseline.
+
+		Returns:
+			list: Rows with `parameter`, `output`, `baseline`, `low`, `high`,
+			`output_baseline`, `output_low`, `output_high`, `sensitivity`
+			(output change per parameter unit) and `elasticity` (relative
+			output change per relative parameter change at baseline). Values
+			that depend on a failed point are NaN.
+		"""
+		points = [{}]
+		for path, (low, high) in self.parameters.items():
+			points.append({path: low})
+			points.append({path: high})
+		results = self.run_points(points)
+
+		rows = []
+		for index, (path, (low, high)) in enumerate(self.parameters.items()):
+			result_low = results[1 + 2 * index]
+			result_high = results[2 + 2 * index]
+			baseline = self.baseline[path]
+			for output in self.outputs:
+				output_baseline = results[0][output]
+				sensitivity = (result_high[output] - result_low[output]) / (high - low)
+				elasticity = sensitivity * baseline / output_baseline if output_baseline != 0.0 else math.nan
+				rows.append({
+					"parameter": path,
+					"output": output,
+					"baseline": baseline,
+					"low": low,
+					"high": high,
+					"output_baseline": output_baseline,
+					"output_low": result_low[output],
+					"output_high": result_high[output],
+					"sensitivity": sensitivity,
+					"elasticity": elasticity,
+				})
+		return rows
+
+	def morris(self, trajectories=10, levels=4, bootstrap=1000, confidence=0.95):
+		"""Estimate elementary effects along random one-factor-at-a-time trajectories.
+
+		Each trajectory takes `len(parameters) + 1` points on a grid of
+		`levels` levels per parameter range and moves every parameter once by
+		`levels / (2 * (levels - 1))` of its range.
+
+		Returns:
+			list: Rows with `parameter`, `output`, `mu`, `mu_star`, `sigma`
+			(of the elementary effects, in output units per full parameter
+			range), `mu_star_ci_low`, `mu_star_ci_high` and `effects` (the
+			number of elementary effects without a failed point).
+		"""
+		paths = list(self.parameters)
+		levels = max(int(levels), 2)
+		delta = levels / (2.0 * (levels - 1))
+		start_levels = [level / (levels - 1) for level in range(levels) if level / (levels - 1) + delta <= 1.0 + 1e-12]
+
+		points = []
+		moves = []  # per trajectory: list of (parameter index, unit step)
+		for _ in range(max(int(trajectories), 1)):
+			unit = []
+			for _ in paths:
+				base = self.random.choice(start_levels)
+				# start at the upper level half of the time to step downwards
+				unit.append(base + delta if self.random.random() < 0.5 else base)
+			points.append(self._to_point(unit))
+			order = list(range(len(paths)))
+			self.random.shuffle(order)
+			trajectory_moves = []
+			for parameter_index in order:
+				step = -delta if unit[parameter_index] + delta > 1.0 + 1e-12 else delta
+				unit = list(unit)
+				unit[parameter_index] += step
+				points.append(self._to_point(unit))
+				trajectory_moves.append((parameter_index, step))
+			moves.append(trajectory_moves)
+		results = self.run_points(points)
+
+		effects = {(path, output): [] for path in paths for output in self.outputs}
+		position = 0
+		for trajectory_moves in moves:
+			for parameter_index, step in trajectory_moves:
+				before = results[position]
+				after = results[position + 1]
+				for output in self.outputs:
+					effects[(paths[parameter_index], output)].append((after[output] - before[output]) / step)
+				position += 1
+			position += 1
+
+		rows = []
+		for path in paths:
+			for output in self.outputs:
+				values = [value for value in effects[(path, output)] if not math.isnan(value)]
+				absolute = [abs(value) for value in values]
+				mu = _mean(values)
+				ci_low, ci_high = self._bootstrap(_mean, absolute, bootstrap, confidence)
+				rows.append({
+					"parameter": path,
+					"output": output,
+					"mu": mu,
+					"mu_star": _mean(absolute),
+					"sigma": math.sqrt(sum((value - mu) ** 2 for value in values) / (len(values) - 1)) if len(values) > 1 else math.nan,
+					"mu_star_ci_low": ci_low,
+					"mu_star_ci_high": ci_high,
+					"effects": len(values),
+				})
+		return rows
+
+	def sobol(self, samples=64, bootstrap=1000, confidence=0.95):
+		"""Estimate first-order and total Sobol indices with a Saltelli design.
+
+		Uses `samples * (len(parameters) + 2)` points drawn uniformly within
+		the bounds; first-order indices use the Saltelli (2010) estimator and
+		total indices the Jansen estimator.
+
+		Returns:
+			list: Rows with `parameter`, `output`, `s1`, `s1_ci_low`,
+			`s1_ci_high`, `st`, `st_ci_low`, `st_ci_high` and `samples` (the
+			number of `(A, B, AB)` triples without a failed point).
+		"""
+		paths = list(self.parameters)
+		count = max(int(samples), 2)
+		matrix_a = [[self.random.random() for _ in paths] for _ in range(count)]
+		matrix_b = [[self.random.random() for _ in paths] for _ in range(count)]
+
+		points = [self._to_point(row) for row in matrix_a]
+		points.extend(self._to_point(row) for row in matrix_b)
+		for parameter_index in range(len(paths)):
+			for row_a, row_b in zip(matrix_a, matrix_b):
+				row = list(row_a)
+				row[parameter_index] = row_b[parameter_index]
+				points.append(self._to_point(row))
+		results = self.run_points(points)
+
+		rows = []
+		for output in self.outputs:
+			values = [result[output] for result in results]
+			output_a = values[:count]
+			output_b = values[count:2 * count]
+			for parameter_index, path in enumerate(paths):
+				offset = (2 + parameter_index) * count
+				output_ab = values[offset:offset + count]
+				samples_abc = [
+					triple for triple in zip(output_a, output_b, output_ab) if not any(math.isnan(value) for value in triple)
+				]
+				s1_ci = self._bootstrap(self._first_order, samples_abc, bootstrap, confidence)
+				st_ci = self._bootstrap(self._total_order, samples_abc, bootstrap, confidence)
+				rows.append({
+					"parameter": path,
+					"output": output,
+					"s1": self._first_order(samples_abc),
+					"s1_ci_low": s1_ci[0],
+					"s1_ci_high": s1_ci[1],
+					"st": self._total_order(samples_abc),
+					"st_ci_low": st_ci[0],
+					"st_ci_high": st_ci[1],
+					"samples": len(samples_abc),
+				})
+		return rows
+
+	def _to_point(self, unit):
+		"""Map unit coordinates (0..1 per parameter) to a parameter point."""
+		return {
+			path: low + min(max(value, 0.0), 1.0) * (high - low)
+			for (path, (low, high)), value in zip(self.parameters.items(), unit)
+		}
+
+	def _bootstrap(self, statistic, samples, repetitions, confidence):
+		"""Return the percentile bootstrap confidence interval of `statistic(samples)`."""
+		if len(samples) < 2 or repetitions <= 0:
+			return math.nan, math.nan
+		estimates = []
+		for _ in range(int(repetitions)):
+			resampled = [samples[self.random.randrange(len(samples))] for _ in samples]
+			estimate = statistic(resampled)
+			if not math.isnan(estimate):
+				estimates.append(estimate)
+		tail = (1.0 - float(confidence)) / 2.0
+		return _percentile(estimates, tail), _percentile(estimates, 1.0 - tail)
+
+	@staticmethod
+	def _first_order(samples):
+		"""Saltelli (2010) first-order index from `(f(A), f(B), f(AB_i))` triples."""
+		values = [value for triple in samples for value in triple[:2]]
+		if not values or max(values) == min(values):
+			return math.nan
+		variance = _variance(values)
+		# centering f(B) leaves the estimator unbiased and removes the noise of a large output mean
+		average = _mean(values)
+		return _mean([(output_b - average) * (output_ab - output_a) for output_a, output_b, output_ab in samples]) / variance
+
+	@staticmethod
+	def _total_order(samples):
+		"""Jansen total index from `(f(A), f(B), f(AB_i))` triples."""
+		values = [value for triple in samples for value in triple[:2]]
+		if not values or max(values) == min(values):
+			return math.nan
+		variance = _variance(values)
+		return 0.5 * _mean([(output_a - output_ab) ** 2 for output_a, _, output_ab in samples]) / variance
+
+	@staticmethod
+	def _resolve(engine, path):
+		"""Return `(model, prop)` of a property path or raise `ValueError`."""
+		tokens = str(path).split(".")
+		model = engine.models.get(tokens[0]) if len(tokens) == 2 else None
+		if model is None or not hasattr(model, tokens[1]):
+			raise ValueError(f"Property '{path}' does not exist")
+		return model, tokens[1]
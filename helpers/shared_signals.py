@@ -0,0 +1,294 @@
+import json
+import math
+import struct
+import sys
+from array import array
+from multiprocessing import shared_memory
+
+
+SIGNAL_MAGIC = b"EXPLSIG1"
+SIGNAL_FORMAT = 1
+
+# native byte order: the block is only shared between processes on one host
+HEADER = struct.Struct("=8sIIQQdII")  # magic, format, channels, capacity, sequence, sample interval, state, names length
+HEADER_SIZE = 64
+SEQUENCE_OFFSET = 24
+STATE_OFFSET = 40
+
+STATE_OPEN = 1
+STATE_CLOSED = 2
+
+_published_names = set()  # blocks created by publishers of this process
+
+MONITOR_SIGNALS = (
+	"Monitor.ecg_signal",
+	"Monitor.abp_signal",
+	"Monitor.pap_signal",
+	"Monitor.co2_signal",
+	"Monitor.resp_signal",
+)
+
+
+def _aligned(size):
+	"""Round a byte size up to a multiple of 8."""
+	return (size + 7) & ~7
+
+
+def _layout(channel_count, capacity, names_length):
+	"""Return `(time offset, data offset, total size)` of a signal block."""
+	time_offset = HEADER_SIZE + _aligned(names_length)
+	data_offset = time_offset + 8 * capacity
+	return time_offset, data_offset, data_offset + 8 * capacity * channel_count
+
+
+class SharedSignalPublisher:
+	"""Publish `DataCollector` samples into a shared-memory ring buffer.
+
+	The block holds a header, the channel names (JSON), a ring of sample
+	times and one ring per channel (channel-major float64). The header
+	`sequence` counts the samples written so far; sample `n` lives in slot
+	`n % capacity`. The publisher writes a sample first and then advances the
+	sequence, so readers can tell which slots are complete and whether a slot
+	was overwritten while they copied it (see `SharedSignalReader`).
+	"""
+
+	def __init__(self, collector, signals=MONITOR_SIGNALS, capacity=8192, name=None):
+		"""Create the shared block and register with the collector.
+
+		Args:
+			collector: `DataCollector` whose fast samples are published. The
+				signals are added to its watch list.
+			signals: Property paths to publish.
+			capacity: Number of samples kept in the ring.
+			name: Shared memory name, generated when `None`.
+
+		Raises:
+			ValueError: If none of the signals exist.
+		"""
+		collector.add_to_watchlist(list(signals))
+		watched = {item.get("label") for item in collector.watch_list}
+		self.channels = [str(signal) for signal in signals if signal in watched]
+		if not self.channels:
+			raise ValueError("None of the signals to publish exist")
+
+		self.collector = collector
+		self.capacity = max(int(capacity), 1)
+		self.sample_interval = float(collector.sample_interval)
+		self.sequence = 0
+
+		names = json.dumps(self.channels).encode("utf-8")
+		self._time_offset, self._data_offset, size = _layout(len(self.channels), self.capacity, len(names))
+		self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+		self.name = self._shm.name
+		_published_names.add(self.name)
+
+		buffer = self._shm.buf
+		HEADER.pack_into(
+			buffer,
+			0,
+			SIGNAL_MAGIC,
+			SIGNAL_FORMAT,
+			len(self.channels),
+			self.capacity,
+			0,
+			self.sample_interval,
+			STATE_OPEN,
+			len(names),
+		)
+		buffer[HEADER_SIZE:HEADER_SIZE + len(names)] = names
+		self._sequence_view = buffer[SEQUENCE_OFFSET:SEQUENCE_OFFSET + 8].cast("Q")
+		self._state_view = buffer[STATE_OFFSET:STATE_OFFSET + 4].cast("I")
+		self._times = buffer[self._time_offset:self._data_offset].cast("d")
+		self._data = buffer[self._data_offset:size].cast("d")
+
+		collector.add_listener(self.publish)
+
+	def publish(self, data_object):
+		"""Write one collector sample into the ring and advance the sequence."""
+		slot = self.sequence % self.capacity
+		capacity = self.capacity
+		data = self._data
+		self._times[slot] = float(data_object.get("time", math.nan))
+		for index, label in enumerate(self.channels):
+			value = data_object.get(label, math.nan)
+			try:
+				data[index * capacity + slot] = float(value)
+			except (TypeError, ValueError):
+				data[index * capacity + slot] = math.nan
+
+		self.sequence += 1
+		self._sequence_view[0] = self.sequence
+
+	def close(self, unlink=True):
+		"""Stop publishing, mark the block closed and release (and by default remove) it."""
+		if self._shm is None:
+			return
+
+		self.collector.remove_listener(self.publish)
+		self._state_view[0] = STATE_CLOSED
+		for view in (self._sequence_view, self._state_view, self._times, self._data):
+			view.release()
+		self._shm.close()
+		if unlink:
+			self._shm.unlink()
+		_published_names.discard(self.name)
+		self._shm = None
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+
+class SharedSignalReader:
+	"""Map a block written by `SharedSignalPublisher` in another process.
+
+	`read_since()` copies new samples without NumPy. `as_arrays()` returns
+	zero-copy NumPy views of the raw rings for consumers that index them
+	themselves with `sequence % capacity`.
+	"""
+
+	def __init__(self, name):
+		"""Attach to an existing signal block.
+
+		Raises:
+			FileNotFoundError: If no block with this name exists.
+			ValueError: If the block is not a signal block of a known format.
+		"""
+		self._shm = _attach_shared_memory(name)
+		self.name = name
+
+		buffer = self._shm.buf
+		magic, block_format, channel_count, capacity, _, sample_interval, _, names_length = HEADER.unpack_from(buffer, 0)
+		if magic != SIGNAL_MAGIC or block_format != SIGNAL_FORMAT:
+			self._shm.close()
+			self._shm = None
+			raise ValueError(f"Shared memory '{name}' is not a signal block of format {SIGNAL_FORMAT}")
+
+		self.capacity = capacity
+		self.sample_interval = sample_interval
+		self.channels = json.loads(bytes(buffer[HEADER_SIZE:HEADER_SIZE + names_length]))
+		self._time_offset, self._data_offset, size = _layout(channel_count, capacity, names_length)
+		self._sequence_view = buffer[SEQUENCE_OFFSET:SEQUENCE_OFFSET + 8].cast("Q")
+		self._state_view = buffer[STATE_OFFSET:STATE_OFFSET + 4].cast("I")
+		self._times = buffer[self._time_offset:self._data_offset].cast("d")
+		self._data = buffer[self._data_offset:size].cast("d")
+
+	@property
+	def sequence(self):
+		"""Number of samples written by the publisher so far."""
+		return self._sequence_view[0]
+
+	@property
+	def is_closed(self):
+		"""Whether the publisher has closed the block."""
+		return self._state_view[0] == STATE_CLOSED
+
+	def read_since(self, sequence=0):
+		"""Copy the samples written after `sequence`.
+
+		Args:
+			sequence: Sequence returned by the previous call (0 for everything
+				still in the ring).
+
+		Returns:
+			dict: `sequence` to pass to the next call, `times` (`array('d')`),
+			`values` (channel -> `array('d')`) and `lost`, the number of
+			requested samples that were already overwritten.
+		"""
+		end = self.sequence
+		start = max(int(sequence), end - self.capacity)
+		times, values = self._copy(start, end)
+
+		# samples overwritten while copying are not valid: drop them
+		oldest = self.sequence - self.capacity
+		if oldest > start:
+			skip = min(oldest - start, end - start)
+			times = times[skip:]
+			values = {channel: channel_values[skip:] for channel, channel_values in values.items()}
+			start += skip
+
+		return {
+			"sequence": end,
+			"times": times,
+			"values": values,
+			"lost": start - int(sequence) if int(sequence) < start else 0,
+		}
+
+	def as_arrays(self):
+		"""Return zero-copy NumPy views `(times, data)` of the rings.
+
+		`times` has shape `(capacity,)` and `data` shape `(channels, capacity)`;
+		sample `n` is at index `n % capacity`. The views are only valid until
+		`close()`.
+
+		Raises:
+			ImportError: If NumPy is not installed.
+		"""
+		import numpy as np
+
+		times = np.ndarray((self.capacity,), dtype=np.float64, buffer=self._shm.buf, offset=self._time_offset)
+		data = np.ndarray(
+			(len(self.channels), self.capacity),
+			dtype=np.float64,
+			buffer=self._shm.buf,
+			offset=self._data_offset,
+		)
+		return times, data
+
+	def close(self):
+		"""Detach from the block (NumPy views from `as_arrays` must be released first)."""
+		if self._shm is None:
+			return
+		for view in (self._sequence_view, self._state_view, self._times, self._data):
+			view.release()
+		self._shm.close()
+		self._shm = None
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	def _copy(self, start, end):
+		"""Copy the ring slots of samples `start` to `end` (exclusive) in order."""
+		times = array("d")
+		values = {channel: array("d") for channel in self.channels}
+		if end <= start:
+			return times, values
+
+		capacity = self.capacity
+		first = start % capacity
+		last = first + (end - start)
+		segments = [(first, min(last, capacity))]
+		if last > capacity:
+			segments.append((0, last - capacity))
+
+		for begin, stop in segments:
+			times.frombytes(self._times[begin:stop].tobytes())
+			for index, channel in enumerate(self.channels):
+				offset = index * capacity
+				values[channel].frombytes(self._data[offset + begin:offset + stop].tobytes())
+		return times, values
+
+
+def _attach_shared_memory(name):
+	"""Attach to a shared memory block without letting this process remove it at exit."""
+	if sys.version_info >= (3, 13):
+		return shared_memory.SharedMemory(name=name, track=False)
+
+	block = shared_memory.SharedMemory(name=name)
+	if name in _published_names:
+		return block
+
+	# before 3.13 attaching registers the block with the resource tracker, which
+	# would unlink it when this (reader) process exits
+	from multiprocessing import resource_tracker
+
+	try:
+		resource_tracker.unregister(block._name, "shared_memory")
+	except Exception:
+		pass
+	return block
@@ -0,0 +1,115 @@
+def _reading_as_float(value):
+	"""Return a non-float reading as float, or `None` when the reading is missing."""
+	if value is None:
+		return None
+	return float(value)
+
+
+class SignalAcquisition:
+	"""Batched per-step reader for a fixed set of model properties.
+
+	Channels are registered once and then read together in a single pass per
+	step. Envelope channels track the running minimum and maximum of a property
+	and integral channels accumulate `value * dt`. Both are kept in flat lists
+	and are only handed out when the owner flushes them (e.g. once per beat).
+
+	Like `Monitor._safe_float`, a missing (`None`) reading leaves its channel
+	unchanged for that step and other non-float values are converted with
+	`float()`.
+	"""
+
+	def __init__(self, envelope_floor=-1000.0, envelope_ceiling=1000.0):
+		"""Initialize an acquisition plan without channels.
+
+		Args:
+			envelope_floor: Reset value of the envelope maxima.
+			envelope_ceiling: Reset value of the envelope minima.
+		"""
+		self.envelope_floor = float(envelope_floor)
+		self.envelope_ceiling = float(envelope_ceiling)
+
+		self.envelope_max = []
+		self.envelope_min = []
+		self.integrals = []
+
+		self._envelope_sources = []
+		self._integral_sources = []
+
+	def add_envelope(self, model, prop):
+		"""Register a min/max envelope channel and return its index.
+
+		Returns `None` when the model is missing or lacks the property, so the
+		caller can keep its defaults for that channel.
+		"""
+		if model is None or not hasattr(model, prop):
+			return None
+
+		self._envelope_sources.append((model, prop))
+		self.envelope_max.append(self.envelope_floor)
+		self.envelope_min.append(self.envelope_ceiling)
+		return len(self._envelope_sources) - 1
+
+	def add_integral(self, model, prop):
+		"""Register a time-integral channel and return its index (or `None`)."""
+		if model is None or not hasattr(model, prop):
+			return None
+
+		self._integral_sources.append((model, prop))
+		self.integrals.append(0.0)
+		return len(self._integral_sources) - 1
+
+	def acquire(self, dt):
+		"""Read all channels once and update envelopes and integrals."""
+		envelope_max = self.envelope_max
+		envelope_min = self.envelope_min
+		index = 0
+		for model, prop in self._envelope_sources:
+			value = getattr(model, prop, None)
+			if type(value) is not float:
+				value = _reading_as_float(value)
+				if value is None:
+					index += 1
+					continue
+			if value > envelope_max[index]:
+				envelope_max[index] = value
+			if value < envelope_min[index]:
+				envelope_min[index] = value
+			index += 1
+
+		integrals = self.integrals
+		index = 0
+		for model, prop in self._integral_sources:
+			value = getattr(model, prop, None)
+			if type(value) is not float:
+				value = _reading_as_float(value)
+				if value is None:
+					index += 1
+					continue
+			integrals[index] += value * dt
+			index += 1
+
+	def take_envelope(self, index):
+		"""Return `(minimum, maximum)` of a channel and reset its envelope."""
+		if index is None:
+			return self.envelope_ceiling, self.envelope_floor
+
+		envelope = (self.envelope_min[index], self.envelope_max[index])
+		self.envelope_min[index] = self.envelope_ceiling
+		self.envelope_max[index] = self.envelope_floor
+		return envelope
+
+	def take_integral(self, index):
+		"""Return the accumulated integral of a channel and reset it."""
+		if index is None:
+			return 0.0
+
+		value = self.integrals[index]
+		self.integrals[index] = 0.0
+		return value
+
+	def reset(self):
+		"""Reset all envelopes and integrals without removing channels."""
+		count = len(self._envelope_sources)
+		self.envelope_max = [self.envelope_floor] * count
+		self.envelope_min = [self.envelope_ceiling] * count
+		self.integrals = [0.0] * len(self._integral_sources)
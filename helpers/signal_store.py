@@ -0,0 +1,369 @@
+import bisect
+import json
+import lzma
+import math
+import operator
+import struct
+import sys
+import zlib
+from array import array
+from itertools import accumulate
+
+
+STORE_MAGIC = b"EXPLSTO1"
+STORE_FORMAT = 1
+FOOTER = struct.Struct("<Q8s")  # index offset, magic
+
+SIGNAL_CODECS = ("xor", "quantize", "raw")
+STORE_COMPRESSIONS = ("zlib", "lzma")
+
+TIME_DECIMALS = 6
+_MASK64 = (1 << 64) - 1
+
+
+def _to_little_endian(values):
+	"""Return the little-endian bytes of a typed array."""
+	if sys.byteorder == "big":
+		values = array(values.typecode, values)
+		values.byteswap()
+	return values.tobytes()
+
+
+def _from_little_endian(typecode, data):
+	"""Return a typed array from little-endian bytes."""
+	values = array(typecode)
+	values.frombytes(data)
+	if sys.byteorder == "big":
+		values.byteswap()
+	return values
+
+
+def _shuffle(data, width=8):
+	"""Group byte `i` of every value together so the compressor sees slowly varying planes."""
+	return b"".join(data[index::width] for index in range(width))
+
+
+def _unshuffle(data, width=8):
+	"""Invert `_shuffle`."""
+	count = len(data) // width
+	result = bytearray(len(data))
+	for index in range(width):
+		result[index::width] = data[index * count:(index + 1) * count]
+	return bytes(result)
+
+
+def _encode_xor(values):
+	"""XOR every float64 bit pattern with its predecessor (Gorilla-style)."""
+	bits = _from_little_endian("Q", _to_little_endian(values))
+	previous = array("Q", [0])
+	previous.extend(bits[:-1])
+	return _shuffle(_to_little_endian(array("Q", map(operator.xor, bits, previous))))
+
+
+def _decode_xor(data):
+	"""Invert `_encode_xor`."""
+	bits = array("Q", accumulate(_from_little_endian("Q", _unshuffle(data)), operator.xor))
+	return _from_little_endian("d", _to_little_endian(bits))
+
+
+def _encode_quantized(values, decimals):
+	"""Round to `decimals` and store zigzag-encoded deltas of the scaled integers."""
+	scale = 10.0 ** decimals
+	integers = [int(round(value * scale)) for value in values]
+	previous = [0]
+	previous.extend(integers[:-1])
+	deltas = array("Q", (((delta << 1) ^ (delta >> 63)) & _MASK64 for delta in map(operator.sub, integers, previous)))
+	return _shuffle(_to_little_endian(deltas))
+
+
+def _decode_quantized(data, decimals):
+	"""Invert `_encode_quantized`."""
+	scale = 10.0 ** decimals
+	deltas = (
+		(encoded >> 1) ^ -(encoded & 1) for encoded in _from_little_endian("Q", _unshuffle(data))
+	)
+	return array("d", (integer / scale for integer in accumulate(deltas)))
+
+
+class SignalStoreWriter:
+	"""Write collected signals into a compact chunked file.
+
+	Samples are buffered and written in chunks of `chunk_size` samples. Every
+	chunk stores the sample times and each signal as a separate compressed
+	block, so readers decode only the signals and chunks they need. Signal
+	codecs:
+
+	- `xor` (default, lossless): each float64 bit pattern XORed with its
+	  predecessor, like the Gorilla time-series encoding; slowly changing
+	  signals leave mostly zero bytes;
+	- `quantize` (lossy): values rounded to `decimals` decimals and stored as
+	  delta-encoded integers, which compresses best for smooth signals;
+	- `raw`: the float64 values.
+
+	Encoded values are byte-shuffled and compressed with `zlib` or `lzma`.
+	The file ends with a JSON index of the chunks (time range and block
+	offsets), which `SignalStoreReader` uses to seek to time ranges.
+
+	The writer can be attached to a collector with
+	`collector.add_listener(writer.append)`.
+	"""
+
+	def __init__(self, path, signals, codecs=None, decimals=4, compression="zlib", level=None, chunk_size=4096):
+		"""Create the file and write its header.
+
+		Args:
+			path: File path.
+			signals: Labels of the signals to store (e.g. the collector watch list labels).
+			codecs: Codec for all signals, or dict of label -> codec (`xor` by default).
+			decimals: Decimals kept by the `quantize` codec, or dict of label -> decimals.
+			compression: `zlib` or `lzma`.
+			level: Compression level (zlib 0-9, lzma preset 0-9), default 6.
+			chunk_size: Samples per chunk.
+
+		Raises:
+			ValueError: If a codec or the compression is unknown.
+		"""
+		if compression not in STORE_COMPRESSIONS:
+			raise ValueError(f"Unknown compression '{compression}' (expected one of {', '.join(STORE_COMPRESSIONS)})")
+
+		self.path = path
+		self.signals = [str(signal) for signal in signals]
+		self.compression = compression
+		self.level = 6 if level is None else int(level)
+		self.chunk_size = max(int(chunk_size), 1)
+		self.sample_count = 0
+
+		self.codecs = {}
+		for signal in self.signals:
+			codec = codecs.get(signal, "xor") if isinstance(codecs, dict) else (codecs or "xor")
+			if codec not in SIGNAL_CODECS:
+				raise ValueError(f"Unknown codec '{codec}' for '{signal}' (expected one of {', '.join(SIGNAL_CODECS)})")
+			signal_decimals = decimals.get(signal, 4) if isinstance(decimals, dict) else decimals
+			self.codecs[signal] = {"codec": codec, "decimals": int(signal_decimals)}
+
+		self._chunks = []
+		self._times = array("d")
+		self._columns = {signal: array("d") for signal in self.signals}
+		self._file = open(path, "wb")
+		self._file.write(STORE_MAGIC)
+
+	def append(self, data_object):
+		"""Add one sample (a collector row with `time` and the signal labels)."""
+		self._times.append(float(data_object.get("time", math.nan)))
+		for signal, column in self._columns.items():
+			try:
+				column.append(float(data_object.get(signal, math.nan)))
+			except (TypeError, ValueError):
+				column.append(math.nan)
+		if len(self._times) >= self.chunk_size:
+			self.flush()
+
+	def extend(self, rows):
+		"""Add several samples, e.g. the result of `DataCollector.get_model_data()`."""
+		for row in rows:
+			self.append(row)
+
+	def flush(self):
+		"""Write the buffered samples as a (possibly short) chunk."""
+		if not self._times:
+			return
+
+		times = self._times
+		chunk = {
+			"start": times[0],
+			"end": times[-1],
+			"count": len(times),
+			"time": self._write_block(times, "quantize", TIME_DECIMALS),
+			"signals": {},
+		}
+		for signal, column in self._columns.items():
+			settings = self.codecs[signal]
+			chunk["signals"][signal] = self._write_block(column, settings["codec"], settings["decimals"])
+
+		self._chunks.append(chunk)
+		self.sample_count += len(times)
+		self._times = array("d")
+		self._columns = {signal: array("d") for signal in self.signals}
+
+	def close(self):
+		"""Write the pending samples and the index and close the file."""
+		if self._file is None:
+			return
+		self.flush()
+		index = {
+			"format": STORE_FORMAT,
+			"compression": self.compression,
+			"signals": self.signals,
+			"codecs": self.codecs,
+			"sample_count": self.sample_count,
+			"chunks": self._chunks,
+		}
+		index_offset = self._file.tell()
+		self._file.write(zlib.compress(json.dumps(index).encode("utf-8")))
+		self._file.write(FOOTER.pack(index_offset, STORE_MAGIC))
+		self._file.close()
+		self._file = None
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	def _write_block(self, values, codec, decimals):
+		"""Encode, compress and write one column; return its `[offset, length, codec]` entry."""
+		if codec == "quantize" and not all(math.isfinite(value) for value in values):
+			# NaN and infinity have no integer representation: keep this chunk lossless
+			codec = "xor"
+
+		if codec == "xor":
+			data = _encode_xor(values)
+		elif codec == "quantize":
+			data = _encode_quantized(values, decimals)
+		else:
+			data = _shuffle(_to_little_endian(values))
+
+		if self.compression == "lzma":
+			data = lzma.compress(data, preset=self.level)
+		else:
+			data = zlib.compress(data, self.level)
+
+		offset = self._file.tell()
+		self._file.write(data)
+		return [offset, len(data), codec]
+
+
+class SignalStoreReader:
+	"""Read signals and time ranges from a file written by `SignalStoreWriter`."""
+
+	def __init__(self, path):
+		"""Open a store file and load its index.
+
+		Raises:
+			ValueError: If the file is not a signal store of a known format.
+		"""
+		self.path = path
+		self._file = open(path, "rb")
+		try:
+			if self._file.read(len(STORE_MAGIC)) != STORE_MAGIC:
+				raise ValueError(f"'{path}' is not a signal store")
+			self._file.seek(-FOOTER.size, 2)
+			index_offset, magic = FOOTER.unpack(self._file.read(FOOTER.size))
+			if magic != STORE_MAGIC:
+				raise ValueError(f"'{path}' has no index (the writer was not closed)")
+			self._file.seek(index_offset)
+			index = json.loads(zlib.decompress(self._file.read(self._file_size() - FOOTER.size - index_offset)))
+		except Exception:
+			self._file.close()
+			raise
+
+		if index.get("format") != STORE_FORMAT:
+			self._file.close()
+			raise ValueError(f"'{path}' has unsupported format {index.get('format')}")
+
+		self.compression = index["compression"]
+		self.signals = index["signals"]
+		self.codecs = index["codecs"]
+		self.sample_count = index["sample_count"]
+		self.chunks = index["chunks"]
+		self._chunk_starts = [chunk["start"] for chunk in self.chunks]
+
+	@property
+	def time_range(self):
+		"""`(first, last)` sample time, `None` for an empty store."""
+		if not self.chunks:
+			return None
+		return self.chunks[0]["start"], self.chunks[-1]["end"]
+
+	def read(self, signals=None, start=None, end=None):
+		"""Decode signals within a time range.
+
+		Only the chunks overlapping `[start, end]` and the requested signals
+		are decompressed.
+
+		Args:
+			signals: Labels to read, defaults to all signals.
+			start: First time to include, `None` for the beginning.
+			end: Last time to include, `None` for the end.
+
+		Returns:
+			dict: `time` and one entry per signal, each an `array('d')`.
+
+		Raises:
+			KeyError: If a signal is not in the store.
+		"""
+		signals = list(self.signals if signals is None else signals)
+		missing = [signal for signal in signals if signal not in self.codecs]
+		if missing:
+			raise KeyError(f"Signal(s) not in store: {', '.join(missing)}")
+
+		result = {"time": array("d")}
+		result.update({signal: array("d") for signal in signals})
+		for chunk in self._chunks_between(start, end):
+			times = self._read_block(chunk["time"], TIME_DECIMALS)
+			first = 0 if start is None else bisect.bisect_left(times, start)
+			last = len(times) if end is None else bisect.bisect_right(times, end)
+			if first >= last:
+				continue
+			result["time"].extend(times[first:last])
+			for signal in signals:
+				values = self._read_block(chunk["signals"][signal], self.codecs[signal]["decimals"])
+				result[signal].extend(values[first:last])
+		return result
+
+	def read_arrays(self, signals=None, start=None, end=None):
+		"""Like `read`, but return NumPy float64 arrays.
+
+		Raises:
+			ImportError: If NumPy is not installed.
+		"""
+		import numpy as np
+
+		return {label: np.frombuffer(values, dtype=np.float64) for label, values in self.read(signals, start, end).items()}
+
+	def close(self):
+		"""Close the file."""
+		self._file.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	def _chunks_between(self, start, end):
+		"""Return the chunks whose time range overlaps `[start, end]`."""
+		first = 0
+		if start is not None:
+			first = max(bisect.bisect_right(self._chunk_starts, start) - 1, 0)
+		chunks = []
+		for chunk in self.chunks[first:]:
+			if end is not None and chunk["start"] > end:
+				break
+			if start is None or chunk["end"] >= start:
+				chunks.append(chunk)
+		return chunks
+
+	def _read_block(self, entry, decimals):
+		"""Read, decompress and decode one column block."""
+		offset, length, codec = entry
+		self._file.seek(offset)
+		data = self._file.read(length)
+		if self.compression == "lzma":
+			data = lzma.decompress(data)
+		else:
+			data = zlib.decompress(data)
+
+		if codec == "xor":
+			return _decode_xor(data)
+		if codec == "quantize":
+			return _decode_quantized(data, decimals)
+		return _from_little_endian("d", _unshuffle(data))
+
+	def _file_size(self):
+		"""Return the size of the open file."""
+		position = self._file.tell()
+		self._file.seek(0, 2)
+		size = self._file.tell()
+		self._file.seek(position)
+		return size
@@ -0,0 +1,125 @@
+from helpers.cycle_collector import CycleCollector
+
+
+DEFAULT_STEADY_SIGNALS = (
+	"Monitor.abp_mean",
+	"Monitor.heart_rate",
+	"Circulation.total_blood_volume",
+	"Blood.art_bloodgas.ph",
+	"Blood.art_bloodgas.pco2",
+	"Blood.art_bloodgas.po2",
+)
+
+
+class SteadyStateDetector:
+	"""Detect when beat-to-beat variation of a set of signals has settled.
+
+	Every watched signal is averaged per heartbeat (see `CycleCollector`).
+	The beat means are compared in two consecutive windows of `window`
+	beats: the system is steady when, for every signal, the mean of the last
+	window differs from the mean of the window before by at most `tolerance`
+	(relative). Comparing window means rather than single beats ignores the
+	respiratory modulation of pressures and blood gases, which never settles,
+	while still catching slow drift. Signals that are not available in the
+	model are skipped, so the defaults work for definitions without e.g. a
+	`Monitor`.
+	"""
+
+	def __init__(self, engine, signals=DEFAULT_STEADY_SIGNALS, tolerance=0.001, window=10, marker="heart"):
+		"""Initialize a detector on an initialized engine.
+
+		Args:
+			engine: `ModelEngine` to watch.
+			signals: Property paths to check (`Model.prop` or `Model.prop.key`).
+			tolerance: Maximum relative change between the window means, or
+				dict of signal -> tolerance (signals not in the dict use 0.001).
+			window: Number of beats per window; at least `2 * window` beats
+				are needed before the system can be steady.
+			marker: Cycle marker, see `CycleCollector`.
+
+		Raises:
+			ValueError: If none of the signals exist.
+		"""
+		self.engine = engine
+		self.tolerance = tolerance
+		self.window = max(int(window), 1)
+		self.signals = []
+		self.beats = 0
+		self.is_steady = False
+		self.variation = {}
+
+		self._collector = CycleCollector(engine, marker)
+		for signal in signals:
+			try:
+				self._collector.add_properties({signal: ("mean",)})
+			except ValueError:
+				continue
+			self.signals.append(signal)
+		if not self.signals:
+			raise ValueError("None of the steady-state signals exist")
+
+		self._history = {signal: [] for signal in self.signals}
+
+	def attach(self):
+		"""Check after every step of the engine (see `ModelEngine.add_step_listener`)."""
+		self.engine.add_step_listener(self.collect_data)
+
+	def detach(self):
+		"""Stop checking the engine after `attach`."""
+		self.engine.remove_step_listener(self.collect_data)
+
+	def reset(self):
+		"""Forget the beats seen so far."""
+		self._collector.clear()
+		self._history = {signal: [] for signal in self.signals}
+		self.beats = 0
+		self.is_steady = False
+		self.variation = {}
+
+	def collect_data(self, model_clock=None):
+		"""Sample the current step and re-evaluate when a beat has completed.
+
+		Returns:
+			bool: Whether the system is steady.
+		"""
+		self._collector.collect_data(model_clock)
+		if self._collector.collected_rows:
+			for row in self._collector.get_rows():
+				self._add_beat(row)
+		return self.is_steady
+
+	def get_report(self):
+		"""Return `steady`, `beats` and the relative change of the window mean per signal."""
+		return {
+			"steady": self.is_steady,
+			"beats": self.beats,
+			"variation": dict(self.variation),
+		}
+
+	def _add_beat(self, row):
+		"""Add the beat means of one cycle row and update `is_steady`."""
+		self.beats += 1
+		steady = True
+		window = self.window
+		for signal in self.signals:
+			history = self._history[signal]
+			history.append(row[f"{signal}.mean"])
+			if len(history) > 2 * window:
+				del history[0]
+			if len(history) < 2 * window:
+				steady = False
+				continue
+
+			previous = sum(history[:window]) / window
+			change = abs(sum(history[window:]) / window - previous)
+			variation = change / abs(previous) if previous != 0.0 else (0.0 if change == 0.0 else float("inf"))
+			self.variation[signal] = variation
+			if variation > self._tolerance(signal):
+				steady = False
+		self.is_steady = steady
+
+	def _tolerance(self, signal):
+		"""Return the tolerance of one signal."""
+		if isinstance(self.tolerance, dict):
+			return float(self.tolerance.get(signal, 0.001))
+		return float(self.tolerance)
@@ -0,0 +1,372 @@
+import asyncio
+import json
+import math
+import struct
+from array import array
+from collections import deque
+
+
+MESSAGE_HEADER = struct.Struct("<IB")  # payload length, message type
+DATA_HEADER = struct.Struct("<IIIHdd")  # subscription id, sequence, samples, channels, first time, sample interval
+
+MESSAGE_JSON = 1
+MESSAGE_DATA = 2
+
+MAX_MESSAGE_SIZE = 1 << 20  # largest command accepted from a client
+
+
+def encode_message(message):
+	"""Encode a JSON control message (client commands and server replies)."""
+	payload = json.dumps(message, separators=(",", ":")).encode("utf-8")
+	return MESSAGE_HEADER.pack(len(payload), MESSAGE_JSON) + payload
+
+
+def decode_data(payload):
+	"""Decode the payload of a data message.
+
+	Returns:
+		dict: `subscription`, `sequence`, `time` (first sample time),
+		`sample_interval`, `channels` and `values` (`array('d')`, sample-major:
+		`values[sample * channels + channel]`).
+	"""
+	subscription_id, sequence, samples, channels, first_time, sample_interval = DATA_HEADER.unpack_from(payload)
+	values = array("d")
+	values.frombytes(payload[DATA_HEADER.size:DATA_HEADER.size + samples * channels * 8])
+	return {
+		"subscription": subscription_id,
+		"sequence": sequence,
+		"time": first_time,
+		"sample_interval": sample_interval,
+		"channels": channels,
+		"values": values,
+	}
+
+
+async def read_message(reader, max_size=None):
+	"""Read one framed message from an asyncio stream.
+
+	Args:
+		reader: `asyncio.StreamReader`.
+		max_size: Largest accepted payload in bytes, or `None` for no limit.
+
+	Returns:
+		tuple[int, object]: `(MESSAGE_JSON, dict)` or `(MESSAGE_DATA, dict)` as
+		returned by `decode_data`.
+
+	Raises:
+		asyncio.IncompleteReadError: If the stream ends.
+		ValueError: If the message is too large or of an unknown type.
+	"""
+	length, message_type = MESSAGE_HEADER.unpack(await reader.readexactly(MESSAGE_HEADER.size))
+	if max_size is not None and length > max_size:
+		raise ValueError(f"Message of {length} bytes exceeds the limit of {max_size} bytes")
+
+	payload = await reader.readexactly(length)
+	if message_type == MESSAGE_JSON:
+		return message_type, json.loads(payload)
+	if message_type == MESSAGE_DATA:
+		return message_type, decode_data(payload)
+	raise ValueError(f"Unknown message type {message_type}")
+
+
+class _Subscription:
+	"""Signals of one client subscription with the samples of the current frame."""
+
+	def __init__(self, subscription_id, channels, decimation, sample_interval):
+		self.subscription_id = subscription_id
+		self.channels = channels
+		self.decimation = decimation
+		self.sample_interval = sample_interval
+		self.sequence = 0
+		self.counter = 0
+		self.first_time = 0.0
+		self.samples = 0
+		self.values = array("d")
+
+	def sample(self, model_time):
+		"""Append one sample when the decimation counter is due."""
+		self.counter += 1
+		if self.counter < self.decimation:
+			return
+		self.counter = 0
+
+		if self.samples == 0:
+			self.first_time = model_time
+		self.samples += 1
+		append = self.values.append
+		for model, prop1, prop2 in self.channels:
+			value = getattr(model, prop1, math.nan)
+			if prop2 is not None:
+				value = value.get(prop2, math.nan) if isinstance(value, dict) else getattr(value, prop2, math.nan)
+			try:
+				append(float(value))
+			except (TypeError, ValueError):
+				append(math.nan)
+
+	def take_frame(self):
+		"""Return the encoded data message of the buffered samples and clear them."""
+		payload = DATA_HEADER.pack(
+			self.subscription_id,
+			self.sequence,
+			self.samples,
+			len(self.channels),
+			self.first_time,
+			self.sample_interval,
+		) + self.values.tobytes()
+		self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+		self.samples = 0
+		self.values = array("d")
+		return MESSAGE_HEADER.pack(len(payload), MESSAGE_DATA) + payload
+
+
+class _Client:
+	"""Connection state of one subscriber with its bounded outgoing queue."""
+
+	def __init__(self, reader, writer, max_queued_frames):
+		self.reader = reader
+		self.writer = writer
+		self.subscriptions = {}
+		self.replies = deque()
+		self.frames = deque()
+		self.max_queued_frames = max_queued_frames
+		self.dropped_frames = 0
+		self.sent_frames = 0
+		self.wakeup = asyncio.Event()
+		self.handler_task = asyncio.current_task()
+
+	def send_reply(self, message):
+		"""Queue an encoded control reply; replies are never dropped."""
+		self.replies.append(message)
+		self.wakeup.set()
+
+	def send_frame(self, message):
+		"""Queue an encoded data message, dropping the oldest one when the queue is full."""
+		if len(self.frames) >= self.max_queued_frames:
+			self.frames.popleft()
+			self.dropped_frames += 1
+		self.frames.append(message)
+		self.wakeup.set()
+
+
+class StreamServer:
+	"""Stream watched signals to local subscribers and accept scheduler commands.
+
+	Clients connect over a Unix domain socket or localhost TCP and exchange
+	length-prefixed messages (`MESSAGE_HEADER`): JSON control messages and
+	binary data messages holding float64 sample batches. A client subscribes
+	to property paths (`"AA.pres"`, `"AA.solutes.na"`) at a decimation in
+	model steps, and can send `add_task`, `add_function_call` and
+	`remove_task` commands that are forwarded to the `TaskScheduler`.
+
+	The server samples after every model step (`collect_data`) and sends one
+	data message per subscription and frame (`flush`). Each client has a
+	bounded queue drained by its own writer task; when a client is too slow the
+	oldest frames are dropped, so the simulation loop never waits for a client.
+	"""
+
+	def __init__(self, engine, scheduler=None, max_queued_frames=64):
+		"""Initialize a server for an engine.
+
+		Args:
+			engine: `ModelEngine` whose models are streamed.
+			scheduler: `TaskScheduler` receiving client commands. Taken from the
+				runner in `attach` when not given.
+			max_queued_frames: Outgoing messages buffered per client before the
+				oldest are dropped.
+		"""
+		self.engine = engine
+		self.scheduler = scheduler
+		self.max_queued_frames = max(int(max_queued_frames), 1)
+		self.modeling_stepsize = float(engine.modeling_stepsize)
+
+		self._server = None
+		self._clients = set()
+		self._subscriptions = []
+		self._next_subscription_id = 1
+
+	async def start(self, host="127.0.0.1", port=0, path=None):
+		"""Start listening on localhost TCP, or on a Unix domain socket when `path` is given.
+
+		Returns:
+			str | tuple: The socket path or the bound `(host, port)`.
+		"""
+		if path is not None:
+			self._server = await asyncio.start_unix_server(self._handle_client, path=path)
+		else:
+			self._server = await asyncio.start_server(self._handle_client, host=host, port=port)
+		return self.address
+
+	@property
+	def address(self):
+		"""Bound address of the listening socket, or `None` when not started."""
+		if self._server is None or not self._server.sockets:
+			return None
+		return self._server.sockets[0].getsockname()
+
+	async def close(self):
+		"""Stop listening and disconnect all clients."""
+		server = self._server
+		self._server = None
+		if server is not None:
+			server.close()
+		clients = list(self._clients)
+		for client in clients:
+			# abort: a plain close would wait for stalled clients to read their buffer
+			client.writer.transport.abort()
+		# aborted connections end the handlers with an incomplete read
+		handler_tasks = [client.handler_task for client in clients if client.handler_task is not None]
+		await asyncio.gather(*handler_tasks, return_exceptions=True)
+		self._clients.clear()
+		self._subscriptions = []
+		if server is not None:
+			await server.wait_closed()
+
+	def attach(self, runner):
+		"""Sample after every step of a `RealtimeRunner` and flush after every frame."""
+		if self.scheduler is None:
+			self.scheduler = runner.scheduler
+		runner.add_sampler(self)
+		runner.add_frame_callback(self.flush)
+
+	def collect_data(self, model_clock):
+		"""Sample all subscriptions that are due at this model step."""
+		for subscription, _ in self._subscriptions:
+			subscription.sample(model_clock)
+
+	def flush(self, runner=None):
+		"""Queue the buffered samples of every subscription to its client."""
+		for subscription, client in self._subscriptions:
+			if subscription.samples:
+				client.send_frame(subscription.take_frame())
+
+	def get_client_statistics(self):
+		"""Return per client `subscriptions`, `queued`, `sent_frames` and `dropped_frames`."""
+		return [
+			{
+				"peer": client.writer.get_extra_info("peername"),
+				"subscriptions": len(client.subscriptions),
+				"queued": len(client.frames),
+				"sent_frames": client.sent_frames,
+				"dropped_frames": client.dropped_frames,
+			}
+			for client in self._clients
+		]
+
+	async def _handle_client(self, reader, writer):
+		"""Serve one connection: read commands while a writer task drains the queue."""
+		client = _Client(reader, writer, self.max_queued_frames)
+		self._clients.add(client)
+		writer_task = asyncio.ensure_future(self._write_client(client))
+		try:
+			while True:
+				message_type, message = await read_message(reader, MAX_MESSAGE_SIZE)
+				if message_type != MESSAGE_JSON or not isinstance(message, dict):
+					client.send_reply(encode_message({"op": "error", "message": "expected a JSON object"}))
+					continue
+				client.send_reply(encode_message(self._handle_command(client, message)))
+		except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+			pass
+		finally:
+			writer_task.cancel()
+			self._remove_client(client)
+			writer.close()
+
+	async def _write_client(self, client):
+		"""Send queued messages; only this task waits for a slow client."""
+		try:
+			while True:
+				await client.wakeup.wait()
+				client.wakeup.clear()
+				while client.replies or client.frames:
+					if client.replies:
+						client.writer.write(client.replies.popleft())
+					else:
+						client.writer.write(client.frames.popleft())
+						client.sent_frames += 1
+					await client.writer.drain()
+		except (ConnectionError, asyncio.CancelledError):
+			pass
+
+	def _remove_client(self, client):
+		"""Forget a disconnected client and its subscriptions."""
+		self._clients.discard(client)
+		self._subscriptions = [entry for entry in self._subscriptions if entry[1] is not client]
+
+	def _handle_command(self, client, message):
+		"""Execute one client command and return the reply message."""
+		op = message.get("op")
+		request = message.get("request")
+		try:
+			if op == "subscribe":
+				reply = self._subscribe(client, message)
+			elif op == "unsubscribe":
+				subscription = client.subscriptions.pop(int(message.get("subscription", -1)), None)
+				self._subscriptions = [entry for entry in self._subscriptions if entry[0] is not subscription]
+				reply = {"op": "unsubscribed", "subscription": message.get("subscription")}
+			elif op in ("add_task", "add_function_call", "remove_task"):
+				if self.scheduler is None:
+					raise ValueError("no TaskScheduler is attached to the stream server")
+				if op == "add_task":
+					self.scheduler.add_task(message["task"])
+				elif op == "add_function_call":
+					self.scheduler.add_function_call(message["call"])
+				else:
+					self.scheduler.remove_task(message["task_id"])
+				reply = {"op": "ok"}
+			else:
+				raise ValueError(f"Unknown op '{op}'")
+		except (KeyError, TypeError, ValueError, AttributeError) as error:
+			reply = {"op": "error", "message": f"{type(error).__name__}: {error}"}
+
+		if request is not None:
+			reply["request"] = request
+		return reply
+
+	def _subscribe(self, client, message):
+		"""Resolve the requested signals and register a subscription."""
+		signals = message.get("signals") or []
+		if isinstance(signals, str):
+			signals = [signals]
+
+		if "sample_interval" in message:
+			decimation = int(round(float(message["sample_interval"]) / self.modeling_stepsize))
+		else:
+			decimation = int(message.get("decimation", 1))
+		decimation = max(decimation, 1)
+
+		channels = []
+		resolved = []
+		missing = []
+		for signal in signals:
+			channel = self._resolve_signal(signal)
+			if channel is None:
+				missing.append(signal)
+			else:
+				channels.append(channel)
+				resolved.append(signal)
+		if not channels:
+			raise ValueError("none of the requested signals exist")
+
+		subscription = _Subscription(self._next_subscription_id, tuple(channels), decimation, decimation * self.modeling_stepsize)
+		self._next_subscription_id += 1
+		client.subscriptions[subscription.subscription_id] = subscription
+		self._subscriptions.append((subscription, client))
+		return {
+			"op": "subscribed",
+			"subscription": subscription.subscription_id,
+			"signals": resolved,
+			"missing": missing,
+			"decimation": decimation,
+			"sample_interval": subscription.sample_interval,
+		}
+
+	def _resolve_signal(self, signal):
+		"""Resolve `"MODEL.prop"` or `"MODEL.prop.key"` into `(model, prop1, prop2)`."""
+		tokens = str(signal).split(".")
+		if len(tokens) not in (2, 3):
+			return None
+
+		model = self.engine.models.get(tokens[0])
+		if model is None or not hasattr(model, tokens[1]):
+			return None
+		return model, tokens[1], tokens[2] if len(tokens) == 3 else None
@@ -0,0 +1,171 @@
+import json
+import math
+import os
+from collections import deque
+
+
+class TriggerCapture:
+	"""Keep full-rate sample windows around trigger events.
+
+	Samples are fed with `add()`. While idle they only fill a ring buffer of
+	`pre_trigger` seconds. When a trigger fires, the buffered samples start a
+	capture window that takes the next `post_trigger` seconds of samples;
+	the finished window is kept in `captures` (at most `max_captures`) and,
+	when a `directory` is given, written to a JSON file there (at most
+	`max_files` files, oldest removed first). Triggers that fire while a
+	window is open are recorded in its `events` but do not extend it, so a
+	window never holds more than `pre_trigger + post_trigger` seconds.
+
+	Triggers are either conditions (callables returning a bool) evaluated on
+	every sample, which fire when they become true, or explicit `trigger()`
+	calls, which fire on the next sample.
+	"""
+
+	def __init__(
+		self,
+		sample_interval,
+		pre_trigger=2.0,
+		post_trigger=10.0,
+		max_captures=10,
+		directory=None,
+		max_files=100,
+	):
+		"""Initialize a capture buffer.
+
+		Args:
+			sample_interval: Interval of the samples passed to `add()` in seconds.
+			pre_trigger: Seconds of samples kept before a trigger.
+			post_trigger: Seconds of samples captured after a trigger.
+			max_captures: Finished windows kept in memory, oldest dropped first.
+			directory: Directory the finished windows are written to, or `None`.
+			max_files: Capture files kept in `directory`, oldest removed first.
+
+		Raises:
+			ValueError: If the sample interval is not positive.
+		"""
+		if not sample_interval > 0.0:
+			raise ValueError("sample_interval must be positive")
+
+		self.sample_interval = float(sample_interval)
+		self.pre_trigger = max(float(pre_trigger), 0.0)
+		self.post_trigger = max(float(post_trigger), 0.0)
+		self.pre_samples = int(math.ceil(self.pre_trigger / self.sample_interval - 1e-9))
+		self.post_samples = max(int(math.ceil(self.post_trigger / self.sample_interval - 1e-9)), 1)
+		self.directory = directory
+		self.max_files = max_files
+
+		self.captures = deque(maxlen=max_captures)
+		self.capture_count = 0
+		self._pre_buffer = deque(maxlen=self.pre_samples or 1)
+		self._conditions = {}
+		self._pending = []
+		self._active = None
+		self._remaining = 0
+		self._files = deque()
+
+	@property
+	def is_capturing(self):
+		"""Whether a capture window is open."""
+		return self._active is not None
+
+	def add_condition(self, name, condition):
+		"""Fire trigger `name` whenever `condition()` becomes true."""
+		self._conditions[name] = [condition, None]
+
+	def remove_condition(self, name):
+		"""Remove a condition added with `add_condition`."""
+		self._conditions.pop(name, None)
+
+	def get_conditions(self):
+		"""Return the conditions added with `add_condition` as a name -> callable dict."""
+		return {name: entry[0] for name, entry in self._conditions.items()}
+
+	def trigger(self, name="manual"):
+		"""Fire trigger `name` on the next sample."""
+		self._pending.append(name)
+
+	def add(self, data_object):
+		"""Add one sample, fire the triggers that became true and extend the open window.
+
+		Returns:
+			dict | None: The capture finished by this sample, if any.
+		"""
+		fired = self._pending
+		self._pending = []
+		for name, entry in self._conditions.items():
+			state = bool(entry[0]())
+			if state and entry[1] is False:
+				fired.append(name)
+			entry[1] = state
+
+		time = data_object.get("time")
+		if self._active is not None:
+			self._active["events"].extend({"trigger": name, "time": time} for name in fired)
+		elif fired:
+			self._open(fired, time)
+
+		if self._active is None:
+			if self.pre_samples:
+				self._pre_buffer.append(data_object)
+			return None
+
+		self._active["data"].append(data_object)
+		self._remaining -= 1
+		if self._remaining <= 0:
+			return self.close()
+		return None
+
+	def close(self):
+		"""Finish the open window early and return it (`None` when idle)."""
+		capture = self._active
+		if capture is None:
+			return None
+
+		self._active = None
+		self._remaining = 0
+		self.captures.append(capture)
+		if self.directory is not None:
+			self._write(capture)
+		return capture
+
+	def reset(self):
+		"""Drop the pre-trigger samples, pending triggers and the open window."""
+		self._pre_buffer.clear()
+		self._pending = []
+		self._active = None
+		self._remaining = 0
+		for entry in self._conditions.values():
+			entry[1] = None
+
+	def _open(self, fired, time):
+		"""Start a capture window with the pre-trigger samples."""
+		self.capture_count += 1
+		self._active = {
+			"index": self.capture_count,
+			"trigger": fired[0],
+			"time": time,
+			"sample_interval": self.sample_interval,
+			"pre_trigger": self.pre_trigger,
+			"post_trigger": self.post_trigger,
+			"events": [{"trigger": name, "time": time} for name in fired],
+			"data": list(self._pre_buffer) if self.pre_samples else [],
+		}
+		self._pre_buffer.clear()
+		self._remaining = self.post_samples
+
+	def _write(self, capture):
+		"""Write a finished window to `directory` and remove files beyond `max_files`."""
+		os.makedirs(self.directory, exist_ok=True)
+		trigger = "".join(character if character.isalnum() else "_" for character in str(capture["trigger"]))
+		path = os.path.join(self.directory, f"capture_{capture['index']:05d}_{trigger}.json")
+		with open(path, "w", encoding="utf-8") as capture_file:
+			json.dump(capture, capture_file)
+		capture["path"] = path
+
+		self._files.append(path)
+		while self.max_files is not None and len(self._files) > self.max_files:
+			oldest = self._files.popleft()
+			try:
+				os.remove(oldest)
+			except OSError:
+				pass
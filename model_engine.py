@@ -1,11 +1,74 @@
-import importlib
-import inspect
-import json
-import re
+import copy
+import os
 from collections.abc import Mapping
-from pathlib import Path
 
-from base_models.base_model import BaseModel
+from base_models.model_manifest import resolve_model_class
+from helpers.definition_cache import default_definition_cache
+from helpers.model_template import ModelTemplate
+from helpers.steady_state import DEFAULT_STEADY_SIGNALS, SteadyStateDetector
+
+
+class ModelRegistry(dict):
+	"""Name -> model mapping that counts structural changes.
+
+	The engine registry is shared by reference with every model (`model_ref`),
+	so models that create components (e.g. `BloodVessel` input resistors) add
+	them here. Each insertion or removal bumps `version`, which lets the engine
+	invalidate its step plan and model indexes lazily.
+	"""
+
+	version = 0
+
+	def __init__(self, *args, **kwargs):
+		"""Initialize the registry like a `dict`."""
+		super().__init__(*args, **kwargs)
+		self.version = 0
+
+	def __setitem__(self, key, value):
+		"""Register a model and bump the version."""
+		super().__setitem__(key, value)
+		self.version += 1
+
+	def __delitem__(self, key):
+		"""Remove a model and bump the version."""
+		super().__delitem__(key)
+		self.version += 1
+
+	def pop(self, key, *default):
+		"""Remove and return a model, bumping the version."""
+		value = super().pop(key, *default)
+		self.version += 1
+		return value
+
+	def popitem(self):
+		"""Remove and return the last registered model, bumping the version."""
+		item = super().popitem()
+		self.version += 1
+		return item
+
+	def setdefault(self, key, default=None):
+		"""Register `default` under `key` if missing and return the stored model."""
+		if key not in self:
+			self[key] = default
+		return self[key]
+
+	def update(self, *args, **kwargs):
+		"""Register several models and bump the version."""
+		super().update(*args, **kwargs)
+		self.version += 1
+
+	def clear(self):
+		"""Remove all models and bump the version."""
+		super().clear()
+		self.version += 1
+
+	def touch(self):
+		"""Mark the registry as changed without adding or removing models."""
+		self.version += 1
+
+
+STEP_PHASES = ("controller", "container", "pressure", "flow", "transfer", "exchange", "monitor")
+PATCH_SECTIONS = ("remove", "add", "set", "connect")
 
 
 class ModelEngine:
@@ -16,23 +79,64 @@ class ModelEngine:
 	advances all models one simulation step at a time.
 	"""
 
-	def __init__(self, modeling_stepsize=0.0005):
+	def __init__(self, modeling_stepsize=0.0005, compact_models=False, use_definition_cache=True, step_mode="sequential", parallel_workers=None, skip_dormant_models=False):
 		"""Initialize an empty engine.
 
 		Args:
 			modeling_stepsize: Default simulation time step in seconds. This value
 				can be overridden by the loaded model definition.
+			compact_models: Instantiate the `__slots__` variants of the model
+				classes (see `BaseModel.compact`). Can also be set through
+				`general.compact_models` in the definition.
+			use_definition_cache: Let `load_json_file` reuse parsed and normalized
+				definitions (see `helpers.definition_cache`).
+			step_mode: `"sequential"` steps models in registry order, `"phased"`
+				steps them phase by phase (see `STEP_PHASES`) and `"parallel"`
+				additionally steps independent partitions of a phase on threads
+				(see `helpers.parallel_stepper`). Can also be set through
+				`general.step_mode` in the definition.
+			parallel_workers: Thread count of the `"parallel"` step mode,
+				defaults to the CPU count. Can also be set through
+				`general.parallel_workers`.
+			skip_dormant_models: Leave the component models of inactive
+				subsystems out of the step plan (see `set_subsystem_dormancy`).
+				Can also be set through `general.skip_dormant_models`.
 		"""
-		self.models = {}
+		self.models = ModelRegistry()
 		self.model_definition = {}
+		self.model_groups = {}
 		self.modeling_stepsize = float(modeling_stepsize)
 		self.is_initialized = False
-
-	def load_json_file(self, file_path):
+		self.compact_models = bool(compact_models)
+		self.use_definition_cache = bool(use_definition_cache)
+		self.step_mode = str(step_mode)
+		self.parallel_workers = parallel_workers
+		self.skip_dormant_models = bool(skip_dormant_models)
+		self.dormant_subsystems = []
+
+		self._step_plan = ()
+		self._step_plan_version = -1
+		self._step_plan_mode = None
+		self._phase_plan = ()
+		self._parallel_stepper = None
+		self._step_listeners = []
+		self._dormant_models = set()
+		self._dormancy_overrides = {}
+		self._dormancy_states = ()
+		self._step_plan_dormancy = None
+		self._index_cache = {}
+		self._index_version = -1
+
+	def load_json_file(self, file_path, definition_cache=None):
 		"""Load a JSON model definition file and build the engine.
 
+		When `use_definition_cache` is set, the parsed and normalized definition
+		is taken from a `DefinitionCache` (in-process LRU and a disk cache next
+		to the JSON file) as long as the file is unchanged.
+
 		Args:
 			file_path: Path to a JSON definition file.
+			definition_cache: Cache to use instead of the shared default cache.
 
 		Returns:
 			ModelEngine: The current engine instance for chaining.
@@ -42,11 +146,18 @@ class ModelEngine:
 			json.JSONDecodeError: If the file is not valid JSON.
 			TypeError/ValueError: If the definition content is invalid.
 		"""
-		path = Path(file_path)
-		if not path.exists():
+		path = os.fspath(file_path)
+		if not os.path.exists(path):
 			raise FileNotFoundError(f"Model definition file not found: {path}")
 
-		with path.open("r", encoding="utf-8") as file_handle:
+		if self.use_definition_cache:
+			cache = definition_cache if definition_cache is not None else default_definition_cache
+			definition, model_configs = cache.load(path, self._extract_model_configs)
+			return self._build(definition, model_configs)
+
+		import json
+
+		with open(path, "r", encoding="utf-8") as file_handle:
 			definition = json.load(file_handle)
 
 		self.build(definition)
@@ -73,34 +184,651 @@ class ModelEngine:
 		if not isinstance(model_definition, Mapping):
 			raise TypeError("Model definition must be a dictionary")
 
+		return self._build(model_definition)
+
+	def _build(self, model_definition, model_configs=None):
+		"""Build from a definition, optionally with already normalized model configs."""
 		self.is_initialized = False
 		self.model_definition = dict(model_definition)
-		self.models = {}
+		self.models = ModelRegistry()
+		self.model_groups = {}
+		self._step_plan = ()
+		self._step_plan_version = -1
+		self._step_plan_mode = None
+		self._phase_plan = ()
+		self._close_parallel_stepper()
+		self._dormant_models = set()
+		self._dormancy_overrides = {}
+		self._dormancy_states = ()
+		self._step_plan_dormancy = None
+		self._index_cache = {}
+		self._index_version = -1
 
 		self._apply_general_settings(model_definition)
-		model_configs = self._extract_model_configs(model_definition)
+		if model_configs is None:
+			model_configs = self._extract_model_configs(model_definition)
 
 		for model_name, model_config in model_configs.items():
-			model_type = model_config.get("model_type")
-			if not model_type:
-				raise ValueError(f"Model '{model_name}' is missing 'model_type'")
-
-			model_class = self._resolve_model_class(model_type)
-			if model_class is None:
-				raise ValueError(f"Unknown model_type '{model_type}' for model '{model_name}'")
-
-			self.models[model_name] = model_class(model_ref=self, name=model_name)
+			self.models[model_name] = self._create_model(model_name, model_config)
 
 		for model_name, model_config in model_configs.items():
 			self.models[model_name].init_model(dict(model_config))
 
+		for subsystem_name in self.dormant_subsystems or []:
+			self._dormancy_overrides[str(subsystem_name)] = True
+
 		self.is_initialized = True
+		self._rebuild_step_plan()
+		return self
+
+	def create_template(self):
+		"""Snapshot the built engine as a reusable template.
+
+		Returns:
+			ModelTemplate: Template that produces independent engine copies.
+
+		Raises:
+			ValueError: If the engine has not been built yet.
+		"""
+		return ModelTemplate(self)
+
+	@classmethod
+	def from_template(cls, template):
+		"""Create an independent engine from a template.
+
+		This skips definition parsing, class resolution and model initialization
+		and copies the template state structurally instead, which is much faster
+		than `build()` for sweeps that instantiate the same definition many times.
+
+		Args:
+			template: A `ModelTemplate` (see `create_template`).
+
+		Returns:
+			ModelEngine: A new engine in the template state.
+
+		Raises:
+			TypeError: If `template` is not a `ModelTemplate`.
+		"""
+		if not isinstance(template, ModelTemplate):
+			raise TypeError("from_template expects a ModelTemplate")
+		return template.instantiate()
+
+	def apply_patch(self, patch):
+		"""Apply a definition delta to the built engine without rebuilding it.
+
+		Only added models are created and initialized; all other models keep
+		their state, so scenario variations can branch off a warmed-up model.
+		The patch is a mapping with any of these sections, applied in this
+		order:
+
+		- `remove`: names of models to remove. Components owned by a removed
+		  model (see `BaseModel.get_subsystem_models`, e.g. the input resistors
+		  of a blood vessel) and models connected to it through a single-name
+		  reference (`comp_from`, `comp_to`, `comp_blood`, ...) are removed as
+		  well; the name is dropped from list references such as
+		  `contained_components` and from the groups.
+		- `add`: model configs like the `models` section of a definition.
+		- `set`: model name -> `{property: value}`.
+		- `connect`: model name -> `{property: model name(s)}` for the reference
+		  attributes of the model (e.g. `comp_from`, `comp_to`) and `inputs`.
+
+		The whole patch is validated before the engine is changed. Afterwards
+		models rebind their cached references (see
+		`BaseModel.rebind_references`), the step plan and model indexes are
+		rebuilt on the next step and `model_definition` is updated, so a
+		rebuild or a template of the engine reproduces the patched structure.
+		Changes to models created by other models (e.g. the input resistors of
+		blood vessels) only apply to the running engine.
+
+		Args:
+			patch: Mapping with `remove`, `add`, `set` and/or `connect`.
+
+		Returns:
+			ModelEngine: The current engine instance for chaining.
+
+		Raises:
+			TypeError: If the patch or one of its sections has the wrong type.
+			ValueError: If the engine is not built, or the patch names unknown
+				models, properties or sections, adds an existing model or
+				connects to a model that does not exist.
+		"""
+		if not isinstance(patch, Mapping):
+			raise TypeError("Patch must be a dictionary")
+		if not self.is_initialized:
+			raise ValueError("The engine must be built before it can be patched")
+		unknown_sections = [str(section) for section in patch if section not in PATCH_SECTIONS]
+		if unknown_sections:
+			raise ValueError(f"Unknown patch section(s): {', '.join(unknown_sections)} (expected {', '.join(PATCH_SECTIONS)})")
+
+		remove_names = patch.get("remove") or []
+		if isinstance(remove_names, str) or not isinstance(remove_names, (list, tuple, set)):
+			raise TypeError("'remove' must be a list of model names")
+		for model_name in remove_names:
+			if model_name not in self.models:
+				raise ValueError(f"Cannot remove unknown model '{model_name}'")
+		removed = self._collect_removed_models(remove_names)
+
+		added_configs = self._normalize_model_section(patch.get("add") or {}, section_name="add")
+		added_models = {}
+		for model_name, model_config in added_configs.items():
+			if model_name in self.models and model_name not in removed:
+				raise ValueError(f"Cannot add model '{model_name}': a model with this name exists")
+			added_models[model_name] = self._create_model(model_name, model_config)
+
+		changes = []
+		for section in ("set", "connect"):
+			entries = patch.get(section) or {}
+			if not isinstance(entries, Mapping):
+				raise TypeError(f"'{section}' must be a dictionary of model name -> properties")
+			for model_name, properties in entries.items():
+				model = self._patched_model(model_name, removed, added_models)
+				if model is None:
+					raise ValueError(f"Cannot {section} properties of unknown model '{model_name}'")
+				if not isinstance(properties, Mapping):
+					raise TypeError(f"'{section}' entry of '{model_name}' must be a dictionary of properties")
+				for key, value in properties.items():
+					if not hasattr(model, key):
+						raise ValueError(f"Model '{model_name}' has no property '{key}'")
+					if section == "connect":
+						if key != "inputs" and key not in type(model).reference_attributes:
+							raise ValueError(f"'{key}' of model '{model_name}' is not a connection")
+						targets = [value] if isinstance(value, str) else list(value)
+						missing = [str(target) for target in targets if self._patched_model(target, removed, added_models) is None]
+						if missing:
+							raise ValueError(f"Cannot connect '{model_name}.{key}' to unknown model(s): {', '.join(missing)}")
+					changes.append((model_name, key, value))
+
+		# the patch is valid: change the engine
+		removed_set = set(removed)
+		for model_name in removed:
+			del self.models[model_name]
+			self._dormancy_overrides.pop(model_name, None)
+		if removed_set:
+			for model in self.models.values():
+				for attribute in type(model).reference_attributes:
+					value = getattr(model, attribute, None)
+					if isinstance(value, list) and removed_set.intersection(value):
+						setattr(model, attribute, [name for name in value if name not in removed_set])
+			for group, names in self.model_groups.items():
+				self.model_groups[group] = [name for name in names if name not in removed_set]
+
+		for model_name, model in added_models.items():
+			self.models[model_name] = model
+		for model_name, model_config in added_configs.items():
+			added_models[model_name].init_model(dict(model_config))
+
+		for model_name, key, value in changes:
+			setattr(self.models[model_name], key, value)
+
+		if removed or added_models or patch.get("connect"):
+			rebind_models = [model for name, model in self.models.items() if name not in added_models]
+		else:
+			rebind_models = [self.models[model_name] for model_name, _, _ in changes]
+		for model in dict.fromkeys(rebind_models):
+			model.rebind_references()
+
+		self._patch_definition(removed_set, added_configs, changes)
+		self.models.touch()
 		return self
 
 	def step_model(self):
-		"""Advance all initialized models by one simulation step."""
+		"""Advance all initialized models by one simulation step.
+
+		Models belonging to a dormant subsystem are not part of the step plan and
+		are skipped until their subsystem is switched on again.
+
+		In `"phased"` step mode the models are stepped phase by phase instead of
+		in registry order: controllers, containers, pressures of all capacitive
+		elements, flows of all resistive elements, volume transfers, exchangers
+		and monitors. All flows of a step are then computed from the same
+		pressures, so the result no longer depends on the order of the models in
+		the definition. Within a phase, models of one class are stepped together.
+
+		The `"parallel"` step mode runs the same phases, but steps partitions of
+		a phase that write disjoint models on worker threads, with a barrier
+		between phases. Threads are only used on free-threaded Python builds;
+		the results are identical to the `"phased"` mode.
+
+		Step listeners (see `add_step_listener`) are called after all models
+		have been stepped.
+		"""
+		if self._is_step_plan_outdated():
+			self._rebuild_step_plan()
+
+		if self._parallel_stepper is not None:
+			self._parallel_stepper.step()
+		elif self._phase_plan:
+			for step_function, models in self._phase_plan:
+				for model in models:
+					step_function(model)
+		else:
+			for model in self._step_plan:
+				model.step_model()
+
+		for listener in self._step_listeners:
+			listener()
+
+	def add_step_listener(self, listener):
+		"""Call `listener()` after every model step, e.g. to sample or summarize signals.
+
+		Listeners are kept when the engine is rebuilt and are not copied into
+		engines created from a template.
+		"""
+		if listener not in self._step_listeners:
+			self._step_listeners.append(listener)
+
+	def remove_step_listener(self, listener):
+		"""Remove a listener added with `add_step_listener`."""
+		if listener in self._step_listeners:
+			self._step_listeners.remove(listener)
+
+	def run_until_steady(self, tolerance=0.001, max_time=120.0, signals=DEFAULT_STEADY_SIGNALS, window=10, min_time=0.0):
+		"""Step the model until the beat-to-beat course of key signals has settled.
+
+		Each signal is averaged per heartbeat; the run stops at the first beat
+		where the mean of the last `window` beats differs from the mean of the
+		`window` beats before by at most `tolerance` (relative) for every
+		signal (see `helpers.steady_state.SteadyStateDetector`).
+
+		Args:
+			tolerance: Maximum relative change, or dict of signal -> tolerance.
+			max_time: Maximum model time to run in seconds.
+			signals: Property paths to check; missing ones are skipped.
+			window: Number of beats per compared window.
+			min_time: Model time to run before steadiness is accepted.
+
+		Returns:
+			dict: `steady`, `time` (model seconds run), `steps`, `beats` and
+			`variation` (relative change of the window mean per signal).
+		"""
+		detector = SteadyStateDetector(self, signals, tolerance, window)
+		max_steps = int(round(float(max_time) / self.modeling_stepsize))
+		min_steps = int(round(float(min_time) / self.modeling_stepsize))
+
+		steps = 0
+		while steps < max_steps:
+			self.step_model()
+			steps += 1
+			if detector.collect_data() and steps >= min_steps:
+				break
+
+		report = detector.get_report()
+		report["steady"] = detector.is_steady and steps >= min_steps
+		report["time"] = steps * self.modeling_stepsize
+		report["steps"] = steps
+		return report
+
+	def set_subsystem_dormancy(self, subsystem_name, enabled=True):
+		"""Allow or forbid a subsystem to drop its components from the step plan.
+
+		Dormancy is off unless `skip_dormant_models` is set. Then subsystem
+		classes that declare `dormant_when_inactive` opt in by default; this
+		method overrides that choice for one named subsystem.
+
+		Args:
+			subsystem_name: Name of the subsystem model (e.g. `Ecls`).
+			enabled: Whether the subsystem may go dormant while inactive.
+
+		Raises:
+			KeyError: If no model with this name exists.
+		"""
+		if subsystem_name not in self.models:
+			raise KeyError(f"Unknown subsystem '{subsystem_name}'")
+
+		self._dormancy_overrides[subsystem_name] = bool(enabled)
+		self._rebuild_step_plan()
+
+	def refresh_subsystem(self, subsystem_name=None):
+		"""Recompute the step plan after a subsystem was switched on or off.
+
+		Args:
+			subsystem_name: Name of the subsystem that changed state. The whole plan
+				is recomputed, the name is accepted for symmetry with the model hooks.
+		"""
+		if not self.is_initialized:
+			return
+
+		self._rebuild_step_plan()
+
+	def get_activity_report(self):
+		"""Summarize how many models are stepped, disabled and dormant.
+
+		Returns:
+			dict: Model counts and a per-subsystem breakdown of dormant models.
+		"""
+		stepped_models = len(self._step_plan)
+		enabled_models = sum(1 for model in self._step_plan if model.is_enabled)
+
+		subsystems = {}
+		for model in self.models.values():
+			if not self._is_dormancy_allowed(model):
+				continue
+			component_names = [name for name in model.get_subsystem_models() if name in self.models]
+			subsystems[model.name] = {
+				"active": bool(model.is_subsystem_active()),
+				"models": len(component_names),
+				"dormant_models": sorted(name for name in component_names if name in self._dormant_models),
+			}
+
+		return {
+			"total": len(self.models),
+			"stepped": stepped_models,
+			"active": enabled_models,
+			"disabled": stepped_models - enabled_models,
+			"dormant": len(self._dormant_models),
+			"subsystems": subsystems,
+		}
+
+	def get_models_by_type(self, *model_types):
+		"""Return the models whose class matches one of the given model types.
+
+		Model types are compared like in class resolution (case and underscores
+		are ignored, legacy aliases apply), so `BloodVessel` and `blood_vessel`
+		select the same models.
+
+		Args:
+			*model_types: One or more `model_type` identifiers.
+
+		Returns:
+			tuple[BaseModel, ...]: Matching models in registry order.
+		"""
+		keys = frozenset(self._normalize_model_type(model_type) for model_type in model_types)
+		return self._cached_index(("type", keys), lambda model: bool(self._model_type_keys(model) & keys))
+
+	def get_models_by_class(self, model_class):
+		"""Return the instances of `model_class`, including its subclasses.
+
+		Args:
+			model_class: A `BaseModel` subclass.
+
+		Returns:
+			tuple[BaseModel, ...]: Matching models in registry order.
+		"""
+		return self._cached_index(("class", model_class), lambda model: isinstance(model, model_class))
+
+	def get_models_in_group(self, group):
+		"""Return the models tagged with a user-defined group.
+
+		Groups come from the top-level `groups` section of the definition
+		(`{"group": ["MODEL", ...]}`) and from the `groups` list of each model.
+
+		Args:
+			group: Group name.
+
+		Returns:
+			tuple[BaseModel, ...]: Group members in registry order.
+		"""
+		group = str(group)
+		members = set(self.model_groups.get(group, ()))
+		return self._cached_index(
+			("group", group),
+			lambda model: model.name in members or group in (getattr(model, "groups", None) or ()),
+		)
+
+	def resolve_models(self, model_names):
+		"""Resolve a sequence of model names to a cached tuple of models.
+
+		Unknown names are skipped and duplicates are kept, mirroring a loop that
+		looks every name up in the registry.
+
+		Args:
+			model_names: Iterable of model names.
+
+		Returns:
+			tuple[BaseModel, ...]: Resolved models in the order of `model_names`.
+		"""
+		names = tuple(model_names)
+		self._validate_index_cache()
+		cache_key = ("names", names)
+		resolved = self._index_cache.get(cache_key)
+		if resolved is None:
+			resolved = tuple(self.models[name] for name in names if name in self.models)
+			self._index_cache[cache_key] = resolved
+		return resolved
+
+	def invalidate_indexes(self):
+		"""Drop the cached model indexes, e.g. after editing `groups` at runtime."""
+		self.models.touch()
+
+	def _cached_index(self, cache_key, predicate):
+		"""Return a cached tuple of the models matching `predicate`."""
+		self._validate_index_cache()
+		models = self._index_cache.get(cache_key)
+		if models is None:
+			models = tuple(model for model in self.models.values() if predicate(model))
+			self._index_cache[cache_key] = models
+		return models
+
+	def _validate_index_cache(self):
+		"""Clear the index cache when the registry changed since it was filled."""
+		version = getattr(self.models, "version", None)
+		if version is None or version != self._index_version:
+			self._index_cache = {}
+			self._index_version = version
+
+	def _model_type_keys(self, model):
+		"""Return the normalized type keys a model is indexed under."""
+		model_class = type(model)
+		return {
+			self._normalize_model_type(getattr(model_class, "model_type", "")),
+			self._normalize_model_type(model_class.__name__),
+		}
+
+	def _normalize_model_type(self, model_type):
+		"""Normalize a `model_type` for comparisons (case, underscores, aliases)."""
+		normalized = str(model_type).replace("_", "").lower()
+		if normalized.startswith("compact") and normalized != "compact":
+			normalized = normalized[len("compact"):]
+		legacy_aliases = {
+			"bloodpump": "pump",
+		}
+		return legacy_aliases.get(normalized, normalized)
+
+	def _is_dormancy_allowed(self, model):
+		"""Return whether `model` may put its component models to sleep."""
+		if not self.skip_dormant_models:
+			return False
+
+		override = self._dormancy_overrides.get(model.name)
+		if override is not None:
+			return override
+
+		return bool(getattr(model, "dormant_when_inactive", False))
+
+	def _is_step_plan_outdated(self):
+		"""Return whether the models, the step settings or a subsystem state changed since the last plan."""
+		if (
+			self.models.version != self._step_plan_version
+			or self.step_mode != self._step_plan_mode
+			or self.skip_dormant_models != self._step_plan_dormancy
+		):
+			return True
+
+		# subsystems can also be switched by writing their running flag directly (e.g. from a scheduled task)
+		for model, active in self._dormancy_states:
+			if model.is_subsystem_active() != active:
+				return True
+		return False
+
+	def _rebuild_step_plan(self):
+		"""Rebuild the ordered tuple of models stepped by `step_model`."""
+		dormant_models = set()
+		dormancy_states = []
 		for model in self.models.values():
-			model.step_model()
+			if not self._is_dormancy_allowed(model):
+				continue
+			active = bool(model.is_subsystem_active())
+			dormancy_states.append((model, active))
+			if active:
+				continue
+
+			for component_name in model.get_subsystem_models():
+				if component_name != model.name and component_name in self.models:
+					dormant_models.add(component_name)
+
+		self._dormant_models = dormant_models
+		self._dormancy_states = tuple(dormancy_states)
+		self._step_plan_dormancy = self.skip_dormant_models
+		self._step_plan = tuple(
+			model for model_name, model in self.models.items() if model_name not in dormant_models
+		)
+		self._step_plan_version = self.models.version
+
+		self._close_parallel_stepper()
+		if self.step_mode == "sequential":
+			self._phase_plan = ()
+		elif self.step_mode == "phased":
+			self._phase_plan = self._build_phase_plan(self._step_plan)
+		elif self.step_mode == "parallel":
+			from helpers.parallel_stepper import ParallelStepper
+
+			phase_batches = self._build_phase_batches(self._step_plan)
+			self._phase_plan = tuple((step_function, models) for _, step_function, models in phase_batches)
+			self._parallel_stepper = ParallelStepper(phase_batches, workers=self.parallel_workers)
+		else:
+			raise ValueError(f"Unknown step_mode '{self.step_mode}' (expected 'sequential', 'phased' or 'parallel')")
+		self._step_plan_mode = self.step_mode
+
+	def get_parallel_partitions(self):
+		"""Return the partitions of the `"parallel"` step mode per phase.
+
+		Returns:
+			dict: Phase name -> list of model name lists, one per partition, or
+			`None` for phases that run serially. Empty in the other step modes.
+		"""
+		if self._is_step_plan_outdated():
+			self._rebuild_step_plan()
+		if self._parallel_stepper is None:
+			return {}
+		return self._parallel_stepper.describe()
+
+	def _close_parallel_stepper(self):
+		"""Stop the worker threads of the current parallel stepper, if any."""
+		if self._parallel_stepper is not None:
+			self._parallel_stepper.close()
+		self._parallel_stepper = None
+
+	def _build_phase_plan(self, models):
+		"""Group the stepped models into `(step function, models)` batches."""
+		return tuple((step_function, phase_models) for _, step_function, phase_models in self._build_phase_batches(models))
+
+	def _build_phase_batches(self, models):
+		"""Group the stepped models into `(phase, step function, models)` batches.
+
+		Batches follow `STEP_PHASES`; within a phase there is one batch per class
+		and each batch calls the unbound step function of that class. Batches are
+		ordered by class name and models by name, so the plan (and therefore the
+		result) does not depend on the order of the registry.
+		"""
+		batches = {phase: {} for phase in STEP_PHASES}
+		for model in models:
+			model_class = type(model)
+			for phase, method_name in model_class.get_phase_steps():
+				if phase not in batches:
+					raise ValueError(f"Unknown step phase '{phase}' of model '{model.name}'")
+				key = (model_class, method_name)
+				batches[phase].setdefault(key, []).append(model)
+
+		plan = []
+		for phase in STEP_PHASES:
+			for (model_class, method_name) in sorted(batches[phase], key=lambda key: (key[0].__module__, key[0].__qualname__)):
+				phase_models = sorted(batches[phase][(model_class, method_name)], key=lambda model: str(model.name))
+				plan.append((phase, getattr(model_class, method_name), tuple(phase_models)))
+		return tuple(plan)
+
+	def _create_model(self, model_name, model_config):
+		"""Instantiate (without initializing) the model class of a config."""
+		model_type = model_config.get("model_type")
+		if not model_type:
+			raise ValueError(f"Model '{model_name}' is missing 'model_type'")
+
+		model_class = self._resolve_model_class(model_type)
+		if model_class is None:
+			raise ValueError(f"Unknown model_type '{model_type}' for model '{model_name}'")
+		if self.compact_models:
+			model_class = model_class.compact()
+
+		return model_class(model_ref=self, name=model_name)
+
+	def _collect_removed_models(self, model_names):
+		"""Return the models to remove with `model_names`: owned components and dangling connectors."""
+		removed = {}
+		pending = [str(model_name) for model_name in model_names]
+		while pending:
+			while pending:
+				model_name = pending.pop()
+				if model_name in removed or model_name not in self.models:
+					continue
+				removed[model_name] = True
+				pending.extend(self.models[model_name].get_subsystem_models())
+
+			for model_name, model in self.models.items():
+				if model_name in removed:
+					continue
+				for attribute in type(model).reference_attributes:
+					value = getattr(model, attribute, None)
+					if isinstance(value, str) and value in removed:
+						pending.append(model_name)
+						break
+		return list(removed)
+
+	def _patched_model(self, model_name, removed, added_models):
+		"""Return the model named `model_name` as it will be after a patch, or `None`."""
+		if model_name in added_models:
+			return added_models[model_name]
+		if model_name in removed:
+			return None
+		return self.models.get(model_name)
+
+	def _patch_definition(self, removed, added_configs, changes):
+		"""Record an applied patch in `model_definition`.
+
+		The model configs are copied, so the definition the engine was built
+		from (and the definition cache) stay unchanged. Nested `components`
+		configs are patched in place of their parent config.
+		"""
+		model_configs = copy.deepcopy(self._extract_model_configs(self.model_definition))
+		for model_name, model_config in added_configs.items():
+			model_configs[model_name] = copy.deepcopy(model_config)
+
+		# name -> (containing mapping, key) of every top-level and nested config
+		locations = {}
+		pending = [model_configs]
+		while pending:
+			container = pending.pop()
+			for key, model_config in container.items():
+				if not isinstance(model_config, Mapping):
+					continue
+				locations.setdefault(str(model_config.get("name") or key), (container, key))
+				if isinstance(model_config.get("components"), dict):
+					pending.append(model_config["components"])
+
+		for model_name in removed:
+			if model_name in locations:
+				container, key = locations.pop(model_name)
+				container.pop(key, None)
+		for model_name, key, value in changes:
+			if model_name in locations:
+				container, config_key = locations[model_name]
+				container[config_key][key] = value
+		# connections also change when models are removed (see `_collect_removed_models`)
+		for model_name, (container, config_key) in locations.items():
+			model = self.models.get(model_name)
+			model_config = container.get(config_key)
+			if model is None or model_config is None:
+				continue
+			for key in ("inputs", *type(model).reference_attributes):
+				if key in model_config and hasattr(model, key):
+					value = getattr(model, key)
+					model_config[key] = list(value) if isinstance(value, (list, tuple)) else value
+
+		model_definition = {
+			key: value for key, value in self.model_definition.items() if key not in ("models", "components", "helpers")
+		}
+		model_definition["models"] = model_configs
+		if isinstance(model_definition.get("groups"), Mapping):
+			model_definition["groups"] = {group: list(names) for group, names in self.model_groups.items()}
+		self.model_definition = model_definition
 
 	def _apply_general_settings(self, model_definition):
 		"""Apply global settings from the definition onto the engine instance.
@@ -114,12 +842,16 @@ class ModelEngine:
 			for key, value in general_config.items():
 				setattr(self, key, value)
 
-		excluded_keys = {"models", "components", "helpers", "general"}
+		excluded_keys = {"models", "components", "helpers", "general", "groups"}
 		for key, value in model_definition.items():
 			if key in excluded_keys:
 				continue
 			setattr(self, key, value)
 
+		groups = model_definition.get("groups")
+		if isinstance(groups, Mapping):
+			self.model_groups = {str(group): list(names) for group, names in groups.items()}
+
 		self.modeling_stepsize = float(getattr(self, "modeling_stepsize", self.modeling_stepsize))
 
 	def _extract_model_configs(self, model_definition):
@@ -189,9 +921,11 @@ class ModelEngine:
 	def _resolve_model_class(self, model_type):
 		"""Resolve a `model_type` string to a `BaseModel` subclass.
 
-		Resolution tries module names derived from the model type across model
-		packages (`base_models`, `composite_models`, `derived_models`,
-		`system_models`, `device_models`). Legacy aliases are mapped first.
+		Known types are resolved through the static manifest in
+		`base_models.model_manifest`, which imports only the module of the class.
+		Other types are searched by module name across the model packages
+		(`base_models`, `composite_models`, `derived_models`, `system_models`,
+		`device_models`). Legacy aliases are mapped first.
 
 		Args:
 			model_type: Model type identifier from a definition file.
@@ -199,40 +933,4 @@ class ModelEngine:
 		Returns:
 			type[BaseModel] | None: Matching class if found, otherwise `None`.
 		"""
-		model_type_str = str(model_type)
-		normalized_target = re.sub(r"_", "", model_type_str).lower()
-		legacy_aliases = {
-			"bloodpump": ("pump", "pump"),
-		}
-		if normalized_target in legacy_aliases:
-			normalized_target, snake_name = legacy_aliases[normalized_target]
-		else:
-			snake_name = re.sub(r"(?<!^)(?=[A-Z])", "_", model_type_str).lower()
-
-		candidate_modules = [
-			f"base_models.{snake_name}",
-			f"composite_models.{snake_name}",
-			f"derived_models.{snake_name}",
-			f"system_models.{snake_name}",
-			f"device_models.{snake_name}",
-		]
-
-		for module_name in candidate_modules:
-			try:
-				module = importlib.import_module(module_name)
-			except ModuleNotFoundError:
-				continue
-
-			for _, candidate_class in inspect.getmembers(module, inspect.isclass):
-				if not issubclass(candidate_class, BaseModel):
-					continue
-
-				normalized_name = re.sub(r"_", "", candidate_class.__name__).lower()
-				normalized_model_type = re.sub(
-					r"_", "", str(getattr(candidate_class, "model_type", ""))
-				).lower()
-
-				if normalized_name == normalized_target or normalized_model_type == normalized_target:
-					return candidate_class
-
-		return None
+		return resolve_model_class(model_type)
@@ -56,6 +56,19 @@ class Blood(BaseModel):
 
 		return None
 
+	def _blood_containing_models(self):
+		"""Return blood-containing models, from the engine type index when available."""
+		model_engine = getattr(self, "_model_engine", None)
+		if model_engine is not None and hasattr(model_engine, "get_models_by_type"):
+			return model_engine.get_models_by_type(*self.blood_containing_modeltypes)
+
+		models = self._get_models_registry() or {}
+		return tuple(
+			model
+			for model in models.values()
+			if str(getattr(model, "model_type", "")) in self.blood_containing_modeltypes
+		)
+
 	def _resolve_model(self, model_name):
 		"""Resolve a model name from the active registry."""
 		models = self._get_models_registry()
@@ -67,14 +80,16 @@ class Blood(BaseModel):
 		"""Initialize blood-capable models with baseline blood properties."""
 		super().init_model(args)
 
+		self.rebind_references()
+		self.art_solutes = dict(self.solutes)
+
+	def rebind_references(self):
+		"""Give blood-capable models without a composition the baseline properties and resolve the sampling sites."""
 		models = self._get_models_registry()
 		if models is None:
 			return
 
-		for model in models.values():
-			if str(getattr(model, "model_type", "")) not in self.blood_containing_modeltypes:
-				continue
-
+		for model in self._blood_containing_models():
 			model_to2 = float(getattr(model, "to2", 0.0) or 0.0)
 			model_tco2 = float(getattr(model, "tco2", 0.0) or 0.0)
 			if model_to2 == 0.0 and model_tco2 == 0.0:
@@ -88,8 +103,6 @@ class Blood(BaseModel):
 		self._descending_aorta = models.get("AD")
 		self._right_atrium = models.get("RA")
 
-		self.art_solutes = dict(self.solutes)
-
 	def calc_model(self):
 		"""Periodically compute and publish arterial/venous blood-gas snapshots."""
 		time_step = getattr(self, "_t", 0.0)
@@ -158,9 +171,8 @@ class Blood(BaseModel):
 				model.temp = self.temp
 			return
 
-		for model in models.values():
-			if str(getattr(model, "model_type", "")) in self.blood_containing_modeltypes:
-				model.temp = self.temp
+		for model in self._blood_containing_models():
+			model.temp = self.temp
 
 	def set_viscosity(self, new_viscosity):
 		"""Set blood viscosity for all blood-containing models."""
@@ -170,9 +182,8 @@ class Blood(BaseModel):
 		if models is None:
 			return
 
-		for model in models.values():
-			if str(getattr(model, "model_type", "")) in self.blood_containing_modeltypes:
-				model.viscosity = self.viscosity
+		for model in self._blood_containing_models():
+			model.viscosity = self.viscosity
 
 	def set_to2(self, new_to2, bc_site=""):
 		"""Set total oxygen content globally or for one blood compartment."""
@@ -187,9 +198,8 @@ class Blood(BaseModel):
 				model.to2 = value
 			return
 
-		for model in models.values():
-			if str(getattr(model, "model_type", "")) in self.blood_containing_modeltypes:
-				model.to2 = value
+		for model in self._blood_containing_models():
+			model.to2 = value
 
 	def set_tco2(self, new_tco2, bc_site=""):
 		"""Set total carbon dioxide content globally or for one compartment."""
@@ -204,9 +214,8 @@ class Blood(BaseModel):
 				model.tco2 = value
 			return
 
-		for model in models.values():
-			if str(getattr(model, "model_type", "")) in self.blood_containing_modeltypes:
-				model.tco2 = value
+		for model in self._blood_containing_models():
+			model.tco2 = value
 
 	def set_solute(self, solute, solute_value, bc_site=""):
 		"""Set a solute concentration globally or for one blood compartment."""
@@ -224,6 +233,5 @@ class Blood(BaseModel):
 				model.solutes = model_solutes
 			return
 
-		for model in models.values():
-			if str(getattr(model, "model_type", "")) in self.blood_containing_modeltypes:
-				model.solutes = dict(self.solutes)
+		for model in self._blood_containing_models():
+			model.solutes = dict(self.solutes)
@@ -82,6 +82,15 @@ class Circulation(BaseModel):
 
 		return None
 
+	def _resolve_models(self, model_names):
+		"""Resolve a list of model names, using the engine's cached name index."""
+		model_engine = getattr(self, "_model_engine", None)
+		if model_engine is not None and hasattr(model_engine, "resolve_models"):
+			return model_engine.resolve_models(model_names)
+
+		resolved = (self._resolve_model(model_name) for model_name in model_names)
+		return tuple(model for model in resolved if model is not None)
+
 	def calc_model(self):
 		"""Apply ANS/SVR/PVR updates and periodically recompute blood volumes."""
 		time_step = getattr(self, "_t", 0.0)
@@ -93,10 +102,7 @@ class Circulation(BaseModel):
 			self._update_counter = 0.0
 
 			if self._prev_ans_activity != self.ans_activity:
-				for model_name in self._combined_list:
-					model = self._resolve_model(model_name)
-					if model is None:
-						continue
+				for model in self._resolve_models(self._combined_list):
 					model.ans_activity = self.ans_activity
 				self._prev_ans_activity = self.ans_activity
 
@@ -117,11 +123,7 @@ class Circulation(BaseModel):
 		"""Set systemic vascular resistance factor across systemic vessel groups."""
 		updated_svr_factor = float(new_svr_factor)
 
-		for model_name in self._syst_models:
-			model = self._resolve_model(model_name)
-			if model is None:
-				continue
-
+		for model in self._resolve_models(self._syst_models):
 			f_ps = float(getattr(model, "r_factor_ps", 1.0))
 			delta_svr = updated_svr_factor - self._prev_svr_factor
 			f_ps += delta_svr
@@ -138,11 +140,7 @@ class Circulation(BaseModel):
 		"""Set pulmonary vascular resistance factor across pulmonary groups."""
 		updated_pvr_factor = float(new_pvr_factor)
 
-		for model_name in self._pulm_models:
-			model = self._resolve_model(model_name)
-			if model is None:
-				continue
-
+		for model in self._resolve_models(self._pulm_models):
 			f_ps = float(getattr(model, "r_factor_ps", 1.0))
 			delta_pvr = updated_pvr_factor - self._prev_pvr_factor
 			f_ps += delta_pvr
@@ -162,24 +160,20 @@ class Circulation(BaseModel):
 		self.pulm_blood_volume = 0.0
 		self.heart_blood_volume = 0.0
 
-		for model_name in self._syst_models:
-			model = self._resolve_model(model_name)
-			if model is not None and getattr(model, "is_enabled", False):
+		for model in self._resolve_models(self._syst_models):
+			if getattr(model, "is_enabled", False):
 				self.syst_blood_volume += float(getattr(model, "vol", 0.0) or 0.0)
 
-		for model_name in self.heart_chambers:
-			model = self._resolve_model(model_name)
-			if model is not None and getattr(model, "is_enabled", False):
+		for model in self._resolve_models(self.heart_chambers):
+			if getattr(model, "is_enabled", False):
 				self.heart_blood_volume += float(getattr(model, "vol", 0.0) or 0.0)
 
-		for model_name in self.coronaries:
-			model = self._resolve_model(model_name)
-			if model is not None and getattr(model, "is_enabled", False):
+		for model in self._resolve_models(self.coronaries):
+			if getattr(model, "is_enabled", False):
 				self.syst_blood_volume += float(getattr(model, "vol", 0.0) or 0.0)
 
-		for model_name in self._pulm_models:
-			model = self._resolve_model(model_name)
-			if model is not None and getattr(model, "is_enabled", False):
+		for model in self._resolve_models(self._pulm_models):
+			if getattr(model, "is_enabled", False):
 				self.pulm_blood_volume += float(getattr(model, "vol", 0.0) or 0.0)
 
 		self.total_blood_volume = self.syst_blood_volume + self.pulm_blood_volume + self.heart_blood_volume
@@ -28,11 +28,10 @@ class Gas(BaseModel):
 		if models is None:
 			return
 
-		for model in models.values():
-			if str(getattr(model, "model_type", "")) in self.gas_containing_modeltypes:
-				model.pres_atm = self.pres_atm
-				model.temp = self.temp
-				model.target_temp = self.temp
+		for model in self._gas_containing_models():
+			model.pres_atm = self.pres_atm
+			model.temp = self.temp
+			model.target_temp = self.temp
 
 		for model_name, temp in self.temp_settings.items():
 			model = models.get(model_name)
@@ -47,9 +46,8 @@ class Gas(BaseModel):
 				continue
 			model.humidity = humidity
 
-		for model in models.values():
-			if str(getattr(model, "model_type", "")) in self.gas_containing_modeltypes:
-				calc_gas_composition(model, self.fio2, model.temp, model.humidity)
+		for model in self._gas_containing_models():
+			calc_gas_composition(model, self.fio2, model.temp, model.humidity)
 
 	def calc_model(self):
 		"""No per-step dynamics; gas model acts as a global configuration holder."""
@@ -68,6 +66,19 @@ class Gas(BaseModel):
 
 		return None
 
+	def _gas_containing_models(self):
+		"""Return gas-containing models, from the engine type index when available."""
+		model_engine = getattr(self, "_model_engine", None)
+		if model_engine is not None and hasattr(model_engine, "get_models_by_type"):
+			return model_engine.get_models_by_type(*self.gas_containing_modeltypes)
+
+		models = self._get_models_registry() or {}
+		return tuple(
+			model
+			for model in models.values()
+			if str(getattr(model, "model_type", "")) in self.gas_containing_modeltypes
+		)
+
 	def set_atmospheric_pressure(self, new_pres_atm):
 		"""Set atmospheric pressure for all gas-capacitance models."""
 		self.pres_atm = float(new_pres_atm)
@@ -76,9 +87,8 @@ class Gas(BaseModel):
 		if models is None:
 			return
 
-		for model in models.values():
-			if str(getattr(model, "model_type", "")) in self.gas_containing_modeltypes:
-				model.pres_atm = self.pres_atm
+		for model in self._gas_containing_models():
+			model.pres_atm = self.pres_atm
 
 	def set_temperature(self, new_temp, sites=None):
 		"""Set target temperature for selected gas sites."""
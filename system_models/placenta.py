@@ -7,6 +7,18 @@ class Placenta(BaseModel):
 	"""Placental circulation/gas-exchange controller for fetal-maternal interface."""
 
 	model_type = "placenta"
+	dormant_when_inactive = True
+	circuit_models = (
+		"AD_UMB_ART",
+		"UMB_ART",
+		"UMB_ART_PLF",
+		"PLF",
+		"PLF_UMB_VEN",
+		"PLM",
+		"PL_GASEX",
+		"UMB_VEN",
+		"UMB_VEN_IVCI",
+	)
 
 	def __init__(self, model_ref={}, name=None):
 		"""Initialize placenta geometry, diffusion settings, and runtime state."""
@@ -138,6 +150,16 @@ class Placenta(BaseModel):
 			plm.to2 = self.mat_to2
 			plm.tco2 = self.mat_tco2
 
+	def get_subsystem_models(self):
+		"""Return the placental circuit models, including the declared components."""
+		names = list(self.circuit_models)
+		names.extend(name for name in super().get_subsystem_models() if name not in names)
+		return names
+
+	def is_subsystem_active(self):
+		"""The placental circuit only needs stepping while the placenta is running."""
+		return bool(self.placenta_running)
+
 	def switch_placenta(self, state):
 		"""Enable or disable placenta-related components in the model graph."""
 		state = bool(state)
@@ -184,6 +206,8 @@ class Placenta(BaseModel):
 			umb_ven_ivci.is_enabled = state
 			umb_ven_ivci.no_flow = self.umb_clamped
 
+		self._notify_subsystem_state()
+
 	def build_placenta(self):
 		"""Initialize placenta circuit defaults for first-time model setup."""
 		ad_umb_art = self._model("AD_UMB_ART")
@@ -0,0 +1,173 @@
+"""Regression test for patching a running engine.
+
+This script warms up a definition, applies a patch that adds, sets, connects
+and removes models, steps the patched engine and verifies that rebuilding
+from the updated `model_definition` reproduces the patched structure.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import sys
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from model_engine import ModelEngine
+
+
+# a shunt vessel fed from the ascending aorta and draining into the right atrium
+SHUNT_PATCH = {
+    "add": {
+        "SHUNT_X": {
+            "model_type": "BloodVessel",
+            "is_enabled": True,
+            "inputs": ["AA"],
+            "vol": 0.0005,
+            "u_vol": 0.0005,
+            "el_base": 25000.0,
+            "r_for": 50000.0,
+            "r_back": 50000.0,
+            "to2": 0.0,
+            "tco2": 0.0,
+        },
+        "SHUNT_X_RA": {
+            "model_type": "Resistor",
+            "is_enabled": True,
+            "r_for": 50000.0,
+            "r_back": 50000.0,
+            "comp_from": "SHUNT_X",
+            "comp_to": "RA",
+        },
+    },
+    "set": {"Circulation": {"svr_factor": 1.2}},
+}
+
+RECONNECT_PATCH = {"connect": {"SHUNT_X": {"inputs": ["AD"]}, "SHUNT_X_RA": {"comp_to": "IVCI"}}}
+
+REMOVE_PATCH = {"remove": ["AA_BR"]}
+
+
+def _resolve_definition(definition_name: str) -> Path:
+    path = REPO_ROOT / "definitions" / definition_name
+    if not path.exists():
+        raise FileNotFoundError(f"definition not found: {path}")
+    return path
+
+
+def _structure(engine: ModelEngine) -> dict[str, tuple]:
+    """Return the class, enabled flag and model references of every model."""
+    names = set(engine.models)
+    structure = {}
+    for name, model in engine.models.items():
+        references = {}
+        for attribute, value in vars(model).items():
+            if attribute.startswith("_"):
+                continue
+            if isinstance(value, str) and value in names:
+                references[attribute] = value
+            elif isinstance(value, list) and value and all(isinstance(item, str) and item in names for item in value):
+                references[attribute] = sorted(value)
+        structure[name] = (type(model).__name__, bool(model.is_enabled), references)
+    return structure
+
+
+def _compare(patched: ModelEngine, rebuilt: ModelEngine) -> list[str]:
+    """Return the structural differences between two engines."""
+    patched_structure = _structure(patched)
+    rebuilt_structure = _structure(rebuilt)
+    problems = []
+    for name in sorted(set(patched_structure) ^ set(rebuilt_structure)):
+        side = "patched" if name in patched_structure else "rebuilt"
+        problems.append(f"{name} only in the {side} engine")
+    for name in sorted(set(patched_structure) & set(rebuilt_structure)):
+        if patched_structure[name] != rebuilt_structure[name]:
+            problems.append(f"{name}: patched={patched_structure[name]} rebuilt={rebuilt_structure[name]}")
+    return problems
+
+
+def _step_finite(engine: ModelEngine, steps: int) -> str | None:
+    """Step the engine and return a message if the shunt state is not finite."""
+    for _ in range(steps):
+        engine.step_model()
+    for name, attribute in (("SHUNT_X", "vol"), ("SHUNT_X", "pres"), ("SHUNT_X_RA", "flow")):
+        model = engine.models.get(name)
+        if model is None:
+            continue
+        value = float(getattr(model, attribute))
+        if not math.isfinite(value):
+            return f"non-finite {name}.{attribute}={value}"
+    return None
+
+
+def _run_patch(definition_name: str, warmup: int, steps: int) -> tuple[bool, str]:
+    definition_path = _resolve_definition(definition_name)
+    engine = ModelEngine().load_json_file(str(definition_path))
+    for _ in range(warmup):
+        engine.step_model()
+
+    for label, patch in (("add/set", SHUNT_PATCH), ("connect", RECONNECT_PATCH), ("remove", REMOVE_PATCH)):
+        engine.apply_patch(patch)
+        problem = _step_finite(engine, steps)
+        if problem is not None:
+            return False, f"{definition_name}: after {label} patch: {problem}"
+
+        rebuilt = ModelEngine().build(engine.model_definition)
+        problems = _compare(engine, rebuilt)
+        for name, values in patch.get("set", {}).items():
+            for attribute, value in values.items():
+                if getattr(rebuilt.models[name], attribute) != value:
+                    problems.append(f"{name}.{attribute}={getattr(rebuilt.models[name], attribute)} instead of {value}")
+        if problems:
+            return False, f"{definition_name}: rebuild after {label} patch differs: " + "; ".join(problems[:5])
+        problem = _step_finite(rebuilt, steps)
+        if problem is not None:
+            return False, f"{definition_name}: rebuilt engine after {label} patch: {problem}"
+
+        print(f"[INFO] {definition_name}: {label} patch rebuilds to {len(rebuilt.models)} models")
+
+    return True, f"{definition_name}: warmup={warmup}, steps={steps}, models={len(engine.models)}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run Explain patch regression test")
+    parser.add_argument(
+        "--definition",
+        type=str,
+        default="baseline_neonate.json",
+        help="Definition file in definitions/ (default: baseline_neonate.json)",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=2000,
+        help="Steps run before the first patch (default: 2000)",
+    )
+    parser.add_argument(
+        "--steps",
+        type=int,
+        default=1000,
+        help="Steps run after every patch (default: 1000)",
+    )
+    args = parser.parse_args()
+
+    if args.warmup < 0 or args.steps < 1:
+        print("[FAIL] --warmup must be >= 0 and --steps must be >= 1")
+        return 2
+
+    try:
+        ok, message = _run_patch(args.definition, args.warmup, args.steps)
+    except Exception as exc:
+        ok, message = False, f"{args.definition}: exception={exc}"
+
+    status = "PASS" if ok else "FAIL"
+    print(f"[{status}] {message}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())